@@ -38,6 +38,11 @@ KNOWLEDGE_SERVER_PORT = 19876
 KNOWLEDGE_SOCKET_TIMEOUT = 10.0
 KNOWLEDGE_LANCEDB_PATH = os.path.join(BASE_DIR, "data", "knowledge_lance")
 KNOWLEDGE_COLLECTION_NAME = "sakiko_knowledge_v2"
+KNOWLEDGE_EMBED_CACHE_PATH = os.path.join(BASE_DIR, "data", "embed_cache.npz")  # 文本向量缓存 (退出时保存)
+KNOWLEDGE_EMBED_CACHE_SIZE = 4096  # 向量缓存条数上限
+KNOWLEDGE_ANN_MIN_ROWS = 1000  # 记录数达到该值时自动建立向量索引 (更少时全表扫描更快)
+WARMUP_EMBEDDING = True  # 预加载后跑一次检索预热，首次查询不再付冷启动开销
+WARMUP_MODELS = ["tts", "stt"]  # 启动时后台预热的模型 (空列表关闭)
 
 # 🔥 Triple Store (三元组知识图谱)
 TRIPLE_STORE_PATH = os.path.join(BASE_DIR, "data", "triples.jsonl")
@@ -66,6 +71,15 @@ FOLLOW_UP_DELAY_MAX = 10              # 追问延迟最大值（秒）
 # 🔥 注意：已移除 PROACTIVE_CHAT_CHANCE 和 FOLLOW_UP_CHANCE
 # 现在完全由后台小祥（LLM）决定是否说话，不再有机械概率审核
 
+# ====================
+# 短输入响应缓存 (Response Cache)
+# ====================
+# "你好"、"在吗" 这类很短的重复输入，按概率直接复用上次的回复，跳过 LLM 调用
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_MAX_INPUT_LEN = 8     # 只缓存不超过这个字数的输入
+RESPONSE_CACHE_HIT_CHANCE = 0.3      # 命中时直接复用的概率（其余照常调用 LLM，保持多样性）
+RESPONSE_CACHE_SIZE = 64             # 最多缓存条数 (LRU)
+
 # ====================
 # 静默屏幕观察器 (Screen Observer)
 # ====================
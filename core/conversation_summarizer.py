@@ -168,6 +168,10 @@ class ConversationSummarizer:
             
             logger.info(f"📝 情境记忆已保存: [{doc_id}] {episode_text[:50]}...")
             
+            # 本进程直接写表，知识库服务的版本号看不到，需主动作废 prompt 缓存
+            from llm.prompt_builder import get_prompt_builder
+            get_prompt_builder().invalidate_cache()
+            
         except Exception as e:
             logger.error(f"保存情境记忆失败: {e}")
     
@@ -334,6 +334,7 @@ class KnowledgeMonitor:
             response: LLM 的响应文本
         """
         lines = response.strip().split("\n")
+        changed = False  # 是否写入/修改了记忆
 
         for line in lines:
             line = line.strip()
@@ -362,6 +363,7 @@ class KnowledgeMonitor:
                             },
                             similarity_threshold=0.85
                         )
+                        changed = True
                         logger.info(f"🧠 后台小祥 [ADD][{category}]: [{doc_id}]")
                         logger.debug(f"   📝 内容: {content}")
                         
@@ -389,6 +391,7 @@ class KnowledgeMonitor:
                         
                         success = self.kb.update_text(mem_id, new_content)
                         if success:
+                            changed = True
                             logger.info(f"🧠 后台小祥 [UPDATE]: {mem_id}")
                             logger.debug(f"   📝 旧内容: {old_content}")
                             logger.debug(f"   📝 新内容: {new_content}")
@@ -413,6 +416,7 @@ class KnowledgeMonitor:
                     
                     success = self.kb.update_importance(mem_id, delta=0.3)
                     if success:
+                        changed = True
                         logger.info(f"🧠 后台小祥 [BOOST]: {mem_id} 重要性 +0.3")
                         logger.debug(f"   📝 内容: {mem_content}")
                     continue
@@ -442,6 +446,7 @@ class KnowledgeMonitor:
                         logger.debug(f"   📝 内容: {delete_content}")
                     else:
                         self.kb.delete(mem_id)
+                        changed = True
                         logger.info(f"🧠 后台小祥 [DELETE]: {mem_id}")
                         logger.debug(f"   📝 已删除内容: {delete_content}")
                         
@@ -458,6 +463,11 @@ class KnowledgeMonitor:
 
             except Exception as e:
                 logger.error(f"🧠 执行操作失败 [{line}]: {e}")
+
+        if changed:
+            # 记忆已变化：作废 prompt 缓存与短输入响应缓存
+            from llm.prompt_builder import get_prompt_builder
+            get_prompt_builder().invalidate_cache()
     
     async def _extract_triples(self, memory_id: str, content: str):
         """
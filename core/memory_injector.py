@@ -4,6 +4,7 @@
 负责将记忆注入到对话上下文中
 """
 
+from typing import Optional, Tuple
 from loguru import logger
 
 import sys
@@ -12,6 +13,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
 
 
+# get_time_context 的默认参数：表示需要自己查询最近 episode
+_LOOKUP = object()
+
+
 class MemoryInjector:
     """
     记忆注入器
@@ -34,6 +39,20 @@ class MemoryInjector:
             self._kb = get_knowledge_base()
         return self._kb
     
+    def get_memory_version(self) -> Optional[int]:
+        """
+        知识库版本号（任何写入/删除都会改变）
+        
+        向知识库服务查询：服务进程是唯一写入方，本进程打开的表版本看不到它的写入。
+        用于判断 prompt 缓存是否过期；取不到时返回 None
+        """
+        try:
+            from knowledge import get_knowledge_client
+            return get_knowledge_client().version()
+        except Exception as e:
+            logger.debug(f"获取知识库版本失败: {e}")
+            return None
+    
     def get_recent_memories(self, n: int = 5) -> str:
         """获取最近记忆（一般层）"""
         try:
@@ -88,12 +107,38 @@ class MemoryInjector:
             # 降级到普通检索
             return self.search_related_memories(query)
 
-    def get_time_context(self) -> str:
+    def get_recent_episode(self) -> Optional[Tuple[str, float]]:
+        """最近一条情境记忆 (text, timestamp)，没有时返回 None"""
+        try:
+            import json
+            kb = self._get_kb()
+            all_rows = kb._table.to_pandas()
+            latest = None
+            for _, row in all_rows.iterrows():
+                try:
+                    metadata = json.loads(row.get("metadata", "{}"))
+                    if metadata.get("category") == "episode":
+                        timestamp = metadata.get("timestamp", 0)
+                        if latest is None or timestamp > latest[1]:
+                            latest = (row.get("text", ""), timestamp)
+                except:
+                    continue
+            return latest
+        except Exception as e:
+            logger.debug(f"检索 episode 失败: {e}")
+            return None
+    
+    def get_time_context(self, recent_episode=_LOOKUP) -> str:
         """
         🔥 获取时间感知上下文
         - 当前时间
         - 最近的情境记忆（episode）
+        
+        Args:
+            recent_episode: 已查好的 get_recent_episode() 结果 (调用方缓存知识库查询时传入，
+                时间与"多久前"仍按当前时刻计算)；不传则现查
         """
+        import re
         import time
         from datetime import datetime
         
@@ -107,50 +152,29 @@ class MemoryInjector:
         
         context_parts.append(f"现在是 {date_str} {weekday} {time_str}")
         
-        # 🔥 从知识库检索最近的 episode 记忆
-        try:
-            kb = self._get_kb()
-            # 搜索最近的 episode
-            all_rows = kb._table.to_pandas()
-            if not all_rows.empty:
-                import json
-                episodes = []
-                for _, row in all_rows.iterrows():
-                    try:
-                        metadata = json.loads(row.get("metadata", "{}"))
-                        if metadata.get("category") == "episode":
-                            timestamp = metadata.get("timestamp", 0)
-                            text = row.get("text", "")
-                            episodes.append({"text": text, "timestamp": timestamp})
-                    except:
-                        continue
-                
-                # 按时间排序，取最近的
-                if episodes:
-                    episodes.sort(key=lambda x: x["timestamp"], reverse=True)
-                    recent_episode = episodes[0]
-                    
-                    # 计算时间差
-                    elapsed = time.time() - recent_episode["timestamp"]
-                    if elapsed < 60:
-                        time_ago = "刚刚"
-                    elif elapsed < 3600:
-                        time_ago = f"{int(elapsed / 60)} 分钟前"
-                    elif elapsed < 86400:
-                        time_ago = f"{int(elapsed / 3600)} 小时前"
-                    else:
-                        days = int(elapsed / 86400)
-                        time_ago = f"{days} 天前"
-                    
-                    # 只有 7 天内的才提及
-                    if elapsed < 86400 * 7:
-                        episode_text = recent_episode["text"]
-                        # 去除时间戳前缀（如果有）
-                        import re
-                        episode_text = re.sub(r'^\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}\]\s*', '', episode_text)
-                        context_parts.append(f"你{time_ago}和主人聊过：{episode_text[:150]}")
-        except Exception as e:
-            logger.debug(f"检索 episode 失败: {e}")
+        # 🔥 最近的 episode 记忆
+        if recent_episode is _LOOKUP:
+            recent_episode = self.get_recent_episode()
+        if recent_episode:
+            episode_text, timestamp = recent_episode
+            
+            # 计算时间差
+            elapsed = time.time() - timestamp
+            if elapsed < 60:
+                time_ago = "刚刚"
+            elif elapsed < 3600:
+                time_ago = f"{int(elapsed / 60)} 分钟前"
+            elif elapsed < 86400:
+                time_ago = f"{int(elapsed / 3600)} 小时前"
+            else:
+                days = int(elapsed / 86400)
+                time_ago = f"{days} 天前"
+            
+            # 只有 7 天内的才提及
+            if elapsed < 86400 * 7:
+                # 去除时间戳前缀（如果有）
+                episode_text = re.sub(r'^\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}\]\s*', '', episode_text)
+                context_parts.append(f"你{time_ago}和主人聊过：{episode_text[:150]}")
         
         return "[时间信息]\n" + "\n".join(context_parts) if context_parts else ""
     
@@ -121,6 +121,9 @@ class NeuroPet:
 
             self.log.info(f"   VoxCPM 加载完成，采样率: {tts_engine.sample_rate}Hz")
             
+            # 🔥 后台预热 TTS/STT，与下面其余组件的初始化并行
+            warmup_thread = self._start_model_warmup(tts_engine)
+            
             from tts.audio_queue import AudioQueue
             from tts.player import SequentialPlayer
             self.audio_queue = AudioQueue()
@@ -156,11 +159,11 @@ class NeuroPet:
             # 🔥 静默屏幕观察器 (后台小祥默默观察主人)
             from core.screen_observer import get_screen_observer
             try:
-                from knowledge import get_knowledge_base
-                kb = get_knowledge_base()
+                # 不等待后台预加载：已就绪直接用，否则首次观察时再取
+                from knowledge import peek_knowledge_base
                 self.screen_observer = get_screen_observer(
                     llm_client=self.llm_client,
-                    knowledge_base=kb
+                    knowledge_base=peek_knowledge_base()
                 )
             except Exception as e:
                 self.log.warning(f"⚠️ 屏幕观察器初始化跳过 (知识库未就绪): {e}")
@@ -189,6 +192,10 @@ class NeuroPet:
             except Exception as e:
                 self.log.debug(f"定期清理未启用: {e}")
             
+            # 预热与首句问候共用模型，先等它结束
+            if warmup_thread is not None:
+                warmup_thread.join(timeout=30)
+            
             self.log.info("=" * 50)
             self.log.info("✅ 所有组件初始化完成!")
             self.log.info("=" * 50)
@@ -568,6 +575,8 @@ class NeuroPet:
                 await self.proactive_chat.stop()
             if self.knowledge_monitor:
                 self.knowledge_monitor.stop()
+            if self.llm_client:
+                await self.llm_client.aclose()
             
             if self.services:
                 self.services.stop_live2d()
@@ -577,7 +586,8 @@ class NeuroPet:
 
             # 退出时强制清理，避免显存泄漏
             self.log.info("🧹 退出清理中...")
-            from scripts.cleanup_memory import cleanup_all
+            from scripts.cleanup_memory import cleanup_all, stop_periodic_cleanup
+            stop_periodic_cleanup()
             cleanup_all(aggressive=True)
 
             self.log.info("✅ 退出完成")
@@ -633,6 +643,39 @@ class NeuroPet:
         except Exception as e:
             self.log.debug(f"保存对话摘要失败: {e}")
     
+    def _start_model_warmup(self, tts_engine):
+        """
+        启动后台预热线程 (按 config.WARMUP_MODELS)
+        
+        Returns:
+            预热线程，未启用时返回 None
+        """
+        targets = getattr(config, 'WARMUP_MODELS', [])
+        if not targets:
+            return None
+        
+        def _warmup():
+            if "tts" in targets:
+                try:
+                    self.log.info(f"🔥 TTS warmup: {tts_engine.warmup():.0f}ms")
+                except Exception as e:
+                    self.log.debug(f"TTS 预热失败: {e}")
+            
+            if "stt" in targets and self.transcriber is not None:
+                try:
+                    import numpy as np
+                    start = time.time()
+                    silence = np.zeros(config.AUDIO_SAMPLE_RATE // 2, dtype=np.float32)
+                    self.transcriber.transcribe(silence, config.AUDIO_SAMPLE_RATE)
+                    self.log.info(f"🔥 STT warmup: {(time.time() - start) * 1000:.0f}ms")
+                except Exception as e:
+                    self.log.debug(f"STT 预热失败: {e}")
+        
+        import threading
+        thread = threading.Thread(target=_warmup, daemon=True, name="ModelWarmup")
+        thread.start()
+        return thread
+    
     def start(self):
         """启动"""
         if not self.initialize():
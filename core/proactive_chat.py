@@ -442,8 +442,8 @@ class ProactiveChatManager:
 3. 如果语音无法识别，输出 "(无法识别的语音)"。
 """
             # 手动 Base64 编码
-            import base64
-            base64_audio = base64.b64encode(audio_bytes).decode("utf-8")
+            from llm.client import encode_audio_base64
+            base64_audio = await encode_audio_base64(audio_bytes)
             
             messages = [
                 {"role": "system", "content": system_prompt},
@@ -233,8 +233,8 @@ class ResponseHandler:
         try:
             # Voice-to-LLM: 混合消息格式
             # 手动 Base64 编码音频（因为 chat_stream 不处理 bytes）
-            import base64
-            base64_audio = base64.b64encode(audio_bytes).decode("utf-8")
+            from llm.client import encode_audio_base64
+            base64_audio = await encode_audio_base64(audio_bytes)
             
             messages = [
                 {"role": "system", "content": system_prompt},
@@ -361,19 +361,35 @@ class ResponseHandler:
         else:
             messages = self._build_messages(user_text)
         
+        # 短输入响应缓存（只用于普通对话回合，key 包含静态 system prompt）
+        response_cache = None
+        if not tool_result and getattr(config, "RESPONSE_CACHE_ENABLED", False):
+            from llm.response_cache import get_response_cache
+            response_cache = get_response_cache()
+        
         # 获取 LLM 响应（新架构：system prompt 已在 messages 中）
-        full_response = ""
-        print("🤖 AI: ", end="", flush=True)
-        async for chunk in self.llm_client.chat_stream(messages):
-            full_response += chunk
-            print(chunk, end="", flush=True)
-        print()
+        cached = response_cache.get(messages[0]["content"], user_text) if response_cache else None
+        if cached:
+            full_response = cached
+            logger.info("⚡ 命中响应缓存，跳过 LLM 调用")
+            print(f"🤖 AI: {full_response}")
+        else:
+            full_response = ""
+            print("🤖 AI: ", end="", flush=True)
+            async for chunk in self.llm_client.chat_stream(messages):
+                full_response += chunk
+                print(chunk, end="", flush=True)
+            print()
         
         # 检测 [IGNORE] - 选择性响应
         if full_response.strip().startswith("[IGNORE]"):
             logger.info("🙈 AI 决定忽略此输入")
             return
         
+        # 只缓存不含工具调用的普通回复
+        if response_cache and not cached and not self.tool_executor.has_tool_call(full_response):
+            response_cache.put(messages[0]["content"], user_text, full_response)
+        
         # 检测工具调用
         # 确定用于下一轮/历史记录的文本
         # 如果是工具结果回合，历史记录应该显示工具结果（或其摘要），而不是重复原始用户输入
@@ -69,9 +69,9 @@ class ScreenObserver:
     # 默认配置
     DEFAULT_INTERVAL = 120  # 2 分钟
     
-    def __init__(self, llm_client, knowledge_base):
+    def __init__(self, llm_client, knowledge_base=None):
         self.llm_client = llm_client
-        self.kb = knowledge_base
+        self._kb = knowledge_base  # 为 None 时首次观察再取（知识库可能仍在后台预加载）
         
         # 从配置读取参数
         self.enabled = getattr(config, 'SCREEN_OBSERVER_ENABLED', True)
@@ -83,6 +83,14 @@ class ScreenObserver:
         
         logger.info(f"👁️ 静默屏幕观察器已初始化 (间隔={self.interval}s)")
     
+    @property
+    def kb(self):
+        """知识库实例（延迟获取）"""
+        if self._kb is None:
+            from knowledge import get_knowledge_base
+            self._kb = get_knowledge_base()
+        return self._kb
+    
     def start(self):
         """启动观察器"""
         if not self.enabled:
@@ -231,6 +239,10 @@ class ScreenObserver:
                     self._last_observation = content
                     logger.info(f"👁️ 屏幕观察器 [OBSERVE]: [{doc_id}]")
                     logger.debug(f"   📝 内容: {content}")
+                    
+                    # 新记忆可能直接写入本进程的表，服务端版本号看不到，主动作废 prompt 缓存
+                    from llm.prompt_builder import get_prompt_builder
+                    get_prompt_builder().invalidate_cache()
 
 
 # 全局单例
@@ -241,7 +253,7 @@ def get_screen_observer(llm_client=None, knowledge_base=None) -> Optional[Screen
     """获取全局屏幕观察器实例"""
     global _screen_observer
     if _screen_observer is None:
-        if llm_client is None or knowledge_base is None:
+        if llm_client is None:
             return None
         _screen_observer = ScreenObserver(llm_client, knowledge_base)
     return _screen_observer
@@ -138,6 +138,16 @@ class BackgroundServices:
     
     # ==================== 🎯 交互信号处理 ====================
     
+    def _close_loop(self, loop):
+        """关闭临时事件循环 (先释放 LLM 客户端在该循环上的连接，否则 keep-alive 连接会泄漏)"""
+        try:
+            if self.pet.llm_client:
+                loop.run_until_complete(self.pet.llm_client.aclose())
+        except Exception as e:
+            self.log.debug(f"关闭 LLM 连接失败: {e}")
+        finally:
+            loop.close()
+    
     def _on_text_input(self, text: str):
         """处理文字输入 (从 Qt 线程调用)"""
         import asyncio
@@ -146,13 +156,14 @@ class BackgroundServices:
         
         # 在异步线程中处理
         def run_async():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
                 loop.run_until_complete(self._handle_text_input(text))
-                loop.close()
             except Exception as e:
                 self.log.error(f"文字输入处理失败: {e}")
+            finally:
+                self._close_loop(loop)
         
         threading.Thread(target=run_async, daemon=True).start()
     
@@ -177,13 +188,14 @@ class BackgroundServices:
         
         # 在异步线程中处理
         def run_async():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
                 loop.run_until_complete(self._handle_interaction(prompt))
-                loop.close()
             except Exception as e:
                 self.log.error(f"交互处理失败: {e}")
+            finally:
+                self._close_loop(loop)
         
         threading.Thread(target=run_async, daemon=True).start()
     
@@ -42,7 +42,7 @@ _os.environ["USE_TORCH"] = "1"  # 明确使用 PyTorch
 # ═══════════════════════════════════════════════════════════════════════════════
 
 # Core Implementation (直接访问，仅限 server.py 使用)
-from .core import KnowledgeBase, get_knowledge_base
+from .core import KnowledgeBase, get_knowledge_base, peek_knowledge_base
 
 # Client (推荐使用，通过 RPC 访问)
 from .client import (
@@ -61,6 +61,7 @@ __all__ = [
     # Direct access (仅限服务端)
     "KnowledgeBase",
     "get_knowledge_base",
+    "peek_knowledge_base",
     # Client access (推荐)
     "KnowledgeClient",
     "KnowledgeBaseProxy", 
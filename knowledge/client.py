@@ -11,7 +11,7 @@ import json
 import socket
 import subprocess
 import time
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from loguru import logger
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -126,6 +126,10 @@ class KnowledgeClient:
             "where": where
         })
     
+    def hybrid_search(self, query: str, k: int = 20) -> List[Dict]:
+        """关键词 + 向量混合检索 (RRF 合并)"""
+        return self._send_request("hybrid_search", {"query": query, "k": k})
+    
     def get_context_for_llm(self, query: str, n_results: int = 3, threshold: float = 1.5) -> str:
         """获取用于 LLM 的上下文"""
         return self._send_request("get_context_for_llm", {
@@ -138,10 +142,26 @@ class KnowledgeClient:
         """删除知识条目"""
         return self._send_request("delete", {"doc_id": doc_id})
     
+    def delete_many(self, ids: List[str]) -> bool:
+        """批量删除知识条目（服务端一次写入）"""
+        return self._send_request("delete_many", {"ids": list(ids)})
+    
     def count(self) -> int:
         """返回知识条目数量"""
         return self._send_request("count")
     
+    def version(self) -> int:
+        """知识库版本号（任何写入都会改变，用于判断缓存是否过期）"""
+        return self._send_request("version")
+    
+    def get_categories(self, ids: List[str]) -> Dict[str, str]:
+        """批量查询指定记录的分类 {id: category}"""
+        return self._send_request("get_categories", {"ids": list(ids)})
+    
+    def get_category_counts(self) -> Dict[str, int]:
+        """按分类统计条数（在服务端聚合，不传输记录内容）"""
+        return self._send_request("get_category_counts")
+    
     def add_with_dedup(self, text: str, metadata: Dict = None, similarity_threshold: float = 0.85) -> str:
         """去重添加知识条目"""
         return self._send_request("add_with_dedup", {
@@ -167,6 +187,16 @@ class KnowledgeClient:
     def get_all(self) -> List[Dict]:
         """获取所有记录"""
         return self._send_request("get_all")
+    
+    def iter_all(self, page_size: int = 500) -> Iterator[Dict]:
+        """逐页获取所有记录（不一次性拉取整张表）"""
+        offset = 0
+        while True:
+            page = self._send_request("get_page", {"offset": offset, "limit": page_size})
+            yield from page
+            if len(page) < page_size:
+                return
+            offset += page_size
 
 
 # ============================================================
@@ -8,15 +8,23 @@ import sys
 import time
 import uuid
 import json
-from typing import Optional, List, Dict
+import atexit
+import threading
+from typing import Optional, List, Dict, Iterator
 from loguru import logger
 
 import config
+from knowledge.embedding_cache import EmbeddingCache
 
 import lancedb
 import pyarrow as pa
 
 
+def _sql_str(value: str) -> str:
+    """转成 Lance SQL 字符串字面量"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
 class KnowledgeBase:
     """
     知识库
@@ -34,6 +42,7 @@ class KnowledgeBase:
         pa.field("id", pa.string()),
         pa.field("text", pa.string()),
         pa.field("metadata", pa.string()),  # JSON 字符串
+        pa.field("category", pa.string()),  # metadata.category 的冗余列，过滤/统计可下推到 Lance
         pa.field("vector", pa.list_(pa.float32(), 768)),  # BGE 输出 768 维
     ])
     
@@ -45,6 +54,11 @@ class KnowledgeBase:
         """初始化知识库"""
         self._json = json
         self.collection_name = collection_name or config.KNOWLEDGE_COLLECTION_NAME
+        # 文本向量缓存：重复的查询/添加免去 Embedding 推理，退出时落盘，下次启动恢复
+        self._embed_cache = EmbeddingCache(self.EMBEDDING_MODEL, maxsize=config.KNOWLEDGE_EMBED_CACHE_SIZE)
+        if self._embed_cache.load(config.KNOWLEDGE_EMBED_CACHE_PATH):
+            logger.debug(f"💾 Embedding 缓存已恢复 ({len(self._embed_cache)} 条)")
+        atexit.register(self._embed_cache.save, config.KNOWLEDGE_EMBED_CACHE_PATH)
         
         if persist_directory is None:
             persist_directory = config.KNOWLEDGE_LANCEDB_PATH
@@ -109,9 +123,96 @@ class KnowledgeBase:
             logger.error(f"❌ 表操作失败: {e}")
             raise
         
+        self._ensure_category_column()
+        
+        # 数据量够大时后台建 ANN 索引，不阻塞启动
+        self._has_vector_index = self._vector_index_exists()
+        if not self._has_vector_index and self.count() >= config.KNOWLEDGE_ANN_MIN_ROWS:
+            threading.Thread(target=self._build_vector_index, name="KBIndexBuild", daemon=True).start()
+        
         total_elapsed = time.time() - init_start
         logger.info(f"📚 知识库就绪: {self.count()} 条记录 (总耗时 {total_elapsed:.1f}s)")
     
+    def _ensure_category_column(self):
+        """旧表没有 category 列时补上，并从 metadata 回填"""
+        if "category" in self._table.schema.names:
+            return
+        
+        logger.info("📝 为知识库补充 category 列...")
+        self._table.add_columns({"category": "'unknown'"})
+        
+        ids_by_category: Dict[str, List[str]] = {}
+        for batch in self.iter_rows(columns=["id", "metadata"]):
+            for row in batch.to_pylist():
+                category = self._category_of(row["metadata"])
+                if category != "unknown":
+                    ids_by_category.setdefault(category, []).append(row["id"])
+        
+        # 每个分类一条 update (每批最多 500 个 id，避免 SQL 过长)
+        for category, ids in ids_by_category.items():
+            for start in range(0, len(ids), 500):
+                id_list = ", ".join(_sql_str(doc_id) for doc_id in ids[start:start + 500])
+                self._table.update(where=f"id IN ({id_list})", values={"category": category})
+    
+    def _vector_index_exists(self) -> bool:
+        try:
+            return any("vector" in index.columns for index in self._table.list_indices())
+        except Exception:
+            return False
+    
+    def _build_vector_index(self):
+        """
+        为 vector 列建 IVF_PQ 索引，检索从全表扫描变为只查若干分区
+        
+        度量沿用 L2：search() 的默认度量与各处 distance 阈值都按 L2 标定
+        """
+        try:
+            start = time.time()
+            rows = self.count()
+            self._table.create_index(
+                metric="L2",
+                vector_column_name="vector",
+                num_partitions=max(1, int(rows ** 0.5)),
+                num_sub_vectors=self.EMBEDDING_DIM // 16
+            )
+            self._has_vector_index = True
+            logger.info(f"🗂️ 向量索引已建立 ({rows} 条, {time.time() - start:.1f}s)")
+        except Exception as e:
+            logger.warning(f"向量索引建立失败，继续使用全表扫描: {e}")
+    
+    def _category_of(self, metadata) -> str:
+        """从 metadata (dict 或 JSON 字符串) 取分类"""
+        if isinstance(metadata, str):
+            try:
+                metadata = self._json.loads(metadata or "{}")
+            except ValueError:
+                return "unknown"
+        if not isinstance(metadata, dict):
+            return "unknown"
+        return metadata.get("category") or "unknown"
+    
+    def make_row(self, doc_id: str, text: str, metadata: Dict, vector) -> Dict:
+        """构造一行表记录 (category 列与 metadata 保持一致)"""
+        return {
+            "id": doc_id,
+            "text": text,
+            "metadata": self._json.dumps(metadata, ensure_ascii=False),
+            "category": self._category_of(metadata),
+            "vector": vector
+        }
+    
+    def warmup(self) -> float:
+        """
+        完整走一遍检索路径（Embedding 推理 + LanceDB 查询），
+        让首次真实查询不再承担 CUDA kernel / 表首次读取的冷启动开销
+        
+        Returns:
+            预热耗时 (ms)
+        """
+        start = time.time()
+        self._table.search(self._embed("warmup query")).limit(1).to_list()
+        return (time.time() - start) * 1000
+    
     def _embed(self, text: str) -> List[float]:
         """生成文本的向量表示"""
         return self._model.encode(
@@ -120,6 +221,15 @@ class KnowledgeBase:
             convert_to_numpy=True
         ).tolist()
     
+    def _embed_cached(self, text: str) -> List[float]:
+        """带缓存的 _embed"""
+        vector = self._embed_cache.get(text)
+        if vector is not None:
+            return vector.tolist()
+        vector = self._embed(text)
+        self._embed_cache.put(text, vector)
+        return vector
+    
     def _embed_batch(self, texts: List[str]) -> List[List[float]]:
         """批量生成向量 (强制串行以避免 Windows 下的死锁问题)"""
         results = []
@@ -143,26 +253,51 @@ class KnowledgeBase:
         if doc_id is None:
             doc_id = str(uuid.uuid4())[:8]
         
+        metadata = self._stamp_metadata(metadata, importance)
+        vector = self._embed_cached(text)
+        
+        self._table.add([self.make_row(doc_id, text, metadata, vector)])
+        
+        logger.debug(f"📝 添加知识: [{doc_id}] {text[:30]}...")
+        return doc_id
+    
+    @staticmethod
+    def _stamp_metadata(metadata: Optional[Dict], importance: float) -> Dict:
+        """新条目的初始统计字段"""
         if metadata is None:
             metadata = {}
-        
         metadata["importance"] = importance
         metadata["access_count"] = 0
         metadata["last_access"] = 0
         metadata["timestamp"] = time.time()
         metadata["consolidated"] = False
+        return metadata
+    
+    def add_many(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[Dict]] = None,
+        importance: float = 1.0
+    ) -> List[str]:
+        """
+        批量添加知识条目 (与逐条 add 相同的初始字段，但只写一次表)
         
-        vector = self._embed(text)
+        每次写入都会生成一个新的表版本/数据分片，合并成一次写入
+        """
+        if not texts:
+            return []
+        if metadatas is None:
+            metadatas = [None] * len(texts)
         
-        self._table.add([{
-            "id": doc_id,
-            "text": text,
-            "metadata": self._json.dumps(metadata, ensure_ascii=False),
-            "vector": vector
-        }])
+        vectors = self._embed_batch(texts)
+        rows = [
+            self.make_row(str(uuid.uuid4())[:8], text, self._stamp_metadata(metadata, importance), vector)
+            for text, metadata, vector in zip(texts, metadatas, vectors)
+        ]
+        self._table.add(rows)
         
-        logger.debug(f"📝 添加知识: [{doc_id}] {text[:30]}...")
-        return doc_id
+        logger.debug(f"📝 批量添加 {len(rows)} 条知识")
+        return [row["id"] for row in rows]
     
     def add_batch(self, items: List[Dict]) -> List[str]:
         """批量添加知识"""
@@ -177,12 +312,7 @@ class KnowledgeBase:
         for i, item in enumerate(items):
             doc_id = item.get("id", str(uuid.uuid4())[:8])
             ids.append(doc_id)
-            rows.append({
-                "id": doc_id,
-                "text": item["text"],
-                "metadata": self._json.dumps(item.get("metadata", {}), ensure_ascii=False),
-                "vector": vectors[i]
-            })
+            rows.append(self.make_row(doc_id, item["text"], item.get("metadata", {}), vectors[i]))
         
         self._table.add(rows)
         logger.info(f"📝 批量添加 {len(items)} 条知识")
@@ -196,8 +326,12 @@ class KnowledgeBase:
     ) -> List[Dict]:
         """语义搜索"""
         start = time.time()
-        query_vector = self._embed(query)
-        results = self._table.search(query_vector).limit(n_results).to_list()
+        query_vector = self._embed_cached(query)
+        builder = self._table.search(query_vector).limit(n_results)
+        if self._has_vector_index:
+            # 多查几个分区并用原始向量重排，弥补 PQ 量化带来的召回损失
+            builder = builder.nprobes(20).refine_factor(10)
+        results = builder.to_list()
         elapsed = (time.time() - start) * 1000
         
         formatted = []
@@ -230,6 +364,54 @@ class KnowledgeBase:
         
         return formatted
     
+    def _keyword_search(self, query: str, limit: int) -> List[Dict]:
+        """子串匹配 text (或精确匹配 id)，按命中次数排序"""
+        needle = query.strip().lower()
+        if not needle:
+            return []
+        # 查询里的 % _ \ 按字面匹配，不当通配符 (先转义反斜杠本身)
+        pattern = needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        where = (
+            f"lower(text) LIKE {_sql_str('%' + pattern + '%')} ESCAPE '\\'"
+            f" OR id = {_sql_str(query.strip())}"
+        )
+        columns = ["id", "text", "metadata"]
+        try:
+            rows = self._table.to_lance().to_table(columns=columns, filter=where).to_pylist()
+        except Exception:
+            rows = self._table.search().where(where).select(columns).limit(limit * 5).to_list()
+        
+        rows.sort(key=lambda r: (-(r["text"] or "").lower().count(needle), len(r["text"] or "")))
+        results = []
+        for row in rows[:limit]:
+            try:
+                metadata = self._json.loads(row.get("metadata") or "{}")
+            except ValueError:
+                metadata = {}
+            results.append({"id": row["id"], "text": row["text"] or "", "metadata": metadata})
+        return results
+    
+    def hybrid_search(self, query: str, k: int = 20) -> List[Dict]:
+        """
+        关键词 + 向量混合检索，按 RRF (sum 1/(60+rank)) 合并
+        
+        纯向量检索对精确 ID、罕见词不敏感，两路结果互补
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            vector_future = pool.submit(self.search, query, k)
+            keyword_future = pool.submit(self._keyword_search, query, k)
+            ranked_lists = [vector_future.result(), keyword_future.result()]
+        
+        merged: Dict[str, Dict] = {}
+        for results in ranked_lists:
+            for rank, item in enumerate(results):
+                entry = merged.setdefault(item["id"], dict(item, score=0.0))
+                entry["score"] += 1.0 / (60 + rank + 1)
+        
+        return sorted(merged.values(), key=lambda r: r["score"], reverse=True)[:k]
+    
     def get_context_for_llm(
         self,
         query: str,
@@ -289,7 +471,97 @@ class KnowledgeBase:
         except:
             return False
     
+    def delete_where(self, where: str) -> bool:
+        """按条件批量删除 (一次删除只产生一个新版本)"""
+        try:
+            self._table.delete(where)
+            return True
+        except Exception as e:
+            logger.warning(f"批量删除失败: {e}")
+            return False
+    
+    def delete_many(self, ids: List[str]) -> bool:
+        """按 id 批量删除 (一次写入)"""
+        if not ids:
+            return True
+        return self.delete_where(f"id IN ({', '.join(_sql_str(doc_id) for doc_id in ids)})")
+    
+    def get(self, doc_id: str) -> Optional[Dict]:
+        """按 id 读取单条记录 (不含向量)，不存在返回 None"""
+        try:
+            # 过滤下推到 Lance 扫描，读到一行即停
+            import pyarrow.dataset as ds
+            rows = self._table.to_lance().to_table(
+                columns=["id", "text", "metadata"],
+                filter=ds.field("id") == doc_id,
+                limit=1
+            ).to_pylist()
+        except Exception:
+            escaped = doc_id.replace("'", "''")
+            rows = (
+                self._table.search()
+                .where(f"id = '{escaped}'")
+                .select(["id", "text", "metadata"])
+                .limit(1)
+                .to_list()
+            )
+        return rows[0] if rows else None
+    
+    def get_categories(self, ids: List[str]) -> Dict[str, str]:
+        """只读取指定 id 的 category 列，返回 {id: category}"""
+        if not ids:
+            return {}
+        try:
+            # 过滤下推到 Lance 扫描，只读 id/category 两列
+            import pyarrow.dataset as ds
+            rows = self._table.to_lance().to_table(
+                columns=["id", "category"],
+                filter=ds.field("id").isin(ids)
+            ).to_pylist()
+        except Exception:
+            import pyarrow.compute as pc
+            table = self._table.to_arrow().select(["id", "category"])
+            rows = table.filter(pc.is_in(table["id"], value_set=pa.array(ids))).to_pylist()
+        
+        return {row["id"]: row["category"] or "" for row in rows}
+    
+    def get_category_counts(self) -> Dict[str, int]:
+        """按分类统计条数（只读 category 一列，在 Arrow 中聚合）"""
+        import pyarrow.compute as pc
+        try:
+            column = self._table.to_lance().to_table(columns=["category"])["category"]
+        except Exception:
+            column = self._table.to_arrow()["category"]
+        
+        counts: Dict[str, int] = {}
+        for item in pc.value_counts(column.combine_chunks()).to_pylist():
+            cat = item["values"] or "unknown"
+            counts[cat] = counts.get(cat, 0) + item["counts"]
+        return counts
+    
+    def version(self) -> int:
+        """表版本号 (每次写入/删除都会递增)，用于判断缓存是否过期"""
+        return self._table.version
+    
+    def iter_rows(self, columns: Optional[List[str]] = None, batch_size: int = 1024) -> Iterator[pa.RecordBatch]:
+        """
+        分批扫描整表，默认不读 vector 列
+        
+        管理脚本逐行遍历用，不必把整表连同向量一起读进内存
+        """
+        if columns is None:
+            columns = [name for name in self.SCHEMA.names if name != "vector"]
+        try:
+            batches = self._table.to_lance().to_batches(columns=columns, batch_size=batch_size)
+        except Exception:
+            batches = self._table.to_arrow().select(columns).to_batches(max_chunksize=batch_size)
+        yield from batches
+    
     def count(self) -> int:
+        try:
+            return self._table.count_rows()
+        except Exception:
+            pass
         try:
             return len(self._table.to_arrow())
         except:
@@ -310,11 +582,23 @@ class KnowledgeBase:
 
 # 全局单例
 _knowledge_base: Optional[KnowledgeBase] = None
+_knowledge_base_lock = threading.Lock()
 
 def get_knowledge_base() -> KnowledgeBase:
-    """获取全局知识库实例"""
+    """
+    获取全局知识库实例
+    
+    main.py 在后台线程预加载；加锁保证加载期间其他线程的调用等待同一个实例，
+    而不是再加载一遍 Embedding 模型
+    """
     global _knowledge_base
     if _knowledge_base is None:
-        logger.debug("📚 首次初始化知识库单例...")
-        _knowledge_base = KnowledgeBase()
+        with _knowledge_base_lock:
+            if _knowledge_base is None:
+                logger.debug("📚 首次初始化知识库单例...")
+                _knowledge_base = KnowledgeBase()
+    return _knowledge_base
+
+def peek_knowledge_base() -> Optional[KnowledgeBase]:
+    """已初始化则返回知识库实例，否则返回 None（不阻塞、不触发加载）"""
     return _knowledge_base
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Embedding 缓存
+文本 → 向量的 LRU 缓存，重启后从 .npz 恢复，重复的查询/添加免去一次模型推理
+"""
+
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+
+class EmbeddingCache:
+    """
+    文本向量缓存
+
+    - key: blake2b(text) 前 16 字节，不保存原文
+    - 超过 maxsize 淘汰最久未用的条目，超过 ttl 的条目视为失效
+    - 持久化文件记录模型名，换模型后旧缓存自动作废
+    """
+
+    def __init__(self, model_name: str, maxsize: int = 4096, ttl: float = 7 * 86400):
+        self.model_name = model_name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[bytes, Tuple[np.ndarray, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """命中返回向量，未命中或已过期返回 None"""
+        key = self._key(text)
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            vector, created = item
+            if time.time() - created > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return vector
+
+    def put(self, text: str, vector) -> None:
+        key = self._key(text)
+        with self._lock:
+            self._data[key] = (np.asarray(vector, dtype=np.float32), time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            self._dirty = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._dirty = True
+
+    def save(self, path: str) -> None:
+        """写入 .npz (先写临时文件再替换，中途退出不会留下半个文件)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            items = list(self._data.items())
+            self._dirty = False
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    model=np.array(self.model_name),
+                    keys=np.frombuffer(b"".join(k for k, _ in items), dtype=np.uint8).reshape(-1, 16),
+                    vectors=np.stack([v for _, (v, _) in items]) if items else np.empty((0, 0), np.float32),
+                    created=np.array([c for _, (_, c) in items], dtype=np.float64),
+                )
+            os.replace(tmp_path, path)
+            logger.debug(f"💾 Embedding 缓存已保存 ({len(items)} 条)")
+        except Exception as e:
+            logger.warning(f"Embedding 缓存保存失败: {e}")
+
+    def load(self, path: str) -> int:
+        """从 .npz 恢复，返回载入条数 (模型不一致或文件损坏时忽略)"""
+        if not os.path.exists(path):
+            return 0
+        try:
+            with np.load(path) as data:
+                if str(data["model"]) != self.model_name:
+                    logger.info("📝 Embedding 模型已变更，丢弃旧缓存")
+                    return 0
+                keys, vectors, created = data["keys"], data["vectors"], data["created"]
+        except Exception as e:
+            logger.warning(f"Embedding 缓存读取失败: {e}")
+            return 0
+
+        now = time.time()
+        with self._lock:
+            # 按创建时间从旧到新插入，保留最新的 maxsize 条
+            for i in np.argsort(created)[-self.maxsize:]:
+                if now - created[i] <= self.ttl:
+                    self._data[keys[i].tobytes()] = (vectors[i], float(created[i]))
+        return len(self._data)
@@ -64,12 +64,7 @@ class MemoryManager:
                     
                     # 更新记录
                     self.kb._table.delete(f"id = '{doc_id}'")
-                    self.kb._table.add([{
-                        "id": doc_id,
-                        "text": row["text"],
-                        "metadata": self.kb._json.dumps(metadata, ensure_ascii=False),
-                        "vector": row["vector"]
-                    }])
+                    self.kb._table.add([self.kb.make_row(doc_id, row["text"], metadata, row["vector"])])
                     
                     logger.debug(f"📊 更新重要性: [{doc_id}] {old_importance:.1f} -> {new_importance:.1f}")
                     
@@ -145,12 +140,7 @@ class MemoryManager:
                     
                     # 更新记录
                     self.kb._table.delete(f"id = '{doc_id}'")
-                    self.kb._table.add([{
-                        "id": doc_id,
-                        "text": row["text"],
-                        "metadata": self.kb._json.dumps(metadata, ensure_ascii=False),
-                        "vector": row["vector"]
-                    }])
+                    self.kb._table.add([self.kb.make_row(doc_id, row["text"], metadata, row["vector"])])
                     
                     logger.debug(f"📊 BOOST: [{doc_id}] {old_importance:.1f} -> {new_importance:.1f}")
                     
@@ -209,12 +199,7 @@ class MemoryManager:
                     metadata["category"] = "core"
                     
                     self.kb._table.delete(f"id = '{doc_id}'")
-                    self.kb._table.add([{
-                        "id": doc_id,
-                        "text": row["text"],
-                        "metadata": self.kb._json.dumps(metadata, ensure_ascii=False),
-                        "vector": row["vector"]
-                    }])
+                    self.kb._table.add([self.kb.make_row(doc_id, row["text"], metadata, row["vector"])])
                     
                     logger.info(f"⭐ 记忆升级为核心: [{doc_id}]")
                     return True
@@ -247,12 +232,7 @@ class MemoryManager:
                     
                     # 更新记录
                     self.kb._table.delete(f"id = '{doc_id}'")
-                    self.kb._table.add([{
-                        "id": doc_id,
-                        "text": new_text,
-                        "metadata": self.kb._json.dumps(metadata, ensure_ascii=False),
-                        "vector": new_vector
-                    }])
+                    self.kb._table.add([self.kb.make_row(doc_id, new_text, metadata, new_vector)])
                     
                     logger.info(f"📝 更新记忆内容: [{doc_id}] → {new_text[:50]}...")
                     return True
@@ -444,12 +424,7 @@ class MemoryManager:
                     metadata["last_access"] = time.time()
                     
                     self.kb._table.delete(f"id = '{doc_id}'")
-                    self.kb._table.add([{
-                        "id": doc_id,
-                        "text": row["text"],
-                        "metadata": self.kb._json.dumps(metadata, ensure_ascii=False),
-                        "vector": row["vector"]
-                    }])
+                    self.kb._table.add([self.kb.make_row(doc_id, row["text"], metadata, row["vector"])])
                     logger.debug(f"📊 重置重要性: [{doc_id}] -> {new_importance}")
                     return True
             return False
@@ -467,12 +442,7 @@ class MemoryManager:
                     metadata["promotion_rejected"] = True
                     
                     self.kb._table.delete(f"id = '{doc_id}'")
-                    self.kb._table.add([{
-                        "id": doc_id,
-                        "text": row["text"],
-                        "metadata": self.kb._json.dumps(metadata, ensure_ascii=False),
-                        "vector": row["vector"]
-                    }])
+                    self.kb._table.add([self.kb.make_row(doc_id, row["text"], metadata, row["vector"])])
                     logger.info(f"⛔ 设置升级淘汰标记: [{doc_id}]")
                     return True
             return False
@@ -494,12 +464,7 @@ class MemoryManager:
                     metadata["delete_cooldown_until"] = time.time() + cooldown_seconds
                     
                     self.kb._table.delete(f"id = '{doc_id}'")
-                    self.kb._table.add([{
-                        "id": doc_id,
-                        "text": row["text"],
-                        "metadata": self.kb._json.dumps(metadata, ensure_ascii=False),
-                        "vector": row["vector"]
-                    }])
+                    self.kb._table.add([self.kb.make_row(doc_id, row["text"], metadata, row["vector"])])
                     logger.info(f"⏳ 设置删除冷却期: [{doc_id}] ({self.DELETE_COOLDOWN_HOURS}h)")
                     return True
             return False
@@ -510,12 +475,7 @@ class MemoryManager:
     def _update_memory_metadata(self, row, metadata):
         """更新记忆的 metadata"""
         self.kb._table.delete(f"id = '{row['id']}'")
-        self.kb._table.add([{
-            "id": row["id"],
-            "text": row["text"],
-            "metadata": self.kb._json.dumps(metadata, ensure_ascii=False),
-            "vector": row["vector"]
-        }])
+        self.kb._table.add([self.kb.make_row(row["id"], row["text"], metadata, row["vector"])])
 
 
 def create_memory_manager(knowledge_base) -> MemoryManager:
@@ -159,6 +159,12 @@ class KnowledgeServer:
                 where=params.get("where")
             )
         
+        elif method == "hybrid_search":
+            return self.kb.hybrid_search(
+                query=params["query"],
+                k=params.get("k", 20)
+            )
+        
         elif method == "get_context_for_llm":
             return self.kb.get_context_for_llm(
                 query=params["query"],
@@ -169,9 +175,21 @@ class KnowledgeServer:
         elif method == "delete":
             return self.kb.delete(params["doc_id"])
         
+        elif method == "delete_many":
+            return self.kb.delete_many(params.get("ids", []))
+        
         elif method == "count":
             return self.kb.count()
         
+        elif method == "version":
+            return self.kb.version()
+        
+        elif method == "get_categories":
+            return self.kb.get_categories(params.get("ids", []))
+        
+        elif method == "get_category_counts":
+            return self.kb.get_category_counts()
+        
         elif method == "update_importance":
             return self.kb.update_importance(
                 doc_id=params["doc_id"],
@@ -205,6 +223,27 @@ class KnowledgeServer:
                 })
             return records
         
+        elif method == "get_page":
+            # 分页获取记录（管理面板流式输出用，单次响应大小有上限）
+            import json
+            offset = params.get("offset", 0)
+            limit = params.get("limit", 500)
+            columns = ["id", "text", "metadata"]
+            try:
+                # offset/limit 下推到 Lance 扫描，只读这一页的三列
+                rows = self.kb._table.to_lance().to_table(
+                    columns=columns, offset=offset, limit=limit
+                ).to_pylist()
+            except Exception:
+                rows = self.kb._table.to_arrow().select(columns).slice(offset, limit).to_pylist()
+            for row in rows:
+                try:
+                    row["metadata"] = json.loads(row["metadata"] or "{}")
+                except (TypeError, ValueError):
+                    row["metadata"] = {}
+                row["text"] = row["text"] or ""
+            return rows
+        
         elif method == "ping":
             return "pong"
         
@@ -32,10 +32,11 @@ import sys
 import os
 import math
 import random
-import time
+from time import monotonic as _now
 from typing import Optional, Callable
 
-from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot
+import numpy as np
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal, pyqtSlot
 from PyQt5.QtWidgets import QApplication, QOpenGLWidget
 import OpenGL.GL as GL
 
@@ -43,8 +44,8 @@ import live2d.v3 as live2d
 from live2d.utils.canvas import Canvas
 
 from .lipsync import VOWEL_SHAPES
-from .expressions import Params, EXPRESSIONS
-from .emotion_modifiers import get_emotion_modifier, EmotionModifier
+from .expressions import Params, EXPRESSIONS, EXPRESSION_PARAMS, EXPRESSION_SLOTS, EXPRESSION_ARRAYS
+from .emotion_modifiers import get_emotion_vec
 
 # 导入配置
 try:
@@ -52,6 +53,86 @@ try:
 except ImportError:
     config = None
 
+_TAU = 2 * math.pi
+# 口型参数变化小于该阈值时不重复写入
+_MOUTH_SEND_EPS = 1e-3
+
+# 由情绪偏移系统 (_tick 第 8 步) 单独写入的参数，表情插值循环中跳过
+_OFFSET_PARAMS = frozenset((
+    Params.EYE_L_OPEN, Params.EYE_R_OPEN,
+    Params.EYE_L_SMILE, Params.EYE_R_SMILE,
+    Params.BROW_L_Y, Params.BROW_R_Y,
+    Params.CHEEK, Params.MOUTH_FORM,
+))
+# 说话时由口型同步接管的参数
+_SPEAKING_PARAMS = frozenset((Params.MOUTH_OPEN_Y, Params.MOUTH_FORM))
+
+# 表情向量的槽位掩码与偏移系统读取的槽位
+_OFFSET_MASK = np.array([p in _OFFSET_PARAMS for p in EXPRESSION_PARAMS])
+_SPEAKING_MASK = np.array([p in _SPEAKING_PARAMS for p in EXPRESSION_PARAMS])
+_SLOT_EYE_OPEN = EXPRESSION_SLOTS[Params.EYE_L_OPEN]
+_SLOT_EYE_SMILE = EXPRESSION_SLOTS[Params.EYE_L_SMILE]
+_SLOT_BROW_L_Y = EXPRESSION_SLOTS[Params.BROW_L_Y]
+_SLOT_BROW_R_Y = EXPRESSION_SLOTS[Params.BROW_R_Y]
+_SLOT_CHEEK = EXPRESSION_SLOTS[Params.CHEEK]
+
+# 未定义表情的目标值 (只读零向量)
+_NO_EXPRESSION = np.zeros(len(EXPRESSION_PARAMS))
+_NO_EXPRESSION.flags.writeable = False
+
+
+# ==================== 表情内循环动画 ====================
+# 由 set_expression 按表情选定函数，每帧只做一次间接调用，不再逐帧比较表情名
+
+def _no_loop(ctl) -> list:
+    """无循环动画"""
+    return []
+
+
+def _no_offset(ctl) -> float:
+    """无循环叠加值"""
+    return 0.0
+
+
+def _loop_thinking(ctl) -> list:
+    """thinking: 眼球缓慢左右/上下移动（模拟思考）"""
+    eye_x = math.sin(ctl._ph_think_x) * ctl.thinking_eye_amp_x
+    eye_y = math.sin(ctl._ph_think_y) * ctl.thinking_eye_amp_y
+    return [("ParamEyeBallX", eye_x), ("ParamEyeBallY", eye_y)]
+
+
+def _loop_shy(ctl) -> list:
+    """shy/embarrassed: 眼球周期性向一侧躲避"""
+    phase = (math.sin(ctl._ph_shy_eye) + 1) * 0.5
+    return [("ParamEyeBallX", ctl.shy_eye_amp * phase)]
+
+
+def _loop_curious(ctl) -> list:
+    """curious: 好奇地歪头周期循环（叠加到已有的头部摆动，所以效果更明显）"""
+    head_tilt = math.sin(ctl._ph_curious) * ctl.curious_head_amp
+    current_z = math.sin(ctl._ph_sway) * ctl.head_sway_amp if ctl.head_sway_amp > 0 else 0
+    return [("ParamAngleZ", current_z + head_tilt * 0.5)]
+
+
+def _smile_loop(ctl) -> float:
+    """笑眼轻微波动 (happy/excited/smug/mischievous)"""
+    return math.sin(ctl._ph_smile) * ctl.happy_smile_amp
+
+
+def _cheek_loop(ctl) -> float:
+    """脸红轻微闪烁 (shy/embarrassed)"""
+    return (math.sin(ctl._ph_cheek) + 1) * 0.5 * ctl.shy_cheek_amp
+
+
+_LOOP_FNS = {
+    "thinking": _loop_thinking,
+    "shy": _loop_shy,
+    "embarrassed": _loop_shy,
+    "curious": _loop_curious,
+}
+_SMILE_LOOP_FNS = dict.fromkeys(("happy", "excited", "smug", "mischievous"), _smile_loop)
+_CHEEK_LOOP_FNS = dict.fromkeys(("shy", "embarrassed"), _cheek_loop)
+
 
 class Live2DController(QOpenGLWidget):
     """Live2D 桌宠控制器 - 使用底层 Model 类
@@ -93,6 +174,12 @@ class Live2DController(QOpenGLWidget):
         self.display_width = width
         self.display_height = height
         self.fps = fps
+        self.hidden_interval_ms = 250        # 隐藏时降频的定时器间隔
+        
+        # 动画定时器 (PreciseTimer，避免默认 CoarseTimer 造成的帧间隔抖动)
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
         
         # 使用底层 Model 类
         self.model: Optional[live2d.Model] = None
@@ -100,10 +187,18 @@ class Live2DController(QOpenGLWidget):
         
         # 参数索引缓存
         self.param_indices = {}
+        self._has_head_z = False             # 热路径参数是否存在 (initializeGL 中检测)
+        self._has_mouth = False
+        self._has_face = False
         
-        # 时间追踪
-        self.last_time = time.time()
-        self.start_time = time.time()
+        # 时间追踪 (单调时钟，不受系统时间校正影响)
+        self.last_time = _now()
+        
+        # 振荡器相位累加器 (按 delta_time 推进并对 2π 取模)
+        # 不用 t = now - start_time，避免长时间运行后 t 过大导致 sin 精度下降
+        self._ph_tail = 0.0
+        self._ph_body = 0.0
+        self._ph_sway = 0.0
         
         # === Idle 参数 (从 config 读取，带默认值回退) ===
         self.enable_physics = getattr(config, 'LIVE2D_IDLE_PHYSICS_ENABLED', True) if config else True
@@ -119,9 +214,14 @@ class Live2DController(QOpenGLWidget):
         self.blink_interval_min = getattr(config, 'LIVE2D_IDLE_BLINK_INTERVAL_MIN', 2.0) if config else 2.0
         self.blink_interval_max = getattr(config, 'LIVE2D_IDLE_BLINK_INTERVAL_MAX', 5.0) if config else 5.0
         
+        # 热路径随机数池 (一次性批量生成，避免逐帧调用 random)
+        self._rand_pool_size = 4096
+        self._rand_pool = np.random.random(self._rand_pool_size).tolist()
+        self._rand_idx = 0
+        
         # 眨眼状态
         self.blink_value = 1.0
-        self.next_blink_time = time.time() + random.uniform(self.blink_interval_min, self.blink_interval_max)
+        self.next_blink_time = _now() + self._rand_uniform(self.blink_interval_min, self.blink_interval_max)
         self.is_blinking = False
         self.blink_phase = 0
         
@@ -132,11 +232,18 @@ class Live2DController(QOpenGLWidget):
         self.current_mouth_form = 0.0
         self.mouth_smoothing = 0.25
         self.is_speaking = False
+        self._last_mouth_open_sent = math.inf   # 上次写入模型的口型值 (inf = 需要重写)
+        self._last_mouth_form_sent = math.inf
         
         # === 表情系统 (带过渡) ===
         self.current_expression = "neutral"
-        self.current_expression_values = {}   # 当前插值中的表情参数
-        self.target_expression_values = {}    # 目标表情参数
+        # 表情参数按 EXPRESSION_PARAMS 槽位存成向量，插值一次完成
+        self._expr_current = np.zeros(len(EXPRESSION_PARAMS))   # 当前插值中的表情参数
+        self._expr_target = _NO_EXPRESSION                       # 目标表情参数 (只读)
+        # 槽位 → 模型参数索引，以及可写槽位掩码 (initializeGL 中解析)
+        self._expr_model_idx = np.full(len(EXPRESSION_PARAMS), -1)
+        self._expr_write_mask = np.zeros(len(EXPRESSION_PARAMS), dtype=bool)
+        self._expr_write_mask_speaking = self._expr_write_mask
         self.expression_lerp_speed = getattr(config, 'LIVE2D_EXPRESSION_LERP_SPEED', 0.08) if config else 0.08
         
         # === 情绪调制系统 ===
@@ -150,6 +257,7 @@ class Live2DController(QOpenGLWidget):
         # 头部摆动
         self.head_sway_amp = 0.0
         self.head_sway_speed = 0.3
+        self._update_omegas()
         
         # 表情参数偏移 (由情绪调制)
         self.eye_open_offset = 0.0
@@ -160,6 +268,22 @@ class Live2DController(QOpenGLWidget):
         
         # === 表情内循环动画 (Expression Loops) ===
         self.enable_expression_loops = True
+        # 循环动画都是亚赫兹级的缓慢振荡，每 N 帧重新计算一次即可
+        self.expression_loop_interval = 3
+        self._frame_counter = 0
+        self._loop_smile = 0.0
+        self._loop_cheek = 0.0
+        self._loop_params = []               # 缓存的循环动画参数 [(name, value)]
+        self._loop_fn = _no_loop             # 当前表情的循环动画函数 (set_expression 中切换)
+        self._smile_loop_fn = _no_offset
+        self._cheek_loop_fn = _no_offset
+        self._loop_dt = 0.0                  # 距上次刷新累计的时间
+        self._ph_smile = 0.0
+        self._ph_cheek = 0.0
+        self._ph_think_x = 0.0
+        self._ph_think_y = 0.0
+        self._ph_shy_eye = 0.0
+        self._ph_curious = 0.0
         # thinking: 眼球缓慢移动
         self.thinking_eye_speed = 0.3
         self.thinking_eye_amp_x = 0.4
@@ -243,23 +367,80 @@ class Live2DController(QOpenGLWidget):
         param_ids = self.model.GetParameterIds()
         for i, pid in enumerate(param_ids):
             self.param_indices[pid] = i
+        self._cache_hot_param_indices()
         
         # 创建 Canvas
         self.canvas = Canvas()
         self.canvas.SetSize(self.display_width, self.display_height)
         
-        self.startTimer(int(1000 / self.fps))
+        self._timer.start(int(1000 / self.fps))
         print("Live2D Controller initialized (using low-level Model class)")
     
-    def timerEvent(self, event):
+    def _cache_hot_param_indices(self):
+        """缓存每帧都要写入的参数索引，缺失的参数会禁用对应动画"""
+        idx = self.param_indices.get
+        self._idx_breath = idx("ParamBreath")
+        self._idx_body_y = idx("ParamBodyAngleY")
+        self._idx_angle_z = idx("ParamAngleZ")
+        self._idx_mouth_open = idx("ParamMouthOpenY")
+        self._idx_mouth_form = idx("ParamMouthForm")
+        self._idx_eye_l_open = idx("ParamEyeLOpen")
+        self._idx_eye_r_open = idx("ParamEyeROpen")
+        self._idx_eye_l_smile = idx("ParamEyeLSmile")
+        self._idx_eye_r_smile = idx("ParamEyeRSmile")
+        self._idx_brow_l_y = idx("ParamBrowLY")
+        self._idx_brow_r_y = idx("ParamBrowRY")
+        self._idx_cheek = idx("ParamCheek")
+        
+        face = (
+            self._idx_eye_l_open, self._idx_eye_r_open,
+            self._idx_eye_l_smile, self._idx_eye_r_smile,
+            self._idx_brow_l_y, self._idx_brow_r_y, self._idx_cheek,
+        )
+        self.enable_tail = self.enable_tail and self._idx_breath is not None
+        self.enable_body_breath = self.enable_body_breath and self._idx_body_y is not None
+        self._has_head_z = self._idx_angle_z is not None
+        self._has_mouth = self._idx_mouth_open is not None and self._idx_mouth_form is not None
+        # 各表情参数独立写入 (缺某一个不影响其余，例如没有 ParamCheek 仍要眨眼)
+        self._has_face = any(i is not None for i in face)
+        if not (self._has_head_z and self._has_mouth and all(i is not None for i in face)):
+            print("⚠️ 模型缺少部分 Idle/表情参数，对应动画已禁用")
+        
+        # 表情槽位解析为模型参数索引，偏移系统处理的参数与模型缺失的参数不写入
+        self._expr_model_idx = np.array([self.param_indices.get(name, -1) for name in EXPRESSION_PARAMS])
+        self._expr_write_mask = (self._expr_model_idx >= 0) & ~_OFFSET_MASK
+        self._expr_write_mask_speaking = self._expr_write_mask & ~_SPEAKING_MASK
+    
+    def _tick(self):
         """定时器回调 - 更新动画"""
         if not self.model:
             return
         
-        current_time = time.time()
+        # === 0. 不可见时跳过 (隐藏/最小化时画面不会被使用) ===
+        if not self.isVisible() or self.visibleRegion().isEmpty():
+            self.last_time = _now()
+            return
+        
+        # 热路径局部绑定 (LOAD_FAST 比属性链查找快)
+        _sp = self.model.SetParameterValue
+        sin = math.sin
+        
+        current_time = _now()
         delta_time = current_time - self.last_time
         self.last_time = current_time
-        t = current_time - self.start_time
+        
+        # 表情循环动画每 N 帧刷新一次，其余帧复用缓存值
+        self._frame_counter += 1
+        self._loop_dt += delta_time
+        refresh_loops = self._frame_counter % self.expression_loop_interval == 0
+        if refresh_loops:
+            self._advance_loop_phases(self._loop_dt)
+            self._loop_dt = 0.0
+            if self.enable_expression_loops:
+                self._loop_smile = self._smile_loop_fn(self)
+                self._loop_cheek = self._cheek_loop_fn(self)
+            else:
+                self._loop_smile = self._loop_cheek = 0.0
         
         # === 1. Physics (头发物理) ===
         if self.enable_physics:
@@ -267,18 +448,21 @@ class Live2DController(QOpenGLWidget):
         
         # === 2. 尾巴摆动 ===
         if self.enable_tail:
-            breath = (math.sin(t * self.tail_speed * math.pi) + 1) / 2 * self.tail_amplitude
-            self._set_param("ParamBreath", breath)
+            self._ph_tail = (self._ph_tail + self._tail_omega * delta_time) % _TAU
+            breath = (sin(self._ph_tail) + 1) / 2 * self.tail_amplitude
+            _sp(self._idx_breath, breath, 1.0)
         
         # === 3. 身体呼吸模拟 ===
         if self.enable_body_breath:
-            body_y = math.sin(t * self.body_breath_speed * math.pi * 2) * self.body_breath_amplitude
-            self._set_param("ParamBodyAngleY", body_y)
+            self._ph_body = (self._ph_body + self._body_omega * delta_time) % _TAU
+            body_y = sin(self._ph_body) * self.body_breath_amplitude
+            _sp(self._idx_body_y, body_y, 1.0)
         
         # === 4. 头部轻微摆动 ===
-        if self.head_sway_amp > 0:
-            head_z = math.sin(t * self.head_sway_speed * math.pi) * self.head_sway_amp
-            self._set_param("ParamAngleZ", head_z)
+        self._ph_sway = (self._ph_sway + self._sway_omega * delta_time) % _TAU
+        if self.head_sway_amp > 0 and self._has_head_z:
+            head_z = sin(self._ph_sway) * self.head_sway_amp
+            _sp(self._idx_angle_z, head_z, 1.0)
         
         # === 5. 眨眼 ===
         if self.enable_blink:
@@ -286,63 +470,78 @@ class Live2DController(QOpenGLWidget):
         
         # === 6. 口型 ===
         self._update_mouth()
-        if self.is_speaking or self.current_mouth_open > 0.01:
-            self._set_param("ParamMouthOpenY", self.current_mouth_open)
-            # 嘴巴形状 = 说话形状 + 偏移
-            mouth_form = self.current_mouth_form + self.mouth_form_offset
-            self._set_param("ParamMouthForm", max(-1.0, min(1.0, mouth_form)))
-        elif self.mouth_form_offset != 0:
-            # 不说话时也应用偏移
-            self._set_param("ParamMouthForm", max(-1.0, min(1.0, self.mouth_form_offset)))
+        if self._has_mouth:
+            speaking = self.is_speaking
+            mouth_form = None
+            if not speaking:
+                # 不说话时表情插值也会写 MouthOpenY，缓存失效
+                self._last_mouth_open_sent = math.inf
+            if speaking or self.current_mouth_open > 0.01:
+                mouth_open = self.current_mouth_open
+                if abs(mouth_open - self._last_mouth_open_sent) > _MOUTH_SEND_EPS:
+                    _sp(self._idx_mouth_open, mouth_open, 1.0)
+                    self._last_mouth_open_sent = mouth_open if speaking else math.inf
+                # 嘴巴形状 = 说话形状 + 偏移
+                mouth_form = max(-1.0, min(1.0, self.current_mouth_form + self.mouth_form_offset))
+            elif self.mouth_form_offset != 0:
+                # 不说话时也应用偏移
+                mouth_form = max(-1.0, min(1.0, self.mouth_form_offset))
+            # MouthForm 只由这里写入，持续元音时平滑值已收敛，跳过重复写入
+            if mouth_form is not None and abs(mouth_form - self._last_mouth_form_sent) > _MOUTH_SEND_EPS:
+                _sp(self._idx_mouth_form, mouth_form, 1.0)
+                self._last_mouth_form_sent = mouth_form
         
         # === 7. 表情参数 (平滑过渡) ===
         self._update_expression()
-        for param_name, value in self.current_expression_values.items():
-            # 跳过由偏移系统处理的参数
-            if param_name in (Params.EYE_L_OPEN, Params.EYE_R_OPEN, 
-                             Params.EYE_L_SMILE, Params.EYE_R_SMILE,
-                             Params.BROW_L_Y, Params.BROW_R_Y,
-                             Params.CHEEK, Params.MOUTH_FORM):
-                continue
-            if param_name in ("ParamMouthOpenY", "ParamMouthForm") and self.is_speaking:
-                continue
-            self._set_param(param_name, value)
+        expr_current = self._expr_current
+        # 跳过由偏移系统处理的参数 (说话时还跳过口型参数)，只写入仍在生效的槽位
+        mask = self._expr_write_mask_speaking if self.is_speaking else self._expr_write_mask
+        mask = mask & ((expr_current != 0.0) | (self._expr_target != 0.0))
+        for idx, value in zip(self._expr_model_idx[mask].tolist(), expr_current[mask].tolist()):
+            _sp(idx, value, 1.0)
+        expr = expr_current.tolist()
         
         # === 8. 情绪参数偏移叠加 ===
-        # 眼睛 = 眨眼值 + 表情值 + 偏移 + 说话增强
-        expr_eye_open = self.current_expression_values.get(Params.EYE_L_OPEN, 0.0)
-        speaking_eye_bonus = self.current_mouth_open * self.speaking_eye_open_mult if self.enable_speaking_enhancement and self.is_speaking else 0
-        eye_open_final = self.blink_value + expr_eye_open + self.eye_open_offset + speaking_eye_bonus
-        self._set_param("ParamEyeLOpen", max(0, min(1.5, eye_open_final)))
-        self._set_param("ParamEyeROpen", max(0, min(1.5, eye_open_final)))
-        
-        # 笑眼 = 表情值 + 偏移 + 表情循环
-        expr_eye_smile = self.current_expression_values.get(Params.EYE_L_SMILE, 0.0)
-        smile_loop = self._get_expression_loop_smile(t)
-        eye_smile_final = expr_eye_smile + self.eye_smile_offset + smile_loop
-        self._set_param("ParamEyeLSmile", max(0, min(1.0, eye_smile_final)))
-        self._set_param("ParamEyeRSmile", max(0, min(1.0, eye_smile_final)))
-        
-        # 眉毛 = 表情值 + 偏移 + 说话增强
-        expr_brow_l = self.current_expression_values.get(Params.BROW_L_Y, 0.0)
-        expr_brow_r = self.current_expression_values.get(Params.BROW_R_Y, 0.0)
-        speaking_brow_bonus = self.current_mouth_open * self.speaking_brow_mult if self.enable_speaking_enhancement and self.is_speaking else 0
-        self._set_param("ParamBrowLY", expr_brow_l + self.brow_y_offset + speaking_brow_bonus)
-        self._set_param("ParamBrowRY", expr_brow_r + self.brow_y_offset + speaking_brow_bonus)
-        
-        # 脸红 = 表情值 + 偏移 + 表情循环
-        expr_cheek = self.current_expression_values.get(Params.CHEEK, 0.0)
-        cheek_loop = self._get_expression_loop_cheek(t)
-        cheek_final = expr_cheek + self.cheek_offset + cheek_loop
-        self._set_param("ParamCheek", max(0, cheek_final))
+        if self._has_face:
+            # 一次性读取表情值与说话状态，所有偏移在同一段直线代码中计算
+            if self.enable_speaking_enhancement and self.is_speaking:
+                mo_spk = self.current_mouth_open
+            else:
+                mo_spk = 0.0
+            
+            # 眼睛 = 眨眼值 + 表情值 + 偏移 + 说话增强
+            eye_open = self.blink_value + expr[_SLOT_EYE_OPEN] + self.eye_open_offset + mo_spk * self.speaking_eye_open_mult
+            eye_open = max(0, min(1.5, eye_open))
+            # 笑眼 = 表情值 + 偏移 + 表情循环
+            eye_smile = max(0, min(1.0, expr[_SLOT_EYE_SMILE] + self.eye_smile_offset + self._loop_smile))
+            # 眉毛 = 表情值 + 偏移 + 说话增强
+            brow_common = self.brow_y_offset + mo_spk * self.speaking_brow_mult
+            # 脸红 = 表情值 + 偏移 + 表情循环
+            cheek = max(0, expr[_SLOT_CHEEK] + self.cheek_offset + self._loop_cheek)
+            
+            for idx, value in (
+                (self._idx_eye_l_open, eye_open),
+                (self._idx_eye_r_open, eye_open),
+                (self._idx_eye_l_smile, eye_smile),
+                (self._idx_eye_r_smile, eye_smile),
+                (self._idx_brow_l_y, expr[_SLOT_BROW_L_Y] + brow_common),
+                (self._idx_brow_r_y, expr[_SLOT_BROW_R_Y] + brow_common),
+                (self._idx_cheek, cheek),
+            ):
+                if idx is not None:
+                    _sp(idx, value, 1.0)
         
         # === 9. 表情内循环动画 ===
+        # 表情参数每帧都会覆盖 EyeBall/AngleZ，所以缓存值仍需每帧写入
         if self.enable_expression_loops:
-            self._apply_expression_loops(t)
+            if refresh_loops:
+                self._loop_params = self._loop_fn(self)
+            for param_name, value in self._loop_params:
+                self._set_param(param_name, value)
         
         # === 10. 说话时偶尔眨眼 ===
         if self.enable_speaking_enhancement and self.is_speaking:
-            if not self.is_blinking and random.random() < self.speaking_blink_chance:
+            if not self.is_blinking and self._rand() < self.speaking_blink_chance:
                 if current_time - self.last_speaking_blink_time > 1.0:  # 至少间隔1秒
                     self.is_blinking = True
                     self.blink_phase = 1
@@ -350,54 +549,55 @@ class Live2DController(QOpenGLWidget):
         
         self.update()
     
+    def _rand(self) -> float:
+        """从随机数池取一个 [0, 1) 浮点数，用完后整体重新生成"""
+        idx = self._rand_idx
+        if idx >= self._rand_pool_size:
+            self._rand_pool = np.random.random(self._rand_pool_size).tolist()
+            idx = 0
+        self._rand_idx = idx + 1
+        return self._rand_pool[idx]
+    
+    def _rand_uniform(self, a: float, b: float) -> float:
+        """等价于 random.uniform(a, b)"""
+        return a + (b - a) * self._rand()
+    
+    def _restart_timer(self, interval_ms: int):
+        """以新的间隔重启动画定时器 (initializeGL 之前不启动)"""
+        if self._timer.isActive():
+            self._timer.start(interval_ms)
+    
+    def hideEvent(self, event):
+        """隐藏时降低定时器频率"""
+        self._restart_timer(self.hidden_interval_ms)
+        super().hideEvent(event)
+    
+    def showEvent(self, event):
+        """显示时恢复正常帧率"""
+        self._restart_timer(int(1000 / self.fps))
+        self.last_time = _now()
+        super().showEvent(event)
+    
     def _set_param(self, name: str, value: float):
         """设置参数值"""
         if name in self.param_indices:
             self.model.SetParameterValue(self.param_indices[name], value, 1.0)
     
-    def _get_expression_loop_smile(self, t: float) -> float:
-        """获取笑眼循环动画叠加值 (happy/excited/smug)"""
-        if not self.enable_expression_loops:
-            return 0.0
-        
-        if self.current_expression in ("happy", "excited", "smug", "mischievous"):
-            # 轻微的笑眼波动
-            return math.sin(t * self.happy_smile_speed * math.pi) * self.happy_smile_amp
-        return 0.0
-    
-    def _get_expression_loop_cheek(self, t: float) -> float:
-        """获取脸红循环动画叠加值 (shy/embarrassed)"""
-        if not self.enable_expression_loops:
-            return 0.0
-        
-        if self.current_expression in ("shy", "embarrassed"):
-            # 脸红轻微闪烁
-            return (math.sin(t * self.shy_cheek_speed * math.pi) + 1) * 0.5 * self.shy_cheek_amp
-        return 0.0
-    
-    def _apply_expression_loops(self, t: float):
-        """应用表情内循环动画"""
-        # thinking: 眼球缓慢左右/上下移动（模拟思考）
-        if self.current_expression == "thinking":
-            eye_x = math.sin(t * self.thinking_eye_speed * math.pi) * self.thinking_eye_amp_x
-            eye_y = math.sin(t * self.thinking_eye_speed * 0.7 * math.pi) * self.thinking_eye_amp_y
-            self._set_param("ParamEyeBallX", eye_x)
-            self._set_param("ParamEyeBallY", eye_y)
-        
-        # shy: 眼球周期性躲避
-        elif self.current_expression in ("shy", "embarrassed"):
-            # 眼球周期性向一侧移动
-            phase = (math.sin(t * self.shy_eye_speed * math.pi) + 1) * 0.5
-            eye_x = self.shy_eye_amp * phase
-            self._set_param("ParamEyeBallX", eye_x)
-        
-        # curious: 头微微倾斜循环（叠加到已有的头部摆动）
-        elif self.current_expression == "curious":
-            # 好奇地歪头周期循环
-            head_tilt = math.sin(t * self.curious_head_speed * math.pi) * self.curious_head_amp
-            # 注意：这会叠加到 head_sway，所以效果更明显
-            current_z = math.sin(t * self.head_sway_speed * math.pi) * self.head_sway_amp if self.head_sway_amp > 0 else 0
-            self._set_param("ParamAngleZ", current_z + head_tilt * 0.5)
+    def _update_omegas(self):
+        """速度变化时预先换算角速度 (rad/s)，避免每帧乘 π"""
+        self._tail_omega = self.tail_speed * math.pi
+        self._body_omega = self.body_breath_speed * math.pi * 2
+        self._sway_omega = self.head_sway_speed * math.pi
+    
+    def _advance_loop_phases(self, dt: float):
+        """推进表情循环动画的相位"""
+        dt_pi = dt * math.pi
+        self._ph_smile = (self._ph_smile + self.happy_smile_speed * dt_pi) % _TAU
+        self._ph_cheek = (self._ph_cheek + self.shy_cheek_speed * dt_pi) % _TAU
+        self._ph_think_x = (self._ph_think_x + self.thinking_eye_speed * dt_pi) % _TAU
+        self._ph_think_y = (self._ph_think_y + self.thinking_eye_speed * 0.7 * dt_pi) % _TAU
+        self._ph_shy_eye = (self._ph_shy_eye + self.shy_eye_speed * dt_pi) % _TAU
+        self._ph_curious = (self._ph_curious + self.curious_head_speed * dt_pi) % _TAU
     
     def _update_blink(self, current_time: float, delta_time: float):
         """更新眨眼（只更新 blink_value，不直接设置参数）"""
@@ -416,7 +616,7 @@ class Live2DController(QOpenGLWidget):
                 if self.blink_value >= 1.0:
                     self.blink_value = 1.0
                     self.is_blinking = False
-                    self.next_blink_time = current_time + random.uniform(
+                    self.next_blink_time = current_time + self._rand_uniform(
                         self.blink_interval_min,
                         self.blink_interval_max
                     )
@@ -454,58 +654,53 @@ class Live2DController(QOpenGLWidget):
             return
         
         self.current_expression = emotion
+        self._loop_fn = _LOOP_FNS.get(emotion, _no_loop)
+        self._smile_loop_fn = _SMILE_LOOP_FNS.get(emotion, _no_offset)
+        self._cheek_loop_fn = _CHEEK_LOOP_FNS.get(emotion, _no_offset)
+        # 下一帧立即刷新循环动画缓存
+        self._frame_counter = self.expression_loop_interval - 1
         
         # 更新表情目标值
-        if emotion in EXPRESSIONS:
-            self.target_expression_values = EXPRESSIONS[emotion].copy()
-        else:
-            self.target_expression_values = {}
+        # EXPRESSION_ARRAYS 的向量是只读的，直接引用即可，无需复制
+        self._expr_target = EXPRESSION_ARRAYS.get(emotion, _NO_EXPRESSION)
         
-        # 获取并应用情绪调制器
-        modifier = get_emotion_modifier(emotion)
+        # 获取并应用情绪调制向量 (tolist 转回 Python float，避免热路径上的 numpy 标量运算)
+        (
+            breath_speed_mult, breath_amp_mult, tail_speed_mult, tail_amp_mult,
+            blink_interval_mult, head_sway_amp, head_sway_speed,
+            eye_open_offset, eye_smile_offset, brow_y_offset, cheek_offset, mouth_form_offset,
+        ) = get_emotion_vec(emotion).tolist()
         
         # 更新 Idle 参数
-        self.body_breath_speed = self._base_breath_speed * modifier.breath_speed_mult
-        self.body_breath_amplitude = self._base_breath_amp * modifier.breath_amp_mult
-        self.tail_speed = self._base_tail_speed * modifier.tail_speed_mult
-        self.tail_amplitude = self._base_tail_amp * modifier.tail_amp_mult
-        self.blink_interval_min = self._base_blink_min * modifier.blink_interval_mult
-        self.blink_interval_max = self._base_blink_max * modifier.blink_interval_mult
+        self.body_breath_speed = self._base_breath_speed * breath_speed_mult
+        self.body_breath_amplitude = self._base_breath_amp * breath_amp_mult
+        self.tail_speed = self._base_tail_speed * tail_speed_mult
+        self.tail_amplitude = self._base_tail_amp * tail_amp_mult
+        self.blink_interval_min = self._base_blink_min * blink_interval_mult
+        self.blink_interval_max = self._base_blink_max * blink_interval_mult
         
         # 更新头部摆动
-        self.head_sway_amp = modifier.head_sway_amp
-        self.head_sway_speed = modifier.head_sway_speed
+        self.head_sway_amp = head_sway_amp
+        self.head_sway_speed = head_sway_speed
+        self._update_omegas()
         
         # 更新表情参数偏移
-        self.eye_open_offset = modifier.eye_open_offset
-        self.eye_smile_offset = modifier.eye_smile_offset
-        self.brow_y_offset = modifier.brow_y_offset
-        self.cheek_offset = modifier.cheek_offset
-        self.mouth_form_offset = modifier.mouth_form_offset
+        self.eye_open_offset = eye_open_offset
+        self.eye_smile_offset = eye_smile_offset
+        self.brow_y_offset = brow_y_offset
+        self.cheek_offset = cheek_offset
+        self.mouth_form_offset = mouth_form_offset
         
         print(f"Expression: {emotion} (breath={self.body_breath_speed:.2f}, tail={self.tail_speed:.2f}, sway={self.head_sway_amp:.1f})")
     
     def _update_expression(self):
-        """平滑更新表情参数 (lerp)"""
-        # 获取所有需要处理的参数
-        all_params = set(self.current_expression_values.keys()) | set(self.target_expression_values.keys())
+        """平滑更新表情参数 (lerp，所有槽位一次完成)"""
+        current = self._expr_current
+        target = self._expr_target
+        current += (target - current) * self.expression_lerp_speed
         
-        for param_name in all_params:
-            current = self.current_expression_values.get(param_name, 0.0)
-            target = self.target_expression_values.get(param_name, 0.0)
-            
-            # Lerp 插值
-            new_value = current + (target - current) * self.expression_lerp_speed
-            
-            # 接近目标时直接到位（避免无限逼近）
-            if abs(new_value - target) < 0.01:
-                new_value = target
-            
-            # 更新当前值（如果为0且目标也为0，从字典中移除以节省内存）
-            if new_value == 0.0 and target == 0.0:
-                self.current_expression_values.pop(param_name, None)
-            else:
-                self.current_expression_values[param_name] = new_value
+        # 接近目标时直接到位（避免无限逼近）
+        np.copyto(current, target, where=np.abs(current - target) < 0.01)
     
     def set_random_expression(self):
         """设置随机表情"""
@@ -10,13 +10,13 @@
 - 表情参数偏移（笑眼、眉毛、脸红等）
 """
 
-from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, NamedTuple, Optional
 
+import numpy as np
 
-@dataclass
-class EmotionModifier:
-    """情绪调制参数"""
+
+class EmotionModifier(NamedTuple):
+    """情绪调制参数 (不可变，字段读取走 C 层元组下标)"""
     # Idle 动画倍率
     breath_speed_mult: float = 1.0
     breath_amp_mult: float = 1.0
@@ -36,200 +36,61 @@ class EmotionModifier:
     mouth_form_offset: float = 0.0   # 嘴巴形状
 
 
-# 情绪调制器定义
+# 情绪调制表: 每行 (情绪名, 12 个参数)，列顺序与 EmotionModifier 字段一致
+#                    呼吸速  呼吸幅  尾巴速  尾巴幅  眨眼    摆幅    摆速    眼睛    笑眼    眉毛    脸红    嘴形
+_EMOTION_ROWS = (
+    ("neutral",       1.0,   1.0,   1.0,   1.0,   1.0,   0.0,   0.3,   0.0,   0.0,   0.0,   0.0,   0.0),
+    ("happy",         1.2,   1.1,   1.5,   1.3,   0.8,   3.0,   0.5,   0.0,  0.15,   0.1,   0.1,   0.2),
+    ("excited",       1.5,   1.3,   2.0,   1.5,   0.6,   5.0,   0.8,   0.2,   0.1,   0.2,  0.15,   0.3),
+    ("angry",         1.4,   1.2,   1.3,   0.8,   1.5,   1.0,   0.2,   0.2,  -0.1,  -0.3,   0.0,  -0.2),
+    ("sad",           0.7,   0.8,   0.5,   0.5,   1.3,   0.5,  0.15, -0.15,   0.0,   0.2,   0.0, -0.15),
+    ("thinking",      0.9,   0.9,   0.6,   0.7,   1.2,   2.0,   0.2,   0.0,   0.0,  0.15,   0.0,   0.0),
+    ("shy",           1.1,   1.2,   0.8,   0.6,   0.7,   2.0,   0.4,  -0.1,   0.2,   0.0,   0.3,   0.1),
+    ("sleepy",        0.5,   1.4,   0.3,   0.3,   0.5,   1.5,   0.1,  -0.5,   0.0,  -0.1,   0.0,   0.0),
+    ("surprised",     1.8,   0.7,   2.0,   1.8,   2.0,   0.0,   0.3,   0.4,   0.0,   0.3,   0.0,   0.0),
+    ("curious",       1.1,   1.0,   1.2,   1.2,   0.9,   4.0,   0.3,  0.15,   0.0,   0.2,   0.0,   0.0),
+    ("pout",          0.9,   1.1,   0.4,   0.5,   1.0,   1.0,   0.2,  -0.1,   0.0, -0.15,   0.2,  -0.3),
+    ("smug",         0.85,   1.0,   0.9,   1.0,   1.2,   3.0,  0.25,   0.0,  0.25,   0.1,   0.1,  0.25),
+    ("confused",      0.9,   1.0,   0.7,   0.8,   1.1,   2.5,  0.25,   0.0,   0.0,   0.1,   0.0,   0.0),
+    ("worried",       1.1,   1.1,   0.6,   0.6,   0.8,   1.5,   0.2,   0.1,   0.0,  0.25,   0.0,   0.0),
+    ("embarrassed",   1.2,   1.2,   0.5,   0.5,   0.6,   2.0,   0.3,  -0.2,   0.0,   0.0,   0.4,   0.0),
+    ("mischievous",   1.1,   1.0,   1.3,   1.2,   0.9,   3.0,   0.4,   0.0,   0.2,   0.1,   0.0,   0.2),
+)
+
+# 情绪调制器定义 (由调制表生成)
 EMOTION_MODIFIERS: Dict[str, EmotionModifier] = {
-    "neutral": EmotionModifier(),
-    
-    "happy": EmotionModifier(
-        breath_speed_mult=1.2,
-        breath_amp_mult=1.1,
-        tail_speed_mult=1.5,
-        tail_amp_mult=1.3,
-        blink_interval_mult=0.8,
-        head_sway_amp=3.0,
-        head_sway_speed=0.5,
-        eye_smile_offset=0.15,
-        brow_y_offset=0.1,
-        cheek_offset=0.1,
-        mouth_form_offset=0.2,
-    ),
-    
-    "excited": EmotionModifier(
-        breath_speed_mult=1.5,
-        breath_amp_mult=1.3,
-        tail_speed_mult=2.0,
-        tail_amp_mult=1.5,
-        blink_interval_mult=0.6,
-        head_sway_amp=5.0,
-        head_sway_speed=0.8,
-        eye_open_offset=0.2,
-        eye_smile_offset=0.1,
-        brow_y_offset=0.2,
-        cheek_offset=0.15,
-        mouth_form_offset=0.3,
-    ),
-    
-    "angry": EmotionModifier(
-        breath_speed_mult=1.4,
-        breath_amp_mult=1.2,
-        tail_speed_mult=1.3,
-        tail_amp_mult=0.8,
-        blink_interval_mult=1.5,
-        head_sway_amp=1.0,
-        head_sway_speed=0.2,
-        eye_open_offset=0.2,
-        eye_smile_offset=-0.1,
-        brow_y_offset=-0.3,
-        mouth_form_offset=-0.2,
-    ),
-    
-    "sad": EmotionModifier(
-        breath_speed_mult=0.7,
-        breath_amp_mult=0.8,
-        tail_speed_mult=0.5,
-        tail_amp_mult=0.5,
-        blink_interval_mult=1.3,
-        head_sway_amp=0.5,
-        head_sway_speed=0.15,
-        eye_open_offset=-0.15,
-        brow_y_offset=0.2,
-        mouth_form_offset=-0.15,
-    ),
-    
-    "thinking": EmotionModifier(
-        breath_speed_mult=0.9,
-        breath_amp_mult=0.9,
-        tail_speed_mult=0.6,
-        tail_amp_mult=0.7,
-        blink_interval_mult=1.2,
-        head_sway_amp=2.0,
-        head_sway_speed=0.2,
-        brow_y_offset=0.15,
-    ),
-    
-    "shy": EmotionModifier(
-        breath_speed_mult=1.1,
-        breath_amp_mult=1.2,
-        tail_speed_mult=0.8,
-        tail_amp_mult=0.6,
-        blink_interval_mult=0.7,
-        head_sway_amp=2.0,
-        head_sway_speed=0.4,
-        eye_open_offset=-0.1,
-        eye_smile_offset=0.2,
-        cheek_offset=0.3,
-        mouth_form_offset=0.1,
-    ),
-    
-    "sleepy": EmotionModifier(
-        breath_speed_mult=0.5,
-        breath_amp_mult=1.4,
-        tail_speed_mult=0.3,
-        tail_amp_mult=0.3,
-        blink_interval_mult=0.5,
-        head_sway_amp=1.5,
-        head_sway_speed=0.1,
-        eye_open_offset=-0.5,
-        brow_y_offset=-0.1,
-    ),
-    
-    "surprised": EmotionModifier(
-        breath_speed_mult=1.8,
-        breath_amp_mult=0.7,
-        tail_speed_mult=2.0,
-        tail_amp_mult=1.8,
-        blink_interval_mult=2.0,
-        eye_open_offset=0.4,
-        brow_y_offset=0.3,
-    ),
-    
-    "curious": EmotionModifier(
-        breath_speed_mult=1.1,
-        tail_speed_mult=1.2,
-        tail_amp_mult=1.2,
-        blink_interval_mult=0.9,
-        head_sway_amp=4.0,
-        head_sway_speed=0.3,
-        eye_open_offset=0.15,
-        brow_y_offset=0.2,
-    ),
-    
-    "pout": EmotionModifier(
-        breath_speed_mult=0.9,
-        breath_amp_mult=1.1,
-        tail_speed_mult=0.4,
-        tail_amp_mult=0.5,
-        head_sway_amp=1.0,
-        head_sway_speed=0.2,
-        eye_open_offset=-0.1,
-        brow_y_offset=-0.15,
-        cheek_offset=0.2,
-        mouth_form_offset=-0.3,
-    ),
-    
-    "smug": EmotionModifier(
-        breath_speed_mult=0.85,
-        tail_speed_mult=0.9,
-        blink_interval_mult=1.2,
-        head_sway_amp=3.0,
-        head_sway_speed=0.25,
-        eye_smile_offset=0.25,
-        brow_y_offset=0.1,
-        cheek_offset=0.1,
-        mouth_form_offset=0.25,
-    ),
-    
-    "confused": EmotionModifier(
-        breath_speed_mult=0.9,
-        tail_speed_mult=0.7,
-        tail_amp_mult=0.8,
-        blink_interval_mult=1.1,
-        head_sway_amp=2.5,
-        head_sway_speed=0.25,
-        brow_y_offset=0.1,
-    ),
-    
-    "worried": EmotionModifier(
-        breath_speed_mult=1.1,
-        breath_amp_mult=1.1,
-        tail_speed_mult=0.6,
-        tail_amp_mult=0.6,
-        blink_interval_mult=0.8,
-        head_sway_amp=1.5,
-        head_sway_speed=0.2,
-        eye_open_offset=0.1,
-        brow_y_offset=0.25,
-    ),
-    
-    "embarrassed": EmotionModifier(
-        breath_speed_mult=1.2,
-        breath_amp_mult=1.2,
-        tail_speed_mult=0.5,
-        tail_amp_mult=0.5,
-        blink_interval_mult=0.6,
-        head_sway_amp=2.0,
-        head_sway_speed=0.3,
-        eye_open_offset=-0.2,
-        cheek_offset=0.4,
-    ),
-    
-    "mischievous": EmotionModifier(
-        breath_speed_mult=1.1,
-        tail_speed_mult=1.3,
-        tail_amp_mult=1.2,
-        blink_interval_mult=0.9,
-        head_sway_amp=3.0,
-        head_sway_speed=0.4,
-        eye_smile_offset=0.2,
-        brow_y_offset=0.1,
-        mouth_form_offset=0.2,
-    ),
+    name: EmotionModifier(*values) for name, *values in _EMOTION_ROWS
 }
 
 # 默认调制器
 DEFAULT_MODIFIER = EmotionModifier()
 
 
-def get_emotion_modifier(emotion: str) -> EmotionModifier:
-    """获取情绪调制器"""
-    return EMOTION_MODIFIERS.get(emotion, DEFAULT_MODIFIER)
+def get_emotion_modifier(emotion: str, _get=EMOTION_MODIFIERS.get,
+                         _default=DEFAULT_MODIFIER) -> EmotionModifier:
+    """获取情绪调制器 (_get / _default 在定义时绑定，省去全局查找)"""
+    return _get(emotion, _default)
+
+
+# ==================== 扁平化调制表 ====================
+# 每种情绪一行，列顺序与 EmotionModifier 字段一致，最后一行为默认调制器
+
+MODIFIER_FIELDS = EmotionModifier._fields
+(
+    BREATH_SPEED, BREATH_AMP, TAIL_SPEED, TAIL_AMP, BLINK_INTERVAL,
+    HEAD_SWAY_AMP, HEAD_SWAY_SPEED,
+    EYE_OPEN, EYE_SMILE, BROW_Y, CHEEK, MOUTH_FORM,
+) = range(len(MODIFIER_FIELDS))
+
+_EMOTION_INDEX: Dict[str, int] = {name: i for i, name in enumerate(EMOTION_MODIFIERS)}
+_DEFAULT_ROW = len(EMOTION_MODIFIERS)
+_EMOTION_TABLE = np.array(
+    [values for _, *values in _EMOTION_ROWS] + [DEFAULT_MODIFIER],
+    dtype=np.float64,
+)
+_EMOTION_TABLE.flags.writeable = False
+
+
+def get_emotion_vec(emotion: str) -> np.ndarray:
+    """获取情绪调制向量 (只读行视图，按 BREATH_SPEED 等列常量索引)"""
+    return _EMOTION_TABLE[_EMOTION_INDEX.get(emotion, _DEFAULT_ROW)]
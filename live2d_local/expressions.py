@@ -4,6 +4,10 @@ Live2D 表情和参数定义
 参数值已放大以获得更明显的表情效果
 """
 
+from types import MappingProxyType
+
+import numpy as np
+
 # 参数名常量
 class Params:
     # 眼睛
@@ -187,3 +191,25 @@ EXPRESSIONS = {
         Params.ANGLE_Z: -8.0,
     },
 }
+
+# 表情定义只读，控制器切换表情时直接引用而不复制
+EXPRESSIONS = {name: MappingProxyType(values) for name, values in EXPRESSIONS.items()}
+
+
+# ==================== 数组形式 (控制器热路径使用) ====================
+# 所有参数按固定槽位排列，每个表情编译为一条只读的稠密目标值向量
+
+EXPRESSION_PARAMS = tuple(v for k, v in vars(Params).items() if not k.startswith("_"))
+EXPRESSION_SLOTS = {name: i for i, name in enumerate(EXPRESSION_PARAMS)}
+
+
+def _compile_expression(values) -> np.ndarray:
+    """把 {参数名: 值} 编译为按 EXPRESSION_PARAMS 排列的向量"""
+    arr = np.zeros(len(EXPRESSION_PARAMS))
+    for name, value in values.items():
+        arr[EXPRESSION_SLOTS[name]] = value
+    arr.flags.writeable = False
+    return arr
+
+
+EXPRESSION_ARRAYS = {name: _compile_expression(values) for name, values in EXPRESSIONS.items()}
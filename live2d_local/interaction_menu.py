@@ -13,7 +13,7 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, 
     QLineEdit, QPushButton, QLabel, QGraphicsOpacityEffect
 )
-from PyQt5.QtGui import QFont, QPainter, QColor, QBrush, QPen, QPainterPath
+from PyQt5.QtGui import QFont, QPainter, QColor, QBrush, QPen, QPainterPath, QPixmap
 
 
 class InteractionMenu(QWidget):
@@ -27,6 +27,9 @@ class InteractionMenu(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         
+        # 背景缓存 (尺寸变化时重建，paintEvent 只做一次贴图)
+        self._bg_pixmap = None
+        
         self._setup_window()
         self._setup_ui()
         self._setup_animations()
@@ -139,10 +142,18 @@ class InteractionMenu(QWidget):
         self.fade_anim = QPropertyAnimation(self.opacity_effect, b"opacity")
         self.fade_anim.setDuration(150)
         self.fade_anim.setEasingCurve(QEasingCurve.Type.OutCubic)
+        # finished 只连接一次，用标志位区分淡入/淡出
+        self._fading_out = False
+        self.fade_anim.finished.connect(self._on_fade_anim_finished)
         
-    def paintEvent(self, event):
-        """绘制毛玻璃背景"""
-        painter = QPainter(self)
+    def _build_background(self):
+        """把毛玻璃背景渲染到 QPixmap 缓存 (按设备像素分配，高 DPI 屏不糊)"""
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * dpr)
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         # 毛玻璃效果背景
@@ -155,6 +166,25 @@ class InteractionMenu(QWidget):
         # 边框
         painter.setPen(QPen(QColor(255, 255, 255, 50), 1))
         painter.drawPath(path)
+        painter.end()
+        
+        self._bg_pixmap = pixmap
+        
+    def resizeEvent(self, event):
+        """尺寸变化时作废背景缓存"""
+        self._bg_pixmap = None
+        super().resizeEvent(event)
+        
+    def paintEvent(self, event):
+        """绘制毛玻璃背景 (贴缓存的 QPixmap)"""
+        # 换到不同缩放的屏幕时 DPR 会变，同样需要重建
+        if (
+            self._bg_pixmap is None
+            or self._bg_pixmap.devicePixelRatioF() != self.devicePixelRatioF()
+            or self._bg_pixmap.size() != self.size() * self.devicePixelRatioF()
+        ):
+            self._build_background()
+        QPainter(self).drawPixmap(0, 0, self._bg_pixmap)
         
     def show_at(self, pos: QPoint):
         """在指定位置显示菜单"""
@@ -179,6 +209,8 @@ class InteractionMenu(QWidget):
             self.move(pos)
         
         # 显示并播放动画
+        self._fading_out = False
+        self.fade_anim.stop()
         self.show()
         self.fade_anim.setStartValue(0)
         self.fade_anim.setEndValue(1)
@@ -191,12 +223,14 @@ class InteractionMenu(QWidget):
         """隐藏菜单（带动画）"""
         self.fade_anim.setStartValue(1)
         self.fade_anim.setEndValue(0)
-        self.fade_anim.finished.connect(self._on_fade_out_finished)
+        self._fading_out = True
         self.fade_anim.start()
         
-    def _on_fade_out_finished(self):
-        """淡出动画完成"""
-        self.fade_anim.finished.disconnect(self._on_fade_out_finished)
+    def _on_fade_anim_finished(self):
+        """动画完成（仅淡出时收尾）"""
+        if not self._fading_out:
+            return
+        self._fading_out = False
         self.hide()
         self.menu_closed.emit()
         
@@ -14,6 +14,9 @@ TOUCH_ZONES = {
     "body": (0.4, 1.0),    # 身体: 40-100%
 }
 
+# 只有头部/身体两个区域，直接用头部边界判断 (其余都算身体)
+_HEAD_START, _HEAD_END = TOUCH_ZONES["head"]
+
 
 # ====================
 # 触摸 Prompt 模板
@@ -22,6 +25,7 @@ TOUCH_PROMPTS = {
     "head": "（主人正在摸你的脑袋）",
     "body": "（主人轻轻抚摸了你的身体）",
 }
+_PROMPT_BODY = TOUCH_PROMPTS["body"]
 
 
 # ====================
@@ -43,21 +47,19 @@ def get_touch_zone(y_ratio: float) -> str:
     Returns:
         触摸区域名称: "head" 或 "body"
     """
-    for zone_name, (start, end) in TOUCH_ZONES.items():
-        if start <= y_ratio < end:
-            return zone_name
-    return "body"  # 默认返回身体
+    return "head" if _HEAD_START <= y_ratio < _HEAD_END else "body"
 
 
-def get_touch_prompt(zone: str) -> str:
+def get_touch_prompt(zone: str, _get=TOUCH_PROMPTS.get, _default=_PROMPT_BODY) -> str:
     """
     获取触摸区域对应的 prompt
     
     Args:
         zone: 区域名称
+        (_get / _default 为定义时绑定的查表方法与默认值，调用方不要传)
     
     Returns:
         对应的 prompt 字符串
     """
-    return TOUCH_PROMPTS.get(zone, TOUCH_PROMPTS["body"])
+    return _get(zone, _default)
 
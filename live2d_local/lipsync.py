@@ -9,60 +9,124 @@ Lip Sync Module - 实时口型同步
 3. 输出口型参数用于驱动 Live2D 模型
 """
 
+import sys
 import numpy as np
-from typing import Tuple, Optional
-from dataclasses import dataclass
+from typing import NamedTuple, Tuple, Optional
 from loguru import logger
 
+# scipy.fft (pocketfft) 会缓存 FFT plan，缺失时回退到 numpy
+try:
+    from scipy.fft import rfft as _rfft
+except ImportError:
+    _rfft = np.fft.rfft
 
-@dataclass
-class VowelShape:
+
+class VowelShape(NamedTuple):
     """元音对应的口型参数"""
     mouth_open: float    # 嘴巴张开程度 (0-1)
     mouth_form: float    # 嘴巴形状 (-1=圆形, 0=中性, 1=横拉)
-    
-# 元音口型定义 (参考日语发音)
+
+
+class Vowel:
+    """元音整数编码 (热路径用整数代替字符串比较)"""
+    A, I, U, E, O, N, SILENCE = range(7)
+
+
+# 编码 → 元音名 (驻留字符串，下游比较可走指针比较)
+VOWEL_NAMES = tuple(sys.intern(name) for name in ("A", "I", "U", "E", "O", "N", "silence"))
+VOWEL_CODES = {name: code for code, name in enumerate(VOWEL_NAMES)}
+
+# 元音口型定义 (参考日语发音)，按 Vowel 编码排列的两列并行表
+#              あ大张嘴  い横拉微张  う圆形微张  え中等张开  お圆形大张  ん闭嘴鼻音  静音
+_VOWEL_OPEN = (1.0,      0.3,        0.4,        0.5,        0.7,        0.15,       0.0)
+_VOWEL_FORM = (0.0,      1.0,        -0.6,       0.3,        -0.8,       0.0,        0.0)
+
+# 按元音名查询口型 (兼容旧接口)
 VOWEL_SHAPES = {
-    "A": VowelShape(mouth_open=1.0, mouth_form=0.0),    # あ - 大张嘴
-    "I": VowelShape(mouth_open=0.3, mouth_form=1.0),    # い - 横拉微张
-    "U": VowelShape(mouth_open=0.4, mouth_form=-0.6),   # う - 圆形微张
-    "E": VowelShape(mouth_open=0.5, mouth_form=0.3),    # え - 中等张开
-    "O": VowelShape(mouth_open=0.7, mouth_form=-0.8),   # お - 圆形大张
-    "N": VowelShape(mouth_open=0.15, mouth_form=0.0),   # ん - 闭嘴鼻音
-    "silence": VowelShape(mouth_open=0.0, mouth_form=0.0),  # 静音
+    name: VowelShape(mouth_open, mouth_form)
+    for name, mouth_open, mouth_form in zip(VOWEL_NAMES, _VOWEL_OPEN, _VOWEL_FORM)
 }
 
+# 频谱元音规则表 (按优先级排列)，每行是 (低, 中, 高) 频能量比例的开区间上下界
+# 命中第一条全部满足的规则；都不命中时低能量判为 N，否则默认 A
+_INF = np.inf
+_VOWEL_RULE_CODES = (Vowel.I, Vowel.A, Vowel.O, Vowel.U, Vowel.E)
+_VOWEL_RULE_MIN = np.array([
+    [-_INF, -_INF, 0.4],     # I: 高频占主导
+    [0.5, 0.2, -_INF],       # A: 低频强，中高频也有
+    [0.6, -_INF, -_INF],     # O: 低频占主导，高频弱
+    [0.3, 0.4, -_INF],       # U: 中频占主导，低频也有
+    [-_INF, 0.35, 0.2],      # E: 中高频，低频适中
+])
+_VOWEL_RULE_MAX = np.array([
+    [_INF, _INF, _INF],
+    [_INF, _INF, _INF],
+    [_INF, _INF, 0.15],
+    [_INF, _INF, 0.2],
+    [_INF, _INF, _INF],
+])
+
 
 class LipSyncAnalyzer:
     """
     实时口型分析器
-    基于音频频谱分析推断元音
+    基于音频频谱分析推断元音 (可选时域模式: 过零率 + 自相关，不做 FFT)
     """
     
-    def __init__(self, sample_rate: int = 44100, smoothing: float = 0.3):
+    def __init__(self, sample_rate: int = 44100, smoothing: float = 0.3, method: str = "fft"):
         """
         Args:
             sample_rate: 采样率
             smoothing: 平滑系数 (0-1, 越大变化越平滑)
+            method: 元音检测方式 ("fft" 频谱能量比 / "time" 时域过零率，便于 A/B 对比)
         """
         self.sample_rate = sample_rate
         self.smoothing = smoothing
+        self.method = method
         
         # 当前状态
-        self._current_vowel = "silence"
+        self._current_vowel = Vowel.SILENCE
         self._current_mouth_open = 0.0
         self._current_mouth_form = 0.0
         self._energy_history = []
         
+        # 按块长度缓存的频段 bin 切片 {N: (低, 中, 高) slice}
+        self._band_cache: dict = {}
+        # 按 bin 数复用的功率谱缓冲 {bins: (power, scratch)}，稳态下不再分配
+        self._power_buffers: dict = {}
+        
         # 频率范围定义 (Hz)
         self.LOW_FREQ_RANGE = (100, 500)     # 低频 (A, O 主要区域)
         self.MID_FREQ_RANGE = (500, 1500)    # 中频 (U, E 主要区域)
         self.HIGH_FREQ_RANGE = (1500, 4000)  # 高频 (I 主要区域)
         
+        # 流式输入 (feed): 约 50 ms 的 Hann 窗、50% 重叠，每 ~25 ms 做一次分析
+        self._hop = max(1, int(sample_rate * 0.025))
+        self._frame = np.zeros(2 * self._hop, dtype=np.float32)
+        self._hop_fill = 0
+        self._window = np.hanning(len(self._frame)).astype(np.float32)
+        self._windowed = np.empty(len(self._frame), dtype=np.float32)
+        
+        # 时域模式: 过零率换算出的主频阈值 (Hz)
+        self.ZC_FREQ_I = 1500    # 以上为 I
+        self.ZC_FREQ_E = 900     # 以上为 E
+        self.ZC_FREQ_A = 500     # 以上为 A，以下为 U/O/N
+        self.ROUND_AC1 = 0.95    # 一阶自相关高于此值 (波形很平滑) 判为 U
+        
         # 能量阈值
         self.SILENCE_THRESHOLD = 0.01
         self.VOWEL_THRESHOLD = 0.05
     
+    @property
+    def smoothing(self) -> float:
+        """平滑系数 (设置时同步更新 EMA 的 alpha = 1 - smoothing)"""
+        return self._smoothing
+    
+    @smoothing.setter
+    def smoothing(self, value: float):
+        self._smoothing = value
+        self._alpha = 1.0 - value
+    
     def analyze(self, audio_chunk: np.ndarray) -> Tuple[str, float, float]:
         """
         分析音频块，返回当前口型
@@ -76,109 +140,182 @@ class LipSyncAnalyzer:
             - mouth_open: 嘴巴张开程度 (0-1)
             - mouth_form: 嘴巴形状 (-1 到 1)
         """
+        code, mouth_open, mouth_form = self.analyze_int(audio_chunk)
+        return (VOWEL_NAMES[code], mouth_open, mouth_form)
+    
+    def feed(self, samples: np.ndarray) -> Optional[Tuple[int, float, float]]:
+        """
+        流式送入任意长度的音频，每凑满一个 hop 对 (加窗的) 滑动帧分析一次
+        
+        Returns:
+            本次送入触发了分析时返回最新的 (vowel_code, mouth_open, mouth_form)，否则 None
+        """
+        samples = samples.ravel()
+        frame, hop = self._frame, self._hop
+        result = None
+        pos, total = 0, len(samples)
+        while pos < total:
+            take = min(hop - self._hop_fill, total - pos)
+            # 滑动帧左移 take 个样本，新样本写到末尾
+            frame[:-take] = frame[take:]
+            frame[-take:] = samples[pos:pos + take]
+            pos += take
+            self._hop_fill += take
+            if self._hop_fill >= hop:
+                self._hop_fill = 0
+                result = self.analyze_int(frame, window=self._window)
+        return result
+    
+    def analyze_int(self, audio_chunk: np.ndarray,
+                    window: Optional[np.ndarray] = None) -> Tuple[int, float, float]:
+        """
+        同 analyze，但元音以 Vowel 整数编码返回 (供热路径消费者使用)
+        
+        Args:
+            audio_chunk: 音频数据
+            window: 频谱分析前乘上的窗函数 (长度与 audio_chunk 相同)；RMS 仍按原始信号计算
+        
+        Returns:
+            (vowel_code, mouth_open, mouth_form)
+        """
         if len(audio_chunk) == 0:
-            return self._apply_smoothing("silence", 0.0, 0.0)
+            return self._apply_smoothing(Vowel.SILENCE, 0.0, 0.0)
         
         # 确保是 1D 数组
         if audio_chunk.ndim > 1:
             audio_chunk = audio_chunk.flatten()
         
-        # 计算总能量 (RMS)
-        rms = np.sqrt(np.mean(audio_chunk ** 2))
+        # 峰值预检: RMS 不超过峰值，峰值低于静音阈值时必为静音，跳过 RMS 与 FFT
+        # (max / -min 两次归约，不生成 np.abs 临时数组)
+        peak = max(float(audio_chunk.max()), -float(audio_chunk.min()))
+        if peak < self.SILENCE_THRESHOLD:
+            return self._apply_smoothing(Vowel.SILENCE, 0.0, 0.0)
+        
+        # 计算总能量 (RMS)，点积避免生成 audio_chunk ** 2 临时数组
+        rms = float(np.sqrt(np.dot(audio_chunk, audio_chunk) / len(audio_chunk)))
         
         # 静音检测
         if rms < self.SILENCE_THRESHOLD:
-            return self._apply_smoothing("silence", 0.0, 0.0)
-        
-        # FFT 频谱分析
-        fft = np.fft.rfft(audio_chunk)
-        magnitude = np.abs(fft)
-        freqs = np.fft.rfftfreq(len(audio_chunk), 1.0 / self.sample_rate)
-        
-        # 计算各频段能量
-        low_energy = self._get_band_energy(magnitude, freqs, *self.LOW_FREQ_RANGE)
-        mid_energy = self._get_band_energy(magnitude, freqs, *self.MID_FREQ_RANGE)
-        high_energy = self._get_band_energy(magnitude, freqs, *self.HIGH_FREQ_RANGE)
+            return self._apply_smoothing(Vowel.SILENCE, 0.0, 0.0)
         
-        total_energy = low_energy + mid_energy + high_energy + 1e-8
+        if self.method == "time":
+            vowel = self._classify_time_domain(audio_chunk, rms)
+        else:
+            if window is not None:
+                audio_chunk = np.multiply(audio_chunk, window, out=self._windowed)
+            vowel = self._classify_spectrum(audio_chunk, rms)
         
-        # 频率能量比例
-        low_ratio = low_energy / total_energy
-        mid_ratio = mid_energy / total_energy
-        high_ratio = high_energy / total_energy
-        
-        # 根据频谱特征推断元音
-        vowel = self._classify_vowel(low_ratio, mid_ratio, high_ratio, rms)
-        
-        # 获取口型参数
-        shape = VOWEL_SHAPES.get(vowel, VOWEL_SHAPES["silence"])
-        
-        # 根据能量调整张嘴幅度
+        # 获取口型参数，根据能量调整张嘴幅度
         intensity = min(rms / 0.15, 1.0)  # 归一化
-        mouth_open = shape.mouth_open * intensity
-        mouth_form = shape.mouth_form
+        mouth_open = _VOWEL_OPEN[vowel] * intensity
+        mouth_form = _VOWEL_FORM[vowel]
         
         return self._apply_smoothing(vowel, mouth_open, mouth_form)
     
-    def _get_band_energy(self, magnitude: np.ndarray, freqs: np.ndarray, 
-                         low: float, high: float) -> float:
-        """计算指定频段的能量"""
-        mask = (freqs >= low) & (freqs <= high)
-        if not np.any(mask):
-            return 0.0
-        return np.sum(magnitude[mask] ** 2)
-    
-    def _classify_vowel(self, low_ratio: float, mid_ratio: float, 
-                        high_ratio: float, rms: float) -> str:
-        """根据频谱比例分类元音"""
+    def _classify_spectrum(self, audio_chunk: np.ndarray, rms: float) -> int:
+        """FFT 频段能量比分类元音"""
+        if len(audio_chunk) < 2:
+            return Vowel.N if rms < self.VOWEL_THRESHOLD else Vowel.A
         
-        # I: 高频占主导
-        if high_ratio > 0.4:
-            return "I"
+        # 全采样率 FFT (阈值按全速率频谱标定)，功率只算到高频段上限 4 kHz 为止
+        low_band, mid_band, high_band = self._get_band_slices(len(audio_chunk))
+        fft = _rfft(audio_chunk)[:high_band.stop]
+        power, scratch = self._get_power_buffers(len(fft))
+        # |X|² = re² + im²，省去 np.abs 的开方再平方 (写入复用缓冲)
+        np.multiply(fft.real, fft.real, out=power)
+        np.multiply(fft.imag, fft.imag, out=scratch)
+        power += scratch
         
-        # A: 低频强，中高频也有
-        if low_ratio > 0.5 and mid_ratio > 0.2:
-            return "A"
+        # 计算各频段能量 (bin 均匀分布，频段即连续切片，直接求和)
+        energies = np.array((power[low_band].sum(), power[mid_band].sum(), power[high_band].sum()))
         
-        # O: 低频占主导，高频弱
-        if low_ratio > 0.6 and high_ratio < 0.15:
-            return "O"
+        # 频率能量比例 (低, 中, 高)
+        ratios = energies / (energies.sum() + 1e-8)
         
-        # U: 中频占主导，低频也有
-        if mid_ratio > 0.4 and low_ratio > 0.3 and high_ratio < 0.2:
-            return "U"
+        # 根据频谱特征推断元音
+        return self._classify_vowel(ratios, rms)
+    
+    def _classify_time_domain(self, audio_chunk: np.ndarray, rms: float) -> int:
+        """时域分类元音: 过零率近似主频，一阶自相关区分圆唇音 (O(N)，无 FFT)"""
+        n = len(audio_chunk)
+        if n < 2:
+            return Vowel.N
+        
+        crossings = np.count_nonzero(np.diff(np.signbit(audio_chunk)))
+        zc_freq = crossings * self.sample_rate / (2.0 * n)
         
-        # E: 中高频，低频适中
-        if mid_ratio > 0.35 and high_ratio > 0.2:
-            return "E"
+        if zc_freq >= self.ZC_FREQ_I:
+            return Vowel.I
+        if zc_freq >= self.ZC_FREQ_E:
+            return Vowel.E
+        if zc_freq >= self.ZC_FREQ_A:
+            return Vowel.A
+        
+        # 低主频: 鼻音 / 圆唇音
+        if rms < self.VOWEL_THRESHOLD:
+            return Vowel.N
+        ac1 = np.dot(audio_chunk[1:], audio_chunk[:-1]) / (np.dot(audio_chunk, audio_chunk) + 1e-12)
+        return Vowel.U if ac1 > self.ROUND_AC1 else Vowel.O
+    
+    def _get_power_buffers(self, bins: int) -> Tuple[np.ndarray, np.ndarray]:
+        """获取 bins 个频点的功率谱缓冲 (首次使用时分配)"""
+        buffers = self._power_buffers.get(bins)
+        if buffers is None:
+            buffers = (np.empty(bins, dtype=np.float64), np.empty(bins, dtype=np.float64))
+            self._power_buffers[bins] = buffers
+        return buffers
+    
+    def _get_band_slices(self, n: int) -> Tuple[slice, slice, slice]:
+        """获取块长度 n 对应的 (低, 中, 高) 频段 bin 切片 (闭区间 [low, high]，首次使用时计算并缓存)"""
+        slices = self._band_cache.get(n)
+        if slices is None:
+            freqs = np.fft.rfftfreq(n, 1.0 / self.sample_rate)
+            slices = tuple(
+                slice(int(np.searchsorted(freqs, low, "left")), int(np.searchsorted(freqs, high, "right")))
+                for low, high in (self.LOW_FREQ_RANGE, self.MID_FREQ_RANGE, self.HIGH_FREQ_RANGE)
+            )
+            self._band_cache[n] = slices
+        return slices
+    
+    def _classify_vowel(self, ratios: np.ndarray, rms: float) -> int:
+        """根据频谱比例 (低, 中, 高) 分类元音 (一次比较整张规则表)"""
+        hit = ((ratios > _VOWEL_RULE_MIN) & (ratios < _VOWEL_RULE_MAX)).all(axis=1)
+        if hit.any():
+            return _VOWEL_RULE_CODES[int(hit.argmax())]
         
         # 低能量时可能是鼻音或辅音
         if rms < self.VOWEL_THRESHOLD:
-            return "N"
+            return Vowel.N
         
         # 默认返回 A
-        return "A"
+        return Vowel.A
     
-    def _apply_smoothing(self, vowel: str, mouth_open: float, 
-                         mouth_form: float) -> Tuple[str, float, float]:
-        """应用平滑过渡"""
-        # 嘴巴张开度平滑
-        self._current_mouth_open += (mouth_open - self._current_mouth_open) * (1 - self.smoothing)
+    def _apply_smoothing(self, vowel: int, mouth_open: float, 
+                         mouth_form: float) -> Tuple[int, float, float]:
+        """应用平滑过渡 (两路标量 EMA，状态读入局部变量)"""
+        alpha = self._alpha
         
-        # 嘴巴形状平滑
-        self._current_mouth_form += (mouth_form - self._current_mouth_form) * (1 - self.smoothing)
+        # 嘴巴张开度 / 形状平滑
+        current_open = self._current_mouth_open
+        current_form = self._current_mouth_form
+        current_open += (mouth_open - current_open) * alpha
+        current_form += (mouth_form - current_form) * alpha
+        self._current_mouth_open = current_open
+        self._current_mouth_form = current_form
         
         # 元音优先使用检测到的
         self._current_vowel = vowel
         
-        return (self._current_vowel, self._current_mouth_open, self._current_mouth_form)
+        return (vowel, current_open, current_form)
     
     def reset(self):
         """重置状态"""
-        self._current_vowel = "silence"
+        self._current_vowel = Vowel.SILENCE
         self._current_mouth_open = 0.0
         self._current_mouth_form = 0.0
         self._energy_history.clear()
+        self._frame.fill(0.0)
+        self._hop_fill = 0
 
 
 class LipSyncController:
@@ -190,6 +327,10 @@ class LipSyncController:
         self.analyzer = LipSyncAnalyzer(sample_rate)
         self.controller = live2d_controller
         self.is_speaking = False
+        
+        # 上一次下发的口型 (vowel_code, mouth_open, mouth_form)，变化不足时跳过 set_vowel
+        self._last_out = (None, -1.0, -1.0)
+        self.OUTPUT_EPSILON = 0.01
     
     def set_controller(self, controller):
         """设置 Live2D 控制器"""
@@ -203,6 +344,7 @@ class LipSyncController:
         """停止说话"""
         self.is_speaking = False
         self.analyzer.reset()
+        self._last_out = (None, -1.0, -1.0)
         if self.controller:
             self.controller.set_mouth_open(0.0)
     
@@ -211,10 +353,19 @@ class LipSyncController:
         if not self.is_speaking:
             return
         
-        vowel, mouth_open, mouth_form = self.analyzer.analyze(audio_chunk)
+        code, mouth_open, mouth_form = self.analyzer.analyze_int(audio_chunk)
+        
+        # 与上次下发结果几乎相同 (同元音、开合/形状变化都在阈值内) 时跳过
+        last_code, last_open, last_form = self._last_out
+        eps = self.OUTPUT_EPSILON
+        if (code == last_code
+                and abs(mouth_open - last_open) <= eps
+                and abs(mouth_form - last_form) <= eps):
+            return
         
         if self.controller:
-            self.controller.set_vowel(vowel, mouth_open, mouth_form)
+            self.controller.set_vowel(VOWEL_NAMES[code], mouth_open, mouth_form)
+            self._last_out = (code, mouth_open, mouth_form)
 
 
 # 全局单例
@@ -3,6 +3,12 @@
 丰川祥子角色设定 Prompt
 """
 
+import random
+import time
+from bisect import bisect_right
+from datetime import datetime
+from typing import Dict
+
 # 可用的情绪标签 (用于 Live2D 表情驱动)
 EMOTION_TAGS = [
     "neutral", "happy", "sad", "angry", "thinking", "surprised",
@@ -181,50 +187,84 @@ def get_character_prompt_template() -> str:
 {{TOOLS_SECTION}}
 """
 
-def get_system_prompt() -> str:
-    """
-    获取完整的 system prompt（包含动态工具描述和随机状态）
+# 模块加载时预先渲染模板，只留下工具占位符
+_EMOTION_TAGS_STR = '/'.join(EMOTION_TAGS)
+_TEMPLATE_PRE_TOOLS = get_character_prompt_template().replace("{{EMOTION_TAGS}}", _EMOTION_TAGS_STR)
+
+# 基于时间的基础状态: _TIME_BUCKET_HOURS 为各时段起点 (0 点起的第一段省略)
+_TIME_BUCKET_HOURS = (6, 9, 12, 14, 18, 22)
+_TIME_MOODS = (
+    ("有点困呢～", "好困...要陪我吗？", "这么晚了呢..."),          # 0-6
+    ("早上好呀～", "刚睡醒呢", "今天也要加油哦！"),                # 6-9
+    ("心情不错呢", "想陪你聊天～", "今天天气怎么样呀？"),          # 9-12
+    ("有点饿了呢", "午饭吃了吗？", "下午也要加油呀～"),            # 12-14
+    ("想弹钢琴呢", "在想新曲子～", "主人在忙什么呀？"),            # 14-18
+    ("晚上了呢～", "今天辛苦了！", "想陪你聊聊天"),                # 18-22
+    ("要早点休息哦", "有点困了呢...", "晚安～要好好睡觉呀"),       # 22-24
+)
+
+# 随机心情
+_RANDOM_MOODS = (
+    "心情很好呢～", "想弹琴给你听", "想到了一段旋律呢", 
+    "有点想撒娇", "想陪你聊天", "感觉很开心",
+    "有点饿了呢", "想喝奶茶～", "在想曲子呢", "今天也很喜欢你呀"
+)
+
+# 每个时段的候选状态池 (时段状态 + 随机心情)，前一半填 None 表示不加状态，
+# 一次 random.choice 同时完成 "50% 概率" 和 "选哪条"
+_MOOD_POOLS = tuple(
+    (None,) * len(moods + _RANDOM_MOODS) + moods + _RANDOM_MOODS
+    for moods in _TIME_MOODS
+)
+
+# 按小时 (0-23) 直接查表: 时段编号 / 候选状态池
+_HOUR_BUCKETS = tuple(bisect_right(_TIME_BUCKET_HOURS, hour) for hour in range(24))
+_HOUR_MOODS = tuple(_MOOD_POOLS[bucket] for bucket in _HOUR_BUCKETS)
+
+# 工具描述缓存 (工具注册表很少变化，60 秒内复用)
+_TOOLS_CACHE_TTL = 60.0
+_TOOLS_CACHE = {"at": -_TOOLS_CACHE_TTL, "val": ""}
+
+
+def _get_tools_section() -> str:
+    """获取工具描述段落 (带短时缓存)"""
+    now = time.monotonic()
+    if now - _TOOLS_CACHE["at"] >= _TOOLS_CACHE_TTL:
+        from tools.registry import get_tool_registry
+        _TOOLS_CACHE["val"] = get_tool_registry().get_prompt_section()
+        _TOOLS_CACHE["at"] = now
+    return _TOOLS_CACHE["val"]
+
+
+def get_time_bucket(hour: int = None) -> int:
+    """当前时段编号（与随机状态的时段划分一致）"""
+    if hour is None:
+        hour = datetime.now().hour
+    return _HOUR_BUCKETS[hour]
+
+
+def get_system_prompt_parts() -> Dict[str, str]:
     """
-    import random
-    from datetime import datetime
-    from tools.registry import get_tool_registry
-    
-    tools_section = get_tool_registry().get_prompt_section()
-    template = get_character_prompt_template()
-    
-    # 替换占位符
-    prompt = template.replace("{{EMOTION_TAGS}}", '/'.join(EMOTION_TAGS))
-    prompt = prompt.replace("{{TOOLS_SECTION}}", tools_section)
-    
-    # 随机状态注入（增加回复多样性）
-    hour = datetime.now().hour
-    
-    # 基于时间的基础状态
-    if 0 <= hour < 6:
-        time_moods = ["有点困呢～", "好困...要陪我吗？", "这么晚了呢..."]
-    elif 6 <= hour < 9:
-        time_moods = ["早上好呀～", "刚睡醒呢", "今天也要加油哦！"]
-    elif 9 <= hour < 12:
-        time_moods = ["心情不错呢", "想陪你聊天～", "今天天气怎么样呀？"]
-    elif 12 <= hour < 14:
-        time_moods = ["有点饿了呢", "午饭吃了吗？", "下午也要加油呀～"]
-    elif 14 <= hour < 18:
-        time_moods = ["想弹钢琴呢", "在想新曲子～", "主人在忙什么呀？"]
-    elif 18 <= hour < 22:
-        time_moods = ["晚上了呢～", "今天辛苦了！", "想陪你聊聊天"]
-    else:
-        time_moods = ["要早点休息哦", "有点困了呢...", "晚安～要好好睡觉呀"]
+    获取拆分后的 system prompt
     
-    # 随机心情
-    random_moods = [
-        "心情很好呢～", "想弹琴给你听", "想到了一段旋律呢", 
-        "有点想撒娇", "想陪你聊天", "感觉很开心",
-        "有点饿了呢", "想喝奶茶～", "在想曲子呢", "今天也很喜欢你呀"
-    ]
+    Returns:
+        {"static": 角色模板 + 工具描述 (跨轮次不变，可命中 API 前缀缓存),
+         "dynamic": 随机状态行 (可能为空)}
+    """
+    prompt = _TEMPLATE_PRE_TOOLS.replace("{{TOOLS_SECTION}}", _get_tools_section())
     
-    # 50% 概率添加状态
-    if random.random() < 0.5:
-        mood = random.choice(time_moods + random_moods)
-        prompt += f"\n\n（当前状态：{mood}）"
+    # 随机状态注入（增加回复多样性），50% 概率添加
+    mood = random.choice(_HOUR_MOODS[datetime.now().hour])
+    dynamic = f"（当前状态：{mood}）" if mood else ""
     
-    return prompt
+    return {"static": prompt, "dynamic": dynamic}
+
+
+def get_system_prompt() -> str:
+    """
+    获取完整的 system prompt（包含动态工具描述和随机状态）
+    """
+    parts = get_system_prompt_parts()
+    if parts["dynamic"]:
+        return f"{parts['static']}\n\n{parts['dynamic']}"
+    return parts["static"]
@@ -5,17 +5,51 @@ OpenAI 格式 API 客户端，支持流式输出和音频输入
 """
 
 import httpx
+import asyncio
 import base64
-from typing import AsyncGenerator, Optional, Dict, Any, Union
+import weakref
+from typing import AsyncGenerator, Optional, Dict, Any, Union, List
 from loguru import logger
 import json
 import sys
 import os
 
+# orjson 解析/序列化更快且直接处理 bytes (orjson.JSONDecodeError 是 json.JSONDecodeError 的子类)，
+# 缺失时回退标准库 (json.loads 同样接受 bytes)
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+# HTTP/2 需要 h2 (pip install httpx[http2])，缺失时退回 HTTP/1.1 keep-alive
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
 
 
+# 超过该大小的音频放到线程池编码，避免阻塞事件循环
+_OFFLOAD_THRESHOLD = 100 * 1024
+
+
+async def encode_audio_base64(audio_data: bytes) -> str:
+    """Base64 编码音频 (大块数据在线程池中编码)"""
+    if len(audio_data) < _OFFLOAD_THRESHOLD:
+        return base64.b64encode(audio_data).decode("ascii")
+    loop = asyncio.get_running_loop()
+    encoded = await loop.run_in_executor(None, base64.b64encode, audio_data)
+    return encoded.decode("ascii")
+
+
 class LLMClient:
     """LLM API 客户端"""
     
@@ -35,6 +69,77 @@ class LLMClient:
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}"
         }
+        
+        # 复用的 AsyncClient (保持连接，省去每轮 TCP/TLS 握手)
+        # 连接池绑定事件循环，后台线程会各自新建循环，所以按循环分别持有
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+            weakref.WeakKeyDictionary()
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """获取当前事件循环对应的复用 AsyncClient (首次使用时创建)"""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=60),
+            )
+            self._clients[loop] = client
+        return client
+    
+    async def aclose(self):
+        """关闭当前事件循环上的复用连接 (程序退出、临时事件循环结束前调用)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+    
+    async def _iter_sse_content(self, response: httpx.Response) -> AsyncGenerator[str, None]:
+        """
+        解析 SSE 流式响应，产出 delta.content
+        
+        同一次网络读取里到达的多行 data 合并成一次 yield，
+        下游 (StreamParser / TTS) 不必每个 token 都重新调度一次；不引入额外等待
+        """
+        if response.status_code != 200:
+            error_text = await response.aread()
+            logger.error(f"LLM API 错误: {response.status_code} - {error_text}")
+            raise Exception(f"LLM API 错误: {response.status_code}")
+        
+        # 直接按字节切行，JSON 解析也吃 bytes，省去整段解码成 str
+        pending = b""
+        done = False
+        async for raw in response.aiter_bytes():
+            lines = (pending + raw).split(b"\n")
+            pending = lines.pop()  # 最后一段可能是不完整的行
+            
+            contents = []
+            for line in lines:
+                line = line.rstrip(b"\r")
+                if not line.startswith(b"data: "):
+                    continue
+                data = line[6:]
+                if data == b"[DONE]":
+                    done = True
+                    break
+                try:
+                    chunk = _json_loads(data)
+                except json.JSONDecodeError:
+                    continue
+                choices = chunk.get("choices")
+                if choices:
+                    content = choices[0].get("delta", {}).get("content", "")
+                    if content:
+                        contents.append(content)
+            
+            if contents:
+                yield "".join(contents)
+            if done:
+                break
     
     async def chat_stream(
         self,
@@ -71,34 +176,14 @@ class LLMClient:
         
         url = f"{self.api_base}/chat/completions"
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            async with client.stream(
-                "POST",
-                url,
-                json=payload,
-                headers=self.headers
-            ) as response:
-                if response.status_code != 200:
-                    error_text = await response.aread()
-                    logger.error(f"LLM API 错误: {response.status_code} - {error_text}")
-                    raise Exception(f"LLM API 错误: {response.status_code}")
-                
-                async for line in response.aiter_lines():
-                    if not line:
-                        continue
-                    if line.startswith("data: "):
-                        data = line[6:]
-                        if data == "[DONE]":
-                            break
-                        try:
-                            chunk = json.loads(data)
-                            if "choices" in chunk and len(chunk["choices"]) > 0:
-                                delta = chunk["choices"][0].get("delta", {})
-                                content = delta.get("content", "")
-                                if content:
-                                    yield content
-                        except json.JSONDecodeError:
-                            continue
+        async with self._get_client().stream(
+            "POST",
+            url,
+            content=_json_dumps(payload),
+            headers=self.headers
+        ) as response:
+            async for content in self._iter_sse_content(response):
+                yield content
     
     async def chat_with_audio_stream(
         self,
@@ -124,7 +209,7 @@ class LLMClient:
             流式输出的文本片段
         """
         # Base64 编码音频
-        base64_audio = base64.b64encode(audio_data).decode("utf-8")
+        base64_audio = await encode_audio_base64(audio_data)
         
         # 构建请求消息
         request_messages = []
@@ -161,34 +246,17 @@ class LLMClient:
         
         logger.debug(f"🎤 发送音频到 LLM ({len(audio_data)//1024}KB)")
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            async with client.stream(
-                "POST",
-                url,
-                json=payload,
-                headers=self.headers
-            ) as response:
-                if response.status_code != 200:
-                    error_text = await response.aread()
-                    logger.error(f"LLM API 错误: {response.status_code} - {error_text}")
-                    raise Exception(f"LLM API 错误: {response.status_code}")
-                
-                async for line in response.aiter_lines():
-                    if not line:
-                        continue
-                    if line.startswith("data: "):
-                        data = line[6:]
-                        if data == "[DONE]":
-                            break
-                        try:
-                            chunk = json.loads(data)
-                            if "choices" in chunk and len(chunk["choices"]) > 0:
-                                delta = chunk["choices"][0].get("delta", {})
-                                content = delta.get("content", "")
-                                if content:
-                                    yield content
-                        except json.JSONDecodeError:
-                            continue
+        # 请求体同样在线程池序列化 (内嵌 base64 音频，体积大)
+        body = await asyncio.get_running_loop().run_in_executor(None, _json_dumps, payload)
+        
+        async with self._get_client().stream(
+            "POST",
+            url,
+            content=body,
+            headers=self.headers
+        ) as response:
+            async for content in self._iter_sse_content(response):
+                yield content
     
     async def chat(
         self,
@@ -204,7 +272,36 @@ class LLMClient:
         async for chunk in self.chat_stream(messages, system_prompt, temperature, max_tokens):
             full_response += chunk
         return full_response
-    
+
+    async def chat_many(
+        self,
+        batches: List[list],
+        system_prompt: Optional[str] = None,
+        temperature: float = 1.2,
+        max_tokens: int = 2048,
+        concurrency: int = 8
+    ) -> List[str]:
+        """
+        并发执行多组非流式对话（如总结 + 分类 + 选工具）
+
+        后端只提供 chat/completions，没有数组 prompt 的批量接口，
+        所以用信号量限制并发，共享同一个复用连接池。
+
+        Args:
+            batches: 每项是一组 messages
+            concurrency: 最大并发请求数（与连接池 keepalive 上限一致）
+
+        Returns:
+            与 batches 顺序一致的完整响应列表
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(messages: list) -> str:
+            async with sem:
+                return await self.chat(messages, system_prompt, temperature, max_tokens)
+
+        return list(await asyncio.gather(*(_one(messages) for messages in batches)))
+
     async def chat_with_audio(
         self,
         audio_data: bytes,
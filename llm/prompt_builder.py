@@ -4,13 +4,16 @@ Prompt Builder 模块
 统一构建 System Prompt 和 User Prompt，参考 MaiBot 架构
 
 结构：
-- System Prompt: 角色设定 + 规则 + 工具 + 记忆（一次性注入）
-- User Prompt: 时间 + 对话历史（简洁格式）+ 当前输入
+- System Prompt: 角色设定 + 规则 + 工具（静态，跨轮次不变以命中 API 前缀缓存）
+- User Prompt: 状态 + 记忆（动态上下文）+ 时间 + 对话历史（简洁格式）+ 当前输入
 """
 
 from datetime import datetime
 from loguru import logger
-from typing import List, Dict, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Deque, List, Dict, Optional, Tuple, Union
 import sys
 import os
 
@@ -18,6 +21,24 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
 
 
+# 对话记录中的角色名称
+_ROLE_NAMES = {
+    "user": "主人",
+    "assistant": f"{config.CHARACTER_NAME}(你)",
+}
+
+
+def _format_history_content(content: str) -> str:
+    """对话记录内容：替换语音占位符，截断过长内容"""
+    # 跳过占位符
+    if content == "[语音输入]":
+        return "(语音)"
+    # 截断过长内容
+    if len(content) > 100:
+        return content[:97] + "..."
+    return content
+
+
 class PromptBuilder:
     """
     Prompt 构建器
@@ -26,70 +47,106 @@ class PromptBuilder:
     """
     
     def __init__(self):
-        self._cached_system_prompt = None
+        # (静态, 状态, 最近 episode, 记忆上下文)；时间行不缓存，每次现算
+        self._cached_parts: Optional[Tuple[str, str, Optional[Tuple[str, float]], str]] = None
         self._last_build_time = None
-        self._cache_duration = 300  # 5 分钟缓存
+        self._cache_duration = 300  # 5 分钟缓存（取不到记忆版本时）
+        self._max_cache_duration = 3 * 3600  # 缓存键可用时放宽到 3 小时
+        self._cache_key = None  # (时段, 记忆版本)
+        # 记忆上下文的几路查询互不依赖，并行执行（耗时取最大值而非总和）
+        self._memory_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="prompt-memory")
     
-    def build_system_prompt(self, force_refresh: bool = False) -> str:
+    def build_prompt_parts(self, force_refresh: bool = False) -> Tuple[str, str]:
         """
-        构建完整的 System Prompt（带缓存）
-        
-        包含：
-        1. 角色设定
-        2. 对话规则
-        3. 工具说明
-        4. 记忆/背景信息
+        构建拆分的 System Prompt（带缓存）
         
         Returns:
-            完整的 system prompt
+            (static, dynamic)
+            - static: 角色设定 + 对话规则 + 工具说明，跨轮次不变
+            - dynamic: 随机状态 + 记忆/背景信息（可能为空）
         """
         import time
+        from llm.character_prompt import get_time_bucket, get_system_prompt_parts
+        from core.memory_injector import get_memory_injector
         
-        # 检查缓存
-        if not force_refresh and self._cached_system_prompt:
-            if self._last_build_time and (time.time() - self._last_build_time) < self._cache_duration:
-                return self._cached_system_prompt
-        
-        logger.debug("🔧 构建 System Prompt...")
+        # 缓存键：时段变化（状态池切换）或知识库写入后才需要重建
+        # (版本号向知识库服务查询，服务进程是唯一写入方)
+        memory_version = get_memory_injector().get_memory_version()
+        cache_key = (get_time_bucket(), memory_version)
+        ttl = self._cache_duration if memory_version is None else self._max_cache_duration
         
-        # 获取基础角色 prompt
-        from llm.character_prompt import get_system_prompt
-        base_prompt = get_system_prompt()
+        cache_valid = (
+            not force_refresh
+            and self._cached_parts is not None
+            and cache_key == self._cache_key
+            and (time.time() - self._last_build_time) < ttl
+            and not self._has_prepared_context()
+        )
+        if not cache_valid:
+            logger.debug("🔧 构建 System Prompt...")
+            
+            # 记忆有变化（包括其他进程写入）时，基于旧记忆的短输入回复也不能再复用
+            if self._cache_key is not None and self._cache_key[1] != memory_version:
+                from llm.response_cache import get_response_cache
+                get_response_cache().clear()
+            
+            # 获取基础角色 prompt
+            parts = get_system_prompt_parts()
+            
+            # 获取记忆上下文（一次性注入）
+            recent_episode, memory_context = self._build_memory_context()
+            
+            self._cached_parts = (parts["static"], parts["dynamic"], recent_episode, memory_context)
+            self._last_build_time = time.time()
+            self._cache_key = cache_key
         
-        # 获取记忆上下文（一次性注入）
-        memory_context = self._build_memory_context()
+        static, state, recent_episode, memory_context = self._cached_parts
         
-        # 组合
-        full_prompt = base_prompt
-        if memory_context:
-            full_prompt += f"\n\n{memory_context}"
+        # 时间行精确到分钟，每次按当前时刻重新生成 (episode 查询结果复用缓存)
+        time_context = get_memory_injector().get_time_context(recent_episode=recent_episode)
         
-        self._cached_system_prompt = full_prompt
-        self._last_build_time = time.time()
+        dynamic = "\n\n".join(p for p in (state, time_context, memory_context) if p)
+        return static, dynamic
+    
+    def build_system_prompt(self, force_refresh: bool = False) -> str:
+        """
+        构建完整的 System Prompt（静态部分 + 动态部分，带缓存）
         
-        return full_prompt
+        Returns:
+            完整的 system prompt
+        """
+        static, dynamic = self.build_prompt_parts(force_refresh)
+        if dynamic:
+            return f"{static}\n\n{dynamic}"
+        return static
+    
+    @staticmethod
+    def _has_prepared_context() -> bool:
+        """后台是否有待注入的工具上下文（一次性，需立即重建以免被缓存压住）"""
+        try:
+            from core.context_manager import get_context_manager
+            return bool(get_context_manager().get_prepared_context())
+        except Exception:
+            return False
     
-    def _build_memory_context(self) -> str:
-        """构建记忆上下文（一次性）"""
+    def _build_memory_context(self) -> Tuple[Optional[Tuple[str, float]], str]:
+        """
+        构建记忆上下文（一次性）
+        
+        Returns:
+            (最近 episode, 记忆上下文文本)；episode 交给调用方按当前时刻生成时间行
+        """
         from core.memory_injector import get_memory_injector
         
-        parts = []
         injector = get_memory_injector()
         
-        # 1. 时间信息
-        time_context = injector.get_time_context()
-        if time_context:
-            parts.append(time_context)
-        
-        # 2. 重要记忆（核心层）
-        important = injector.get_important_memories()
-        if important:
-            parts.append(important)
-        
-        # 3. 最近记忆（一般事实）
-        recent = injector.get_recent_memories()
-        if recent:
-            parts.append(recent)
+        # 1. 最近情境记忆  2. 重要记忆（核心层）  3. 最近记忆（一般事实）—— 并行查询
+        futures = [
+            self._memory_executor.submit(fn)
+            for fn in (injector.get_recent_episode, injector.get_important_memories, injector.get_recent_memories)
+        ]
+        recent_episode = futures[0].result()
+        parts = [text for text in (f.result() for f in futures[1:]) if text]
         
         # 4. 🔥 后台小祥整理的工具调用结果
         try:
@@ -103,12 +160,12 @@ class PromptBuilder:
         except Exception as e:
             logger.debug(f"获取工具上下文失败: {e}")
         
-        return "\n\n".join(parts)
+        return recent_episode, "\n\n".join(parts)
     
     def build_user_prompt(
         self,
         current_input: str,
-        conversation_history: List[Dict],
+        conversation_history: Union[List[Dict], Deque[Dict]],
         max_history: int = 10
     ) -> str:
         """
@@ -129,7 +186,7 @@ class PromptBuilder:
         
         Args:
             current_input: 当前用户输入
-            conversation_history: 对话历史
+            conversation_history: 对话历史 (list 或 deque；传入 maxlen=max_history 的 deque 时无需截取)
             max_history: 最大历史记录数
             
         Returns:
@@ -152,37 +209,22 @@ class PromptBuilder:
         if conversation_history:
             lines.append("对话记录：")
             
-            # 只取最近的 N 条
-            recent = conversation_history[-max_history:]
+            # 只取最近的 N 条 (从尾部反向取，list / deque 通用)
+            if isinstance(conversation_history, deque) and conversation_history.maxlen is not None \
+                    and conversation_history.maxlen <= max_history:
+                recent = conversation_history
+            else:
+                recent = list(islice(reversed(conversation_history), max_history))
+                recent.reverse()
+            default_ts = now.strftime("%H:%M:%S")
+            role_names = _ROLE_NAMES
             
-            for msg in recent:
-                role = msg.get("role", "")
-                content = msg.get("content", "")
-                timestamp = msg.get("timestamp", "")
-                
-                # 格式化时间戳
-                if timestamp:
-                    time_str = timestamp
-                else:
-                    time_str = now.strftime("%H:%M:%S")
-                
-                # 角色名称
-                if role == "user":
-                    role_name = "主人"
-                elif role == "assistant":
-                    role_name = f"{config.CHARACTER_NAME}(你)"
-                else:
-                    role_name = role
-                
-                # 跳过占位符
-                if content == "[语音输入]":
-                    content = "(语音)"
-                
-                # 截断过长内容
-                if len(content) > 100:
-                    content = content[:97] + "..."
-                
-                lines.append(f"{time_str}, {role_name}: {content}")
+            lines.extend(
+                f"{msg.get('timestamp') or default_ts}, "
+                f"{role_names.get(msg.get('role', ''), msg.get('role', ''))}: "
+                f"{_format_history_content(msg.get('content', ''))}"
+                for msg in recent
+            )
             
             lines.append("")
         
@@ -227,8 +269,8 @@ class PromptBuilder:
         构建完整的消息列表（新架构）
         
         只返回两条消息：
-        1. system: 完整的角色设定 + 记忆
-        2. user: 对话历史 + 当前输入
+        1. system: 静态角色设定（每轮相同，命中 API 前缀缓存）
+        2. user: 动态上下文（状态 + 记忆） + 对话历史 + 当前输入
         
         Args:
             current_input: 当前用户输入
@@ -238,21 +280,25 @@ class PromptBuilder:
         Returns:
             [{"role": "system", ...}, {"role": "user", ...}]
         """
-        system_prompt = self.build_system_prompt(force_refresh=force_refresh_system)
+        static, dynamic = self.build_prompt_parts(force_refresh=force_refresh_system)
         user_prompt = self.build_user_prompt(
             current_input=current_input,
             conversation_history=conversation_history or []
         )
+        if dynamic:
+            user_prompt = f"{dynamic}\n\n{user_prompt}"
         
         return [
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": static},
             {"role": "user", "content": user_prompt}
         ]
     
     def invalidate_cache(self):
-        """使缓存失效（记忆更新时调用）"""
-        self._cached_system_prompt = None
+        """使缓存失效（记忆更新时调用），同时清空短输入响应缓存"""
+        self._cached_parts = None
         self._last_build_time = None
+        from llm.response_cache import get_response_cache
+        get_response_cache().clear()
 
 
 # 全局单例
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Response Cache Module
+短输入响应缓存：同一角色设定下重复的短输入（"你好"、"在吗"）按概率直接复用回复
+"""
+
+import hashlib
+import random
+import re
+from collections import OrderedDict
+from typing import Optional
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+
+# 归一化时去掉的空白与标点
+_NORMALIZE_RE = re.compile(r'[\s\.,!?。！？、~～…]+')
+
+
+class ResponseCache:
+    """短输入响应缓存 (LRU)"""
+    
+    def __init__(
+        self,
+        max_size: int = config.RESPONSE_CACHE_SIZE,
+        max_input_len: int = config.RESPONSE_CACHE_MAX_INPUT_LEN,
+        hit_chance: float = config.RESPONSE_CACHE_HIT_CHANCE
+    ):
+        self.max_size = max_size
+        self.max_input_len = max_input_len
+        self.hit_chance = hit_chance
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+    
+    def _key(self, system_prompt: str, user_input: str) -> Optional[str]:
+        """计算缓存键；输入过长时返回 None (不参与缓存)"""
+        normalized = _NORMALIZE_RE.sub('', user_input).lower()
+        if not normalized or len(normalized) > self.max_input_len:
+            return None
+        digest = hashlib.sha1(system_prompt.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(normalized.encode("utf-8"))
+        return digest.hexdigest()
+    
+    def get(self, system_prompt: str, user_input: str) -> Optional[str]:
+        """
+        查询缓存
+        
+        Returns:
+            命中且通过概率判定时返回缓存的完整回复，否则 None
+        """
+        key = self._key(system_prompt, user_input)
+        if key is None:
+            return None
+        response = self._entries.get(key)
+        if response is None or random.random() >= self.hit_chance:
+            return None
+        self._entries.move_to_end(key)
+        return response
+    
+    def put(self, system_prompt: str, user_input: str, response: str):
+        """写入缓存 (输入过长时忽略)"""
+        key = self._key(system_prompt, user_input)
+        if key is None:
+            return
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """清空缓存"""
+        self._entries.clear()
+
+
+# 全局单例
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """获取全局 ResponseCache 实例"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
@@ -19,6 +19,10 @@ class StreamParser:
     
     # 句子结束标志
     SENTENCE_ENDINGS = ['。', '！', '？', '!', '?', '…']
+    # 一次扫描找到最近的结束符
+    _END_RE = re.compile('[' + re.escape(''.join(SENTENCE_ENDINGS)) + ']')
+    # 跳过句间空白
+    _SPACE_RE = re.compile(r'\s*')
     
     # 情感标签正则 - 支持句首和句中
     EMOTION_PATTERN = re.compile(r'\[(\w+)\]\s*')
@@ -32,38 +36,49 @@ class StreamParser:
         r'[OwOUwU0w0QwQ]+',  # OwO 类型
         r'[♪♫♬♩☆★✿❀❤♥]+',  # 符号类型
     ]
+    # 合并成一个预编译的分支正则，一次 sub 去掉所有颜文字
+    _KAOMOJI_RE = re.compile('|'.join(f'(?:{p})' for p in KAOMOJI_PATTERNS))
+    # 去掉颜文字后再去掉的空白与标点
+    _STRIP_RE = re.compile(r'[\s\.,!?。！？、~～]+')
     
     # 配置
     MIN_SENTENCE_LENGTH = 12  # 最小句子长度（字符数）
+    KAOMOJI_MAX_LENGTH = 40   # 超过此长度的文本不按颜文字处理（跳过正则）
     
     def __init__(self):
-        self.buffer = ""
+        self._chunks: List[str] = []  # 未成句的文本片段，需要扫描时才拼接
         self.current_emotion: Optional[str] = None
-        self._last_output: Optional[str] = None  # 上一个输出的句子
+        self._emotion_match = self.EMOTION_PATTERN.match  # 热路径上省去属性查找
+    
+    @property
+    def buffer(self) -> str:
+        """缓冲区文本 (拼接后收拢成单个片段)"""
+        text = ''.join(self._chunks)
+        self._chunks = [text] if text else []
+        return text
+    
+    @buffer.setter
+    def buffer(self, value: str):
+        self._chunks = [value] if value else []
     
     def reset(self):
         """重置状态"""
-        self.buffer = ""
+        self._chunks = []
         self.current_emotion = None
-        self._last_output = None
     
     def _is_mostly_kaomoji(self, text: str) -> bool:
         """检查是否主要是颜文字"""
-        cleaned = text
-        for pattern in self.KAOMOJI_PATTERNS:
-            cleaned = re.sub(pattern, '', cleaned)
+        if len(text) > self.KAOMOJI_MAX_LENGTH:
+            return False
         # 去掉颜文字后，剩余有意义的字符很少
-        remaining = re.sub(r'[\s\.,!?。！？、~～]+', '', cleaned)
-        return len(remaining) <= 3
+        return len(self._STRIP_RE.sub('', self._KAOMOJI_RE.sub('', text))) <= 3
     
     def _should_merge_with_previous(self, sentence: str) -> bool:
         """判断是否应该与前一句合并"""
-        # 纯颜文字或太短
-        if self._is_mostly_kaomoji(sentence):
-            return True
+        # 太短或纯颜文字（先做长度判断，短句免去正则）
         if len(sentence) < self.MIN_SENTENCE_LENGTH:
             return True
-        return False
+        return self._is_mostly_kaomoji(sentence)
     
     def feed(self, chunk: str) -> Generator[Tuple[str, Optional[str]], None, None]:
         """
@@ -79,145 +94,93 @@ class StreamParser:
         Yields:
             (sentence, emotion) - 句子和情感标签
         """
-        self.buffer += chunk
+        if not chunk:
+            return
+        chunks = self._chunks
+        chunks.append(chunk)
+        
+        # 新片段里没有结束符、缓冲区开头也不是标签时，不会产出任何东西，免去拼接
+        if not self._END_RE.search(chunk) and not chunks[0].startswith('['):
+            return
+        text = ''.join(chunks)
         
         # 提取开头的情感标签（如果有）
-        match = self.EMOTION_PATTERN.match(self.buffer)
+        match = self._emotion_match(text) if text.startswith('[') else None
         if match:
             self.current_emotion = match.group(1).lower()
-            self.buffer = self.buffer[match.end():]
+            text = text[match.end():]
             logger.debug(f"提取到情感标签: [{self.current_emotion}]")
         
-        # 收集所有句子
-        sentences = []
+        # 逐句提取并即时合并：下一句不需要并入时，当前句就已确定，立即产出
+        # 用 offset 在同一个字符串上前进，不反复切片剩余文本
+        current_text = ""
+        current_emotion = None
+        offset = 0
         while True:
-            sentence, remaining, new_emotion = self._extract_sentence_with_emotion(self.buffer)
-            if sentence:
-                self.buffer = remaining
-                sentences.append((sentence, self.current_emotion))
-                # 更新情绪用于下一句
-                if new_emotion:
-                    self.current_emotion = new_emotion
-            else:
+            sentence, next_offset, new_emotion = self._extract_sentence_with_emotion(text, offset)
+            if not sentence:
                 break
+            offset = next_offset
+            emotion = self.current_emotion
+            
+            if not current_text:
+                current_text, current_emotion = sentence, emotion
+            elif self._should_merge_with_previous(sentence):
+                # 合并到当前句子（保持原情绪）
+                current_text += sentence
+            elif self._should_merge_with_previous(current_text):
+                # 当前句子太短，和新句子合并（使用新情绪）
+                current_text += sentence
+                if emotion:
+                    current_emotion = emotion
+            else:
+                # 输出当前句子，开始新的
+                rest = text[offset:].rstrip()
+                self._chunks = [rest] if rest else []
+                yield (current_text, current_emotion)
+                current_text, current_emotion = sentence, emotion
+            
+            # 更新情绪用于下一句
+            if new_emotion:
+                self.current_emotion = new_emotion
         
-        # 智能合并句子
-        merged = self._merge_sentences_with_emotion(sentences)
-        for s, e in merged:
-            self._last_output = s
-            yield (s, e)
+        # 只在提取过句子时截掉已消费部分（并去掉末尾空白，与逐句 strip 的结果一致）
+        if offset:
+            text = text[offset:].rstrip()
+        self._chunks = [text] if text else []
+        
+        # 最后一句：能走到这里的当前句要么是首句，要么由一句足够长的句子开头，直接输出
+        if current_text:
+            yield (current_text, current_emotion)
     
-    def _extract_sentence_with_emotion(self, text: str) -> Tuple[Optional[str], str, Optional[str]]:
+    def _extract_sentence_with_emotion(self, text: str, start: int = 0) -> Tuple[Optional[str], int, Optional[str]]:
         """
-        提取第一个完整句子，同时检查是否有新的情感标签
+        从 start 处提取第一个完整句子，同时检查是否有新的情感标签
         
         Returns:
-            (sentence, remaining, new_emotion) - 句子、剩余文本、新情感标签
+            (sentence, next_start, new_emotion) - 句子、剩余文本起点（已跳过空白和标签）、新情感标签
         """
-        if not text:
-            return None, "", None
-        
         # 找到最近的句子结束符
-        min_pos = -1
-        for ending in self.SENTENCE_ENDINGS:
-            pos = text.find(ending)
-            if pos != -1:
-                if min_pos == -1 or pos < min_pos:
-                    min_pos = pos
+        end = self._END_RE.search(text, start)
         
-        if min_pos != -1:
+        if end:
             # 包含结束符
-            sentence = text[:min_pos + 1].strip()
-            remaining = text[min_pos + 1:].strip()
+            pos = end.end()
+            sentence = text[start:pos].strip()
+            pos = self._SPACE_RE.match(text, pos).end()
             
             # 检查剩余文本开头是否有新的情感标签
             new_emotion = None
-            if remaining:
-                match = self.EMOTION_PATTERN.match(remaining)
+            if text.startswith('[', pos):
+                match = self._emotion_match(text, pos)
                 if match:
                     new_emotion = match.group(1).lower()
-                    remaining = remaining[match.end():]
+                    pos = match.end()
                     logger.debug(f"句中提取到新情感标签: [{new_emotion}]")
             
-            return sentence, remaining, new_emotion
-        
-        return None, text, None
-    
-    def _merge_sentences(self, sentences: List[str]) -> List[str]:
-        """智能合并句子"""
-        if not sentences:
-            return []
-        
-        result = []
-        current = ""
-        
-        for s in sentences:
-            if not current:
-                current = s
-            elif self._should_merge_with_previous(s):
-                # 合并到当前句子
-                current += s
-            elif self._should_merge_with_previous(current):
-                # 当前句子太短，和新句子合并
-                current += s
-            else:
-                # 输出当前句子，开始新的
-                result.append(current)
-                current = s
-        
-        # 如果当前句子足够长或者是最后一个，加入结果
-        if current:
-            if len(current) >= self.MIN_SENTENCE_LENGTH or not self._is_mostly_kaomoji(current):
-                result.append(current)
-            elif result:
-                # 太短就附加到上一个
-                result[-1] += current
-            else:
-                # 没有其他句子，只能输出
-                result.append(current)
-        
-        return result
-    
-    def _merge_sentences_with_emotion(self, sentences: List[Tuple[str, Optional[str]]]) -> List[Tuple[str, Optional[str]]]:
-        """智能合并句子（带情感标签版本）"""
-        if not sentences:
-            return []
-        
-        result = []
-        current_text = ""
-        current_emotion = None
-        
-        for text, emotion in sentences:
-            if not current_text:
-                current_text = text
-                current_emotion = emotion
-            elif self._should_merge_with_previous(text):
-                # 合并到当前句子（保持原情绪）
-                current_text += text
-            elif self._should_merge_with_previous(current_text):
-                # 当前句子太短，和新句子合并（使用新情绪）
-                current_text += text
-                if emotion:
-                    current_emotion = emotion
-            else:
-                # 输出当前句子，开始新的
-                result.append((current_text, current_emotion))
-                current_text = text
-                current_emotion = emotion
-        
-        # 处理最后一个
-        if current_text:
-            if len(current_text) >= self.MIN_SENTENCE_LENGTH or not self._is_mostly_kaomoji(current_text):
-                result.append((current_text, current_emotion))
-            elif result:
-                # 太短就附加到上一个
-                last_text, last_emotion = result[-1]
-                result[-1] = (last_text + current_text, last_emotion)
-            else:
-                # 没有其他句子，只能输出
-                result.append((current_text, current_emotion))
+            return sentence, pos, new_emotion
         
-        return result
+        return None, start, None
     
     def _extract_sentence(self, text: str) -> Tuple[Optional[str], str]:
         """
@@ -230,15 +193,11 @@ class StreamParser:
             return None, ""
         
         # 找到最近的句子结束符
-        min_pos = -1
-        for ending in self.SENTENCE_ENDINGS:
-            pos = text.find(ending)
-            if pos != -1:
-                if min_pos == -1 or pos < min_pos:
-                    min_pos = pos
+        end = self._END_RE.search(text)
         
-        if min_pos != -1:
+        if end:
             # 包含结束符
+            min_pos = end.start()
             sentence = text[:min_pos + 1].strip()
             remaining = text[min_pos + 1:].strip()
             return sentence, remaining
@@ -7,8 +7,6 @@ Neuro-like AI Desktop Pet - Main Entry
 import sys
 import os
 import time
-import socket
-import subprocess
 import argparse
 
 # 添加项目根目录到路径
@@ -16,6 +14,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from loguru import logger
 import config
+from scripts.service_utils import NPM, ServiceSpec, is_port_in_use, wait_for_port, launch_service
 
 
 # 配置 loguru
@@ -37,25 +36,19 @@ logger.add(
 # 服务管理
 # ====================
 
-def is_port_in_use(port: int, host: str = "127.0.0.1") -> bool:
-    """检测端口是否被占用"""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.settimeout(1)
-        try:
-            s.connect((host, port))
-            return True
-        except (socket.timeout, ConnectionRefusedError, OSError):
-            return False
-
-
 def start_antigravity():
     """启动 Antigravity API 代理服务"""
     logger.info(f"   启动目录: {config.ANTIGRAVITY_DIR}")
-    cmd = f'start "Antigravity API" cmd /k "cd /d {config.ANTIGRAVITY_DIR} && npm start"'
-    subprocess.Popen(cmd, shell=True)
+    spec = ServiceSpec("Antigravity API", config.ANTIGRAVITY_PORT, [NPM, "start"], config.ANTIGRAVITY_DIR)
+    if not launch_service(spec):
+        return
     
-    logger.info("   等待 Antigravity 初始化 (5秒)...")
-    time.sleep(5)
+    logger.info("   等待 Antigravity 初始化 (最多 5秒)...")
+    start = time.monotonic()
+    if wait_for_port(spec.port, spec.wait_seconds):
+        logger.info(f"   Antigravity 已就绪 ({time.monotonic() - start:.1f}秒)")
+    else:
+        logger.info("   Antigravity 5秒内未监听端口，继续启动")
 
 
 def ensure_services_running():
@@ -108,31 +101,38 @@ def main():
             kb = get_knowledge_base()
             logger.info(f"✅ 知识库预加载完成: {kb.count()} 条记录")
             
+            # 🔥 检索预热（Embedding 推理 + LanceDB 首次查询）
+            if getattr(config, 'WARMUP_EMBEDDING', True):
+                try:
+                    logger.info(f"🔥 Embedding warmup: {kb.warmup():.0f}ms")
+                except Exception as we:
+                    logger.debug(f"检索预热失败: {we}")
+            
             # 🔥 启动时执行记忆衰减（如果距上次衰减超过 24h）
             try:
-                from knowledge.memory_manager import MemoryManager
-                import os
-                import json
-                
                 decay_state_file = "data/decay_state.json"
-                last_decay = 0
                 
-                if os.path.exists(decay_state_file):
-                    with open(decay_state_file, 'r') as f:
-                        state = json.load(f)
-                        last_decay = state.get("last_decay", 0)
+                # 状态文件只在衰减后写入，mtime 即上次衰减时间，未过期时不必打开解析
+                try:
+                    last_decay = os.stat(decay_state_file).st_mtime
+                except OSError:
+                    last_decay = 0
                 
-                import time
                 if time.time() - last_decay > 24 * 3600:  # 超过 24 小时
+                    from knowledge.memory_manager import MemoryManager
+                    import json
+                    
                     manager = MemoryManager(kb)
                     count = manager.decay_old_memories()
                     if count > 0:
                         logger.info(f"🧹 启动时记忆衰减: 处理 {count} 条")
                     
-                    # 更新衰减状态
+                    # 更新衰减状态（先写临时文件再替换，避免中断时留下半截 JSON）
                     os.makedirs("data", exist_ok=True)
-                    with open(decay_state_file, 'w') as f:
+                    tmp_file = decay_state_file + ".tmp"
+                    with open(tmp_file, 'w') as f:
                         json.dump({"last_decay": time.time()}, f)
+                    os.replace(tmp_file, decay_state_file)
             except Exception as de:
                 logger.debug(f"启动时衰减失败: {de}")
                 
@@ -7,13 +7,15 @@ Neuro Service Launcher (preload.py)
 import sys
 import os
 import time
-import socket
-import subprocess
+import asyncio
 from loguru import logger
 
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import config
+from scripts.service_utils import (
+    NPM, ServiceSpec, probe_ports, launch_service, wait_services
+)
 
 logger.remove()
 logger.add(
@@ -22,42 +24,6 @@ logger.add(
     format="<green>{time:HH:mm:ss}</green> | <cyan>{name}</cyan> | <level>{message}</level>"
 )
 
-def is_port_in_use(port: int, host: str = "127.0.0.1") -> bool:
-    """检测端口是否被占用"""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.settimeout(1)
-        try:
-            s.connect((host, port))
-            return True
-        except (socket.timeout, ConnectionRefusedError, OSError):
-            return False
-
-def start_service(name: str, port: int, cmd: str, work_dir: str = None, wait_seconds: int = 5):
-    """启动单个服务"""
-    if is_port_in_use(port):
-        logger.info(f"✅ {name} 已在运行 (端口 {port})")
-        return
-
-    logger.info(f"🚀 正在启动 {name} (端口 {port})...")
-    
-    # 构造命令
-    if work_dir:
-        # 如果指定了目录，先切目录
-        full_cmd = f'start "{name}" cmd /k "cd /d {work_dir} && {cmd}"'
-    else:
-        full_cmd = f'start "{name}" cmd /k "{cmd}"'
-    
-    try:
-        subprocess.Popen(full_cmd, shell=True)
-        
-        # 等待服务初始化
-        if wait_seconds > 0:
-            logger.info(f"⏳ 等待 {name} 初始化 ({wait_seconds}秒)...")
-            time.sleep(wait_seconds)
-            
-    except Exception as e:
-        logger.error(f"❌ 启动 {name} 失败: {e}")
-
 def main():
     print("""
     ╔═══════════════════════════════════════════════╗
@@ -66,32 +32,34 @@ def main():
     ╚═══════════════════════════════════════════════╝
     """)
     
+    services = []
+    
     # 1. Antigravity LLM API
-    start_service(
+    services.append(ServiceSpec(
         name="Antigravity API",
         port=config.ANTIGRAVITY_PORT,
-        cmd="npm start",
+        cmd=[NPM, "start"],
         work_dir=config.ANTIGRAVITY_DIR,
         wait_seconds=5
-    )
+    ))
     
     # 2. STT Service
     stt_script = os.path.join(config.SERVICES_DIR, "stt_service.py")
-    start_service(
+    services.append(ServiceSpec(
         name="STT Service",
         port=config.STT_SERVICE_PORT,
-        cmd=f"python {stt_script}",
+        cmd=[sys.executable, stt_script],
         wait_seconds=5
-    )
+    ))
     
     # 3. TTS Service
     tts_script = os.path.join(config.SERVICES_DIR, "tts_service.py")
-    start_service(
+    services.append(ServiceSpec(
         name="TTS Service",
         port=config.TTS_SERVICE_PORT,
-        cmd=f"python {tts_script}",
+        cmd=[sys.executable, tts_script],
         wait_seconds=5
-    )
+    ))
     
     # 4. RVC API (仅当配置使用 kokoro_rvc 时)
     if config.TTS_ENGINE == "kokoro_rvc":
@@ -102,14 +70,28 @@ def main():
             model_name = getattr(config, 'RVC_MODEL_NAME', 'xiangzi.pth')
             
             if os.path.exists(python_exe) and os.path.exists(api_script):
-                cmd = f"{python_exe} {api_script} --port {config.RVC_API_PORT} --model {model_name}"
-                start_service(
+                cmd = [python_exe, api_script, "--port", str(config.RVC_API_PORT), "--model", model_name]
+                services.append(ServiceSpec(
                     name="RVC API",
                     port=config.RVC_API_PORT,
                     cmd=cmd,
                     work_dir=rvc_dir,
                     wait_seconds=15
-                )
+                ))
+    
+    # 所有端口一次并发探测，再决定启动哪些
+    running = probe_ports(spec.port for spec in services)
+    pending = []
+    for spec in services:
+        if running[spec.port]:
+            logger.info(f"✅ {spec.name} 已在运行 (端口 {spec.port})")
+        elif launch_service(spec):
+            pending.append(spec)
+    
+    # 进程互不依赖：全部拉起后再并行等待，总耗时取最慢的服务
+    if pending:
+        logger.info(f"⏳ 等待 {len(pending)} 个服务初始化...")
+        asyncio.run(wait_services(pending))
     
     print("\n✅ 所有服务检测/启动完成！")
     print("现在可以运行 main.py (它会连接到这些服务)")
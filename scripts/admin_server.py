@@ -11,21 +11,77 @@ import json
 import re
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain, islice
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Depends
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse, JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 from loguru import logger
 
 import config
 
+# orjson 序列化更快 (默认响应类 + 流式输出)，缺失时回退标准库
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _ResponseClass = ORJSONResponse
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    _ResponseClass = JSONResponse
+
 # 知识库客户端
-from knowledge import get_knowledge_client
+from knowledge import get_knowledge_client, get_knowledge_base
+from knowledge.memory_manager import MemoryManager
+
+# 测试 API 依赖 (三元组 / Hybrid 检索 / 三元组抽取)，导入失败时只禁用这些接口
+try:
+    from knowledge.triple_store import get_triple_store
+    from knowledge.hybrid_retriever import get_hybrid_retriever
+    from knowledge.entity_extractor import get_entity_extractor
+    from llm import get_llm_client
+    _TEST_API_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"⚠️ 测试 API 依赖导入失败，三元组/Hybrid 接口已禁用: {e}")
+    _TEST_API_AVAILABLE = False
+
+app = FastAPI(title="NeuroPet Admin Panel", version="1.0.0", default_response_class=_ResponseClass)
 
-app = FastAPI(title="NeuroPet Admin Panel", version="1.0.0")
+# ============================================================
+# 依赖 (首次使用时初始化，之后各请求复用同一实例)
+# ============================================================
+
+@lru_cache(maxsize=None)
+def knowledge_client_dep():
+    """知识库 RPC 客户端"""
+    return get_knowledge_client()
+
+@lru_cache(maxsize=None)
+def knowledge_base_dep():
+    """本地知识库 (直接访问，仅 Hybrid 检索/衰减测试使用)"""
+    return get_knowledge_base()
+
+def _require_test_api():
+    if not _TEST_API_AVAILABLE:
+        raise HTTPException(status_code=503, detail="测试 API 依赖未安装")
+
+@lru_cache(maxsize=None)
+def triple_store_dep():
+    """三元组存储"""
+    _require_test_api()
+    return get_triple_store()
+
+@lru_cache(maxsize=None)
+def hybrid_retriever_dep():
+    """Hybrid 检索器 (只在首次创建时绑定一次知识库和三元组存储)"""
+    _require_test_api()
+    retriever = get_hybrid_retriever()
+    retriever.set_stores(knowledge_base_dep(), triple_store_dep())
+    return retriever
 
 # ============================================================
 # 数据模型
@@ -50,22 +106,35 @@ class ConfigUpdate(BaseModel):
 # 知识库 API
 # ============================================================
 
+def _stream_records(records):
+    """把记录逐条编码成 JSON 数组输出 (格式与 {"success", "data", "count"} 一致)"""
+    yield b'{"success":true,"data":['
+    count = 0
+    for record in records:
+        if count:
+            yield b"," + _json_dumps(record)
+        else:
+            yield _json_dumps(record)
+        count += 1
+    yield b'],"count":' + str(count).encode() + b'}'
+
+
 @app.get("/api/memories")
-async def get_all_memories():
-    """获取所有记忆"""
+async def get_all_memories(client=Depends(knowledge_client_dep)):
+    """获取所有记忆 (逐页读取、流式输出)"""
     try:
-        client = get_knowledge_client()
-        records = client.get_all()
-        return {"success": True, "data": records, "count": len(records)}
+        records = client.iter_all()
+        # 首条同步取出，服务不可用时仍能返回 500
+        first = list(islice(records, 1))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(_stream_records(chain(first, records)), media_type="application/json")
 
 
 @app.get("/api/memories/search")
-async def search_memories(q: str, limit: int = 20):
+async def search_memories(q: str, limit: int = 20, client=Depends(knowledge_client_dep)):
     """搜索记忆"""
     try:
-        client = get_knowledge_client()
         results = client.search(q, n_results=limit)
         # 处理 metadata
         for r in results:
@@ -80,10 +149,9 @@ async def search_memories(q: str, limit: int = 20):
 
 
 @app.post("/api/memories")
-async def add_memory(memory: MemoryCreate):
+async def add_memory(memory: MemoryCreate, client=Depends(knowledge_client_dep)):
     """添加记忆"""
     try:
-        client = get_knowledge_client()
         doc_id = client.add(
             text=memory.text,
             metadata={
@@ -99,10 +167,9 @@ async def add_memory(memory: MemoryCreate):
 
 
 @app.put("/api/memories")
-async def update_memory(memory: MemoryUpdate):
+async def update_memory(memory: MemoryUpdate, client=Depends(knowledge_client_dep)):
     """更新记忆"""
     try:
-        client = get_knowledge_client()
         success = client.update_text(memory.doc_id, memory.new_text)
         return {"success": success}
     except Exception as e:
@@ -110,47 +177,31 @@ async def update_memory(memory: MemoryUpdate):
 
 
 @app.delete("/api/memories")
-async def delete_memories(data: MemoryDelete):
+async def delete_memories(data: MemoryDelete, client=Depends(knowledge_client_dep)):
     """批量删除记忆"""
     try:
-        client = get_knowledge_client()
-        deleted = []
-        skipped = []
-        
-        # 获取所有记录检查 core
-        all_records = client.get_all()
-        core_ids = {r['id'] for r in all_records if r.get('metadata', {}).get('category') == 'core'}
+        # 只查询待删除记录的分类，跳过 core 后一次删除
+        categories = client.get_categories(data.ids)
+        core_ids = {doc_id for doc_id, cat in categories.items() if cat == 'core'}
+        to_delete = [doc_id for doc_id in data.ids if doc_id not in core_ids]
+        skipped = len(data.ids) - len(to_delete)
         
-        for doc_id in data.ids:
-            if doc_id in core_ids:
-                skipped.append(doc_id)
-                continue
-            try:
-                client.delete(doc_id)
-                deleted.append(doc_id)
-            except:
-                pass
+        deleted = len(to_delete) if to_delete and client.delete_many(to_delete) else 0
         
-        return {"success": True, "deleted": len(deleted), "skipped": len(skipped)}
+        return {"success": True, "deleted": deleted, "skipped": skipped}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/memories/stats")
-async def get_memory_stats():
+async def get_memory_stats(client=Depends(knowledge_client_dep)):
     """获取统计信息"""
     try:
-        client = get_knowledge_client()
-        records = client.get_all()
-        
-        categories = {}
-        for r in records:
-            cat = r.get('metadata', {}).get('category', 'unknown')
-            categories[cat] = categories.get(cat, 0) + 1
+        categories = client.get_category_counts()
         
         return {
             "success": True,
-            "total": len(records),
+            "total": sum(categories.values()),
             "categories": categories
         }
     except Exception as e:
@@ -162,11 +213,9 @@ async def get_memory_stats():
 # ============================================================
 
 @app.get("/api/triples")
-async def get_all_triples():
+async def get_all_triples(store=Depends(triple_store_dep)):
     """获取所有三元组"""
     try:
-        from knowledge.triple_store import get_triple_store
-        store = get_triple_store()
         triples = [t.to_dict() for t in store.triples.values()]
         return {
             "success": True,
@@ -179,11 +228,9 @@ async def get_all_triples():
 
 
 @app.get("/api/triples/search")
-async def search_triples(entity: str):
+async def search_triples(entity: str, store=Depends(triple_store_dep)):
     """按实体搜索三元组"""
     try:
-        from knowledge.triple_store import get_triple_store
-        store = get_triple_store()
         results = store.find_by_entity(entity)
         return {
             "success": True,
@@ -196,17 +243,9 @@ async def search_triples(entity: str):
 
 
 @app.get("/api/hybrid/search")
-async def hybrid_search(q: str, top_k: int = 5):
+async def hybrid_search(q: str, top_k: int = 5, retriever=Depends(hybrid_retriever_dep)):
     """Hybrid 检索测试 (Vector + Graph)"""
     try:
-        from knowledge import get_knowledge_base
-        from knowledge.triple_store import get_triple_store
-        from knowledge.hybrid_retriever import get_hybrid_retriever
-        
-        kb = get_knowledge_base()
-        retriever = get_hybrid_retriever()
-        retriever.set_stores(kb, get_triple_store())
-        
         results = retriever.search(q, top_k=top_k)
         
         return {
@@ -231,13 +270,9 @@ async def hybrid_search(q: str, top_k: int = 5):
 
 
 @app.post("/api/test/decay")
-async def trigger_decay():
+async def trigger_decay(kb=Depends(knowledge_base_dep)):
     """手动触发记忆衰减"""
     try:
-        from knowledge import get_knowledge_base
-        from knowledge.memory_manager import MemoryManager
-        
-        kb = get_knowledge_base()
         manager = MemoryManager(kb)
         count = manager.decay_old_memories()
         
@@ -256,10 +291,8 @@ class ExtractTripleRequest(BaseModel):
 @app.post("/api/test/extract-triples")
 async def test_extract_triples(data: ExtractTripleRequest):
     """测试三元组抽取"""
+    _require_test_api()
     try:
-        from knowledge.entity_extractor import get_entity_extractor
-        from llm import get_llm_client
-        
         extractor = get_entity_extractor()
         if not extractor.llm_client:
             extractor.set_llm_client(get_llm_client())
@@ -380,14 +413,27 @@ async def update_config(data: ConfigUpdate):
 # 前端页面
 # ============================================================
 
+_INDEX_HTML_PATH = os.path.join(os.path.dirname(__file__), "admin_panel.html")
+_INDEX_HTML: bytes = b""
+
+
+@app.on_event("startup")
+async def _load_index_html():
+    """启动时读入管理面板 HTML，之后每次访问直接返回内存中的内容"""
+    global _INDEX_HTML
+    try:
+        with open(_INDEX_HTML_PATH, "rb") as f:
+            _INDEX_HTML = f.read()
+    except OSError:
+        logger.warning(f"⚠️ 未找到管理面板页面: {_INDEX_HTML_PATH}")
+
+
 @app.get("/", response_class=HTMLResponse)
 async def index():
     """返回管理面板 HTML"""
-    html_path = os.path.join(os.path.dirname(__file__), "admin_panel.html")
-    if os.path.exists(html_path):
-        with open(html_path, "r", encoding="utf-8") as f:
-            return f.read()
-    return "<h1>admin_panel.html not found</h1>"
+    if _INDEX_HTML:
+        return HTMLResponse(content=_INDEX_HTML)
+    return HTMLResponse(content="<h1>admin_panel.html not found</h1>")
 
 
 # ============================================================
@@ -396,6 +442,14 @@ async def index():
 
 if __name__ == "__main__":
     import uvicorn
+    from importlib.util import find_spec
+    
+    # 装了 uvloop (非 Windows) / httptools 就用，否则退回 asyncio / h11
+    loop = "uvloop" if find_spec("uvloop") else "asyncio"
+    http = "httptools" if find_spec("httptools") else "h11"
+    
     print("[*] Starting NeuroPet Admin Panel...")
+    print(f"[*] loop={loop}, http={http}")
     print("[*] Open http://127.0.0.1:7861")
-    uvicorn.run(app, host="127.0.0.1", port=7861, log_level="info")
+    # 单 worker：知识库/三元组是进程内单例，多 worker 会各自加载一份模型
+    uvicorn.run(app, host="127.0.0.1", port=7861, loop=loop, http=http, workers=1, log_level="info")
@@ -5,67 +5,78 @@ sys.stdout.reconfigure(encoding='utf-8')
 sys.path.insert(0, '.')
 
 import json
+from collections import defaultdict
+
+import pandas as pd
 from knowledge import get_knowledge_base
 
+def _parse_meta(meta):
+    """metadata 列可能是 JSON 字符串或已解析的 dict"""
+    if isinstance(meta, str):
+        try:
+            return json.loads(meta)
+        except ValueError:
+            return {}
+    return meta or {}
+
+def _find_containment_pairs(texts, k=4):
+    """
+    找出互相包含的文本对 (i < j)
+    
+    A 是 B 的子串时，A 首尾的 k-gram 必然都出现在 B 中：用 k-gram 倒排索引取候选，
+    只对候选做精确子串判断，避免 O(N²) 两两比较
+    """
+    index = defaultdict(set)
+    for idx, text in enumerate(texts):
+        for pos in range(len(text) - k + 1):
+            index[text[pos:pos + k]].add(idx)
+    
+    empty = set()
+    pairs = set()
+    for i, t1 in enumerate(texts):
+        if not t1:
+            continue
+        if len(t1) >= k:
+            candidates = index.get(t1[:k], empty) & index.get(t1[-k:], empty)
+        else:
+            candidates = range(len(texts))  # 过短的文本没有 k-gram，只能逐条比较
+        for j in candidates:
+            if j != i and texts[j] and t1 in texts[j]:
+                pairs.add((i, j) if i < j else (j, i))
+    return sorted(pairs)
+
 def analyze_knowledge():
     kb = get_knowledge_base()
     all_data = kb._table.to_pandas()
     
     print(f'=== 知识库共 {len(all_data)} 条记忆 ===\n')
     
-    # 按类型分组统计
-    categories = {}
-    sources = {}
-    importance_dist = {
-        '低 (1.0-2.0)': 0,
-        '中 (2.1-4.0)': 0,
-        '高 (4.1-6.0)': 0,
-        '极高 (6.1+)': 0
-    }
-    
-    all_records = []
-    
-    for i, (_, row) in enumerate(all_data.iterrows()):
-        doc_id = row['id']
-        text = row.get('text', '')
-        meta = row.get('metadata', '{}')
-        try:
-            meta = json.loads(meta) if isinstance(meta, str) else meta
-        except:
-            meta = {}
-        
-        cat = meta.get('category', 'unknown')
-        src = meta.get('source', 'unknown')
-        imp = meta.get('importance', 1.0)
-        
-        categories[cat] = categories.get(cat, 0) + 1
-        sources[src] = sources.get(src, 0) + 1
-        
-        if imp <= 2.0:
-            importance_dist['低 (1.0-2.0)'] += 1
-        elif imp <= 4.0:
-            importance_dist['中 (2.1-4.0)'] += 1
-        elif imp <= 6.0:
-            importance_dist['高 (4.1-6.0)'] += 1
-        else:
-            importance_dist['极高 (6.1+)'] += 1
-        
-        all_records.append({
-            'id': doc_id,
-            'text': text,
-            'category': cat,
-            'source': src,
-            'importance': imp,
-            'context': meta.get('context', ''),
-            'timestamp': meta.get('timestamp', '')
-        })
+    # metadata 只解析一次并拆成列，后续统计都走 pandas 列运算
+    meta = all_data['metadata'].map(_parse_meta)
+    df = pd.DataFrame({
+        'id': all_data['id'],
+        'text': all_data['text'].fillna(''),
+        'category': meta.map(lambda m: m.get('category', 'unknown')),
+        'source': meta.map(lambda m: m.get('source', 'unknown')),
+        'importance': meta.map(lambda m: m.get('importance', 1.0)).astype(float),
+        'context': meta.map(lambda m: m.get('context', '')),
+        'timestamp': meta.map(lambda m: m.get('timestamp', '')),
+    })
+    
+    categories = df['category'].value_counts()
+    sources = df['source'].value_counts()
+    importance_dist = pd.cut(
+        df['importance'],
+        bins=[-float('inf'), 2.0, 4.0, 6.0, float('inf')],
+        labels=['低 (1.0-2.0)', '中 (2.1-4.0)', '高 (4.1-6.0)', '极高 (6.1+)']
+    ).value_counts(sort=False)
     
     print('=== 按类型统计 ===')
-    for cat, count in sorted(categories.items(), key=lambda x: -x[1]):
+    for cat, count in categories.items():
         print(f'  {cat}: {count}')
     
     print('\n=== 按来源统计 ===')
-    for src, count in sorted(sources.items(), key=lambda x: -x[1]):
+    for src, count in sources.items():
         print(f'  {src}: {count}')
     
     print('\n=== 按重要性分布 ===')
@@ -73,8 +84,7 @@ def analyze_knowledge():
         print(f'  {level}: {count}')
     
     print('\n=== 高重要性记忆样本 (importance > 4.0) ===')
-    high_imp = [r for r in all_records if r['importance'] > 4.0]
-    for r in high_imp[:10]:
+    for r in df[df['importance'] > 4.0].head(10).to_dict('records'):
         print(f"[{r['category']}] imp={r['importance']:.1f} src={r['source']}")
         print(f"  内容: {r['text'][:150]}")
         if r['context']:
@@ -82,7 +92,7 @@ def analyze_knowledge():
         print()
     
     print('\n=== 最近10条记忆 ===')
-    for r in all_records[-10:]:
+    for r in df.tail(10).to_dict('records'):
         print(f"[{r['category']}] imp={r['importance']:.1f} src={r['source']}")
         print(f"  内容: {r['text'][:150]}")
         print()
@@ -91,12 +101,8 @@ def analyze_knowledge():
     print('\n=== 潜在问题分析 ===')
     
     # 1. 检查重复或相似内容
-    texts = [r['text'] for r in all_records]
-    duplicates = []
-    for i, t1 in enumerate(texts):
-        for j, t2 in enumerate(texts[i+1:], i+1):
-            if t1 and t2 and (t1 in t2 or t2 in t1):
-                duplicates.append((i, j, t1[:50], t2[:50]))
+    texts = df['text'].tolist()
+    duplicates = [(i, j, texts[i][:50], texts[j][:50]) for i, j in _find_containment_pairs(texts)]
     
     if duplicates:
         print(f'\n1. 发现 {len(duplicates)} 对可能重复的记忆:')
@@ -108,18 +114,18 @@ def analyze_knowledge():
         print('\n1. 未发现明显重复记忆')
     
     # 2. 检查空内容或极短内容
-    short_records = [r for r in all_records if len(r['text'].strip()) < 10]
-    if short_records:
+    short_records = df[df['text'].str.strip().str.len() < 10]
+    if len(short_records):
         print(f'\n2. 发现 {len(short_records)} 条极短记忆 (<10字符):')
-        for r in short_records[:5]:
+        for r in short_records.head(5).to_dict('records'):
             print(f"   [{r['category']}] {repr(r['text'])}")
     else:
         print('\n2. 未发现极短记忆')
     
     # 3. 检查缺失元数据
-    missing_meta = [r for r in all_records if r['category'] == 'unknown' or r['source'] == 'unknown']
+    missing_meta = int(((df['category'] == 'unknown') | (df['source'] == 'unknown')).sum())
     if missing_meta:
-        print(f'\n3. 发现 {len(missing_meta)} 条缺失分类或来源的记忆')
+        print(f'\n3. 发现 {missing_meta} 条缺失分类或来源的记忆')
     else:
         print('\n3. 所有记忆都有完整的分类和来源')
     
@@ -128,7 +134,7 @@ def analyze_knowledge():
     factual = categories.get('fact', 0) + categories.get('preference', 0) + categories.get('personal_info', 0)
     print(f'\n4. 对话记忆 vs 事实记忆比例: {episodic} : {factual}')
     
-    return all_records
+    return df.to_dict('records')
 
 if __name__ == '__main__':
     analyze_knowledge()
@@ -4,36 +4,62 @@
 """
 
 import gc
+import os
+import threading
 from loguru import logger
 
+try:
+    import torch
+except ImportError:
+    torch = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+# CUDA 可用性探测会枚举设备，结果缓存；CUDA_VISIBLE_DEVICES 变化时重新探测
+_cuda_probe = {"env": object(), "available": False}
+
+
+def _has_cuda() -> bool:
+    """CUDA 是否可用（缓存）"""
+    if torch is None:
+        return False
+    env = os.environ.get("CUDA_VISIBLE_DEVICES")
+    if env != _cuda_probe["env"]:
+        _cuda_probe["env"] = env
+        _cuda_probe["available"] = torch.cuda.is_available()
+    return _cuda_probe["available"]
+
 
 def cleanup_all(aggressive: bool = False):
     """
     执行内存清理
     
+    同步 + empty_cache 做一次就够：分配器第一遍已把空闲块全部归还，多轮只会重复等待 GPU
+    
     Args:
-        aggressive: 是否激进清理（多轮）
+        aggressive: 是否激进清理（完整分代 GC + 同步后清空缓存；普通模式只回收年轻代）
     """
     try:
-        import torch
-        
-        gc.collect()
+        gc.collect(2 if aggressive else 1)
         
-        if torch.cuda.is_available():
+        if _has_cuda():
             if aggressive:
-                # 激进模式：多轮清理
-                for i in range(3):
-                    torch.cuda.synchronize()
-                    torch.cuda.empty_cache()
-                    gc.collect()
-                logger.info("🧹 CUDA 激进清理完成 (3轮)")
+                reserved_before = torch.cuda.memory_reserved()
+                torch.cuda.synchronize()
+                torch.cuda.ipc_collect()
+                torch.cuda.empty_cache()
+                freed_mb = (reserved_before - torch.cuda.memory_reserved()) / 1024**2
+                logger.info(f"🧹 CUDA 激进清理完成 (释放 {freed_mb:.0f}MB)")
             else:
                 torch.cuda.empty_cache()
                 logger.debug("🧹 CUDA 缓存已清理")
             
             torch.cuda.reset_peak_memory_stats()
         else:
-            gc.collect()
             logger.debug("🧹 Python GC 已执行")
             
     except Exception as e:
@@ -50,8 +76,7 @@ def get_memory_stats() -> dict:
     stats = {"cuda": None, "ram": None}
     
     try:
-        import torch
-        if torch.cuda.is_available():
+        if _has_cuda():
             allocated = torch.cuda.memory_allocated() / (1024**3)
             reserved = torch.cuda.memory_reserved() / (1024**3)
             stats["cuda"] = {
@@ -62,7 +87,6 @@ def get_memory_stats() -> dict:
         pass
     
     try:
-        import psutil
         mem = psutil.virtual_memory()
         stats["ram"] = {
             "used_gb": mem.used / (1024**3),
@@ -75,37 +99,63 @@ def get_memory_stats() -> dict:
     return stats
 
 
-# 定期清理任务
+# 定期清理线程；置位 stop_evt 后线程立即从等待中唤醒并退出
 _cleanup_task = None
+stop_evt = threading.Event()
+
+# 按内存压力触发：显存池中空闲比例或内存占用超过阈值才清理
+_CUDA_SLACK_RATIO = 0.3
+_RAM_PERCENT_LIMIT = 85
+_MAX_CLEANUP_INTERVAL = 30 * 60  # 连续无压力时退避的上限 (秒)
+
+
+def _under_pressure(stats: dict) -> bool:
+    """显存池空闲碎片过多，或系统内存吃紧"""
+    cuda = stats.get("cuda")
+    if cuda:
+        reserved = cuda["reserved_gb"]
+        slack = reserved - cuda["allocated_gb"]
+        if slack / max(reserved, 1e-9) > _CUDA_SLACK_RATIO:
+            return True
+    ram = stats.get("ram")
+    return bool(ram) and ram["percent"] > _RAM_PERCENT_LIMIT
 
 
 def start_periodic_cleanup(interval_seconds: int = 300):
     """
     启动定期内存清理任务
     
+    分配稳定时无条件 empty_cache 只会让缓存池反复归还/重新申请，
+    所以每次只采样内存状态，有压力才清理；无压力时检查间隔翻倍 (上限 30 分钟)
+    
     Args:
-        interval_seconds: 清理间隔（秒），默认 5 分钟
+        interval_seconds: 基础检查间隔（秒），默认 5 分钟
     """
-    import asyncio
-    import threading
-    
     global _cleanup_task
     
-    async def _cleanup_loop():
-        while True:
-            await asyncio.sleep(interval_seconds)
-            cleanup_all(aggressive=False)
-            logger.debug(f"🧹 定期清理完成 (间隔: {interval_seconds}s)")
-    
-    def _run_in_thread():
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(_cleanup_loop())
-        except Exception as e:
-            logger.debug(f"定期清理线程异常: {e}")
+    def _loop():
+        interval = interval_seconds
+        while not stop_evt.wait(interval):
+            if _under_pressure(get_memory_stats()):
+                cleanup_all(aggressive=False)
+                interval = interval_seconds
+                logger.debug("🧹 定期清理完成 (内存压力触发)")
+            else:
+                interval = min(interval * 2, max(_MAX_CLEANUP_INTERVAL, interval_seconds))
+                logger.trace(f"🧹 内存无压力，跳过清理 (下次检查: {interval}s 后)")
     
     if _cleanup_task is None:
-        _cleanup_task = threading.Thread(target=_run_in_thread, daemon=True)
+        stop_evt.clear()
+        _cleanup_task = threading.Thread(target=_loop, name="MemoryCleanup", daemon=True)
         _cleanup_task.start()
-        logger.info(f"🧹 定期内存清理已启动 (间隔: {interval_seconds}s)")
+        logger.info(f"🧹 定期内存清理已启动 (检查间隔: {interval_seconds}s 起)")
+
+
+def stop_periodic_cleanup():
+    """停止定期内存清理 (退出时调用)"""
+    global _cleanup_task
+    
+    stop_evt.set()
+    if _cleanup_task is not None:
+        _cleanup_task.join(timeout=1)
+        _cleanup_task = None
@@ -39,23 +39,20 @@ def init_system_context(force: bool = False):
         # 删除已有的 system 条目
         print("清理已有的 system 条目...")
         try:
-            all_rows = kb._table.to_pandas()
-            import json
-            for _, row in all_rows.iterrows():
-                try:
-                    metadata = json.loads(row.get("metadata", "{}"))
-                    if metadata.get("category") == "system":
-                        kb.delete(row.get("id"))
-                        print(f"  删除: {row.get('id')}")
-                except:
-                    pass
+            # category 是独立列，过滤直接下推到 Lance，一次删除
+            before = kb.count()
+            if kb.delete_where("category = 'system'"):
+                print(f"  删除 {before - kb.count()} 条")
         except Exception as e:
             print(f"清理失败: {e}")
     
     # 添加新条目
     print("添加系统上下文条目...")
-    for entry in SYSTEM_CONTEXT_ENTRIES:
-        doc_id = kb.add(entry["text"], entry["metadata"])
+    doc_ids = kb.add_many(
+        [entry["text"] for entry in SYSTEM_CONTEXT_ENTRIES],
+        [dict(entry["metadata"]) for entry in SYSTEM_CONTEXT_ENTRIES]
+    )
+    for doc_id, entry in zip(doc_ids, SYSTEM_CONTEXT_ENTRIES):
         print(f"  添加: [{doc_id}] {entry['text'][:30]}...")
     
     print(f"\n完成! 知识库现有 {kb.count()} 条记录")
@@ -23,6 +23,34 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from knowledge import get_knowledge_base, create_memory_manager
 
+# orjson 解析/序列化更快且直接输出 UTF-8 bytes，缺失时回退标准库
+try:
+    import orjson
+    _json_loads = orjson.loads
+    
+    def _json_dump_pretty(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dump_pretty(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _iter_memories(kb):
+    """逐条遍历记忆 (分批读取，不加载向量列)"""
+    for batch in kb.iter_rows(columns=["id", "text", "metadata"]):
+        yield from batch.to_pylist()
+
+
+def _parse_meta(metadata) -> dict:
+    """解析 metadata JSON，失败时返回空 dict"""
+    try:
+        meta = _json_loads(metadata or '{}') if isinstance(metadata, str) else metadata
+        return meta if isinstance(meta, dict) else {}
+    except (TypeError, ValueError):
+        return {}
+
 
 def show_menu():
     """显示主菜单"""
@@ -44,8 +72,7 @@ def show_menu():
 def list_all_memories(kb):
     """列出所有记忆"""
     try:
-        all_data = kb._table.to_pandas()
-        count = len(all_data)
+        count = kb.count()
         
         if count == 0:
             print("\n📭 知识库为空")
@@ -53,18 +80,12 @@ def list_all_memories(kb):
         
         print(f"\n📋 共 {count} 条记忆:\n")
         
-        for _, row in all_data.iterrows():
+        for row in _iter_memories(kb):
             doc_id = row['id']
-            text = row.get('text', '')
-            metadata = row.get('metadata', '{}')
-            importance = row.get('importance', 1.0)
-            
-            # 解析 metadata
-            try:
-                meta = json.loads(metadata) if isinstance(metadata, str) else metadata
-                category = meta.get('category', 'unknown')
-            except:
-                category = 'unknown'
+            text = row.get('text') or ''
+            meta = _parse_meta(row.get('metadata'))
+            category = meta.get('category', 'unknown')
+            importance = meta.get('importance', 1.0)
             
             # 显示记忆
             category_emoji = {
@@ -171,20 +192,13 @@ def update_memory(kb):
     
     # 先显示当前内容
     try:
-        all_data = kb._table.to_pandas()
-        found = False
-        old_text = ""
-        
-        for _, row in all_data.iterrows():
-            if row['id'] == doc_id:
-                old_text = row.get('text', '')
-                print(f"\n📝 当前内容: {old_text}")
-                found = True
-                break
-        
-        if not found:
+        row = kb.get(doc_id)
+        if row is None:
             print(f"❌ 未找到 ID: {doc_id}")
             return
+        
+        old_text = row.get('text') or ''
+        print(f"\n📝 当前内容: {old_text}")
             
     except Exception as e:
         print(f"❌ 读取失败: {e}")
@@ -222,29 +236,14 @@ def delete_memory(kb):
     
     # 先显示内容确认
     try:
-        all_data = kb._table.to_pandas()
-        found = False
-        text = ""
-        is_core = False
-        
-        for _, row in all_data.iterrows():
-            if row['id'] == doc_id:
-                text = row.get('text', '')
-                metadata = row.get('metadata', '{}')
-                try:
-                    meta = json.loads(metadata) if isinstance(metadata, str) else metadata
-                    is_core = meta.get('category') == 'core'
-                except:
-                    pass
-                print(f"\n📝 将要删除: {text}")
-                found = True
-                break
-        
-        if not found:
+        row = kb.get(doc_id)
+        if row is None:
             print(f"❌ 未找到 ID: {doc_id}")
             return
         
-        if is_core:
+        print(f"\n📝 将要删除: {row.get('text') or ''}")
+        
+        if _parse_meta(row.get('metadata')).get('category') == 'core':
             print("⚠️  警告: 这是核心记忆!")
             
     except Exception as e:
@@ -267,8 +266,7 @@ def delete_memory(kb):
 def show_stats(kb):
     """显示统计信息"""
     try:
-        all_data = kb._table.to_pandas()
-        count = len(all_data)
+        count = kb.count()
         
         print(f"\n📊 知识库统计")
         print("-" * 30)
@@ -277,20 +275,14 @@ def show_stats(kb):
         if count == 0:
             return
         
-        # 统计类型
+        # 统计类型 (在 Arrow 中聚合，不逐行解析 metadata)
         categories = {'core': 0, 'fact': 0, 'preference': 0, 'other': 0}
         
-        for _, row in all_data.iterrows():
-            metadata = row.get('metadata', '{}')
-            try:
-                meta = json.loads(metadata) if isinstance(metadata, str) else metadata
-                cat = meta.get('category', 'other')
-                if cat in categories:
-                    categories[cat] += 1
-                else:
-                    categories['other'] += 1
-            except:
-                categories['other'] += 1
+        for cat, n in kb.get_category_counts().items():
+            if cat in categories:
+                categories[cat] += n
+            else:
+                categories['other'] += n
         
         print(f"\n按类型统计:")
         print(f"  ⭐ 核心记忆 (core): {categories['core']}")
@@ -305,28 +297,21 @@ def show_stats(kb):
 def export_memories(kb):
     """导出记忆为 JSON"""
     try:
-        all_data = kb._table.to_pandas()
-        
-        if len(all_data) == 0:
-            print("\n📭 知识库为空，无法导出")
-            return
-        
         # 转换为可序列化格式
         memories = []
-        for _, row in all_data.iterrows():
-            metadata = row.get('metadata', '{}')
-            try:
-                meta = json.loads(metadata) if isinstance(metadata, str) else metadata
-            except:
-                meta = {}
-            
+        for row in _iter_memories(kb):
+            meta = _parse_meta(row.get('metadata'))
             memories.append({
                 "id": row['id'],
-                "text": row.get('text', ''),
-                "importance": float(row.get('importance', 1.0)),
+                "text": row.get('text') or '',
+                "importance": float(meta.get('importance', 1.0)),
                 "metadata": meta
             })
         
+        if not memories:
+            print("\n📭 知识库为空，无法导出")
+            return
+        
         # 保存文件
         output_path = os.path.join(
             os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
@@ -334,8 +319,8 @@ def export_memories(kb):
             "knowledge_export.json"
         )
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(memories, f, ensure_ascii=False, indent=2)
+        with open(output_path, 'wb') as f:
+            f.write(_json_dump_pretty(memories))
         
         print(f"\n✅ 已导出 {len(memories)} 条记忆到:")
         print(f"   {output_path}")
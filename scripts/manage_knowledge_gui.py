@@ -16,6 +16,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import gradio as gr
 
+# orjson 更快，缺失时回退标准库
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 from knowledge import get_knowledge_client
 
 
@@ -23,6 +30,13 @@ from knowledge import get_knowledge_client
 client = None
 selected_ids = set()
 
+# 卡片列表渲染缓存: 知识库版本号与过滤词都没变时直接复用上次的 HTML
+_render_cache = {"key": None, "html": None, "status": None}
+
+
+def _invalidate_render_cache():
+    _render_cache["key"] = None
+
 
 def init_client():
     global client
@@ -62,151 +76,205 @@ CATEGORY_COLORS = {
     'unknown': '#f0f0f0'
 }
 
+# 卡片样式 (页面加载时注入一次，渲染函数只输出卡片本身)
+_CARD_CSS = """
+<style>
+.memory-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(280px, 1fr));
+    gap: 12px;
+    padding: 10px;
+}
+.memory-card {
+    background: linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%);
+    border: 1px solid #e0e0e0;
+    border-radius: 12px;
+    padding: 14px;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+    transition: all 0.2s ease;
+    position: relative;
+}
+.memory-card:hover {
+    box-shadow: 0 4px 16px rgba(0,0,0,0.12);
+    transform: translateY(-2px);
+}
+.memory-card.selected {
+    border-color: #007bff;
+    background: linear-gradient(135deg, #e7f3ff 0%, #f0f7ff 100%);
+}
+.card-header {
+    display: flex;
+    align-items: center;
+    gap: 8px;
+    margin-bottom: 8px;
+}
+.card-checkbox {
+    width: 18px;
+    height: 18px;
+    cursor: pointer;
+}
+.card-icon {
+    font-size: 16px;
+}
+.card-type {
+    font-size: 11px;
+    padding: 2px 8px;
+    border-radius: 10px;
+    font-weight: 500;
+}
+.card-id {
+    font-size: 10px;
+    color: #999;
+    margin-left: auto;
+    font-family: monospace;
+}
+.card-content {
+    font-size: 13px;
+    line-height: 1.5;
+    color: #333;
+    margin: 10px 0;
+    word-break: break-word;
+}
+.card-footer {
+    display: flex;
+    align-items: center;
+    justify-content: space-between;
+    font-size: 11px;
+    color: #888;
+    margin-top: 8px;
+    padding-top: 8px;
+    border-top: 1px solid #eee;
+}
+.card-importance {
+    display: flex;
+    align-items: center;
+    gap: 4px;
+}
+.importance-bar {
+    width: 40px;
+    height: 4px;
+    background: #eee;
+    border-radius: 2px;
+    overflow: hidden;
+}
+.importance-fill {
+    height: 100%;
+    background: linear-gradient(90deg, #4CAF50, #8BC34A);
+    border-radius: 2px;
+}
+</style>
+"""
+
+# 卡片模板 (format_map 渲染，字段在渲染前一次性算好)
+_CARD_TMPL = """
+<div class="memory-card" data-id="{doc_id}">
+    <div class="card-header">
+        <input type="checkbox" class="card-checkbox" value="{doc_id}" onclick="toggleSelect('{doc_id}')">
+        <span class="card-icon">{icon}</span>
+        <span class="card-type" style="background:{color};">{category}</span>
+        <span class="card-id">{short_id}</span>
+    </div>
+    <div class="card-content">{display_text}</div>
+    <div class="card-footer">
+        <div class="card-importance">
+            <span>重要性</span>
+            <div class="importance-bar">
+                <div class="importance-fill" style="width:{importance_pct}%"></div>
+            </div>
+            <span>{importance:.1f}</span>
+        </div>
+        <span>{time_text}</span>
+    </div>
+</div>
+"""
+
+# 搜索结果卡片 (无时间与进度条)
+_SEARCH_CARD_TMPL = """
+<div class="memory-card" data-id="{doc_id}">
+    <div class="card-header">
+        <input type="checkbox" class="card-checkbox" value="{doc_id}">
+        <span>{icon}</span>
+        <span class="card-type" style="background:{color};">{category}</span>
+        <span class="card-id">{short_id}</span>
+    </div>
+    <div class="card-content">{display_text}</div>
+    <div class="card-footer">
+        <span>重要性: {importance:.1f}</span>
+    </div>
+</div>
+"""
+
+_GRID_HEAD = '<div class="memory-grid">'
+_GRID_TAIL = "</div>"
+
+
+def _normalize_records(records):
+    """
+    记录统一成渲染用的字段 (只遍历一次)
+    
+    metadata 可能是 dict 也可能是 JSON 字符串，这里解析一次后不再重复
+    """
+    icon_of = CATEGORY_ICONS.get
+    color_of = CATEGORY_COLORS.get
+    fields = []
+    for r in records:
+        doc_id = r['id']
+        text = r.get('text') or ''
+        meta = r.get('metadata') or {}
+        if isinstance(meta, str):
+            try:
+                meta = _json_loads(meta)
+            except ValueError:
+                meta = {}
+        if not isinstance(meta, dict):
+            meta = {}
+        category = meta.get('category', 'unknown')
+        importance = meta.get('importance', 1.0)
+        fields.append({
+            'doc_id': doc_id,
+            'short_id': doc_id[:8],
+            'category': category,
+            'icon': icon_of(category, '❓'),
+            'color': color_of(category, '#f0f0f0'),
+            'importance': importance,
+            'importance_pct': min(100, max(0, importance * 33)),  # 0-3 映射到 0-100%
+            'display_text': text[:150] + ('...' if len(text) > 150 else ''),  # 截断长文本
+            'timestamp': meta.get('timestamp', 0),
+        })
+    return fields
+
 
 def render_memory_cards(filter_text=""):
     """渲染记忆卡片 HTML"""
     c = init_client()
+    # 缓存键与过滤用同一个归一化后的关键词，保证同键必同结果
+    needle = (filter_text or "").strip().lower()
     
     try:
+        try:
+            key = (c.version(), needle)
+        except Exception:
+            key = None  # 旧版服务没有 version 接口，不缓存
+        if key is not None and key == _render_cache["key"]:
+            return _render_cache["html"], _render_cache["status"]
+        
         records = c.get_all()
         
         if not records:
             return "<div style='text-align:center; padding: 40px; color: #888;'>知识库为空</div>", "0 条记忆"
         
         # 过滤
-        if filter_text.strip():
-            records = [r for r in records if filter_text.lower() in r.get('text', '').lower()]
-        
-        html = """
-        <style>
-        .memory-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(280px, 1fr));
-            gap: 12px;
-            padding: 10px;
-        }
-        .memory-card {
-            background: linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%);
-            border: 1px solid #e0e0e0;
-            border-radius: 12px;
-            padding: 14px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-            transition: all 0.2s ease;
-            position: relative;
-        }
-        .memory-card:hover {
-            box-shadow: 0 4px 16px rgba(0,0,0,0.12);
-            transform: translateY(-2px);
-        }
-        .memory-card.selected {
-            border-color: #007bff;
-            background: linear-gradient(135deg, #e7f3ff 0%, #f0f7ff 100%);
-        }
-        .card-header {
-            display: flex;
-            align-items: center;
-            gap: 8px;
-            margin-bottom: 8px;
-        }
-        .card-checkbox {
-            width: 18px;
-            height: 18px;
-            cursor: pointer;
-        }
-        .card-icon {
-            font-size: 16px;
-        }
-        .card-type {
-            font-size: 11px;
-            padding: 2px 8px;
-            border-radius: 10px;
-            font-weight: 500;
-        }
-        .card-id {
-            font-size: 10px;
-            color: #999;
-            margin-left: auto;
-            font-family: monospace;
-        }
-        .card-content {
-            font-size: 13px;
-            line-height: 1.5;
-            color: #333;
-            margin: 10px 0;
-            word-break: break-word;
-        }
-        .card-footer {
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-            font-size: 11px;
-            color: #888;
-            margin-top: 8px;
-            padding-top: 8px;
-            border-top: 1px solid #eee;
-        }
-        .card-importance {
-            display: flex;
-            align-items: center;
-            gap: 4px;
-        }
-        .importance-bar {
-            width: 40px;
-            height: 4px;
-            background: #eee;
-            border-radius: 2px;
-            overflow: hidden;
-        }
-        .importance-fill {
-            height: 100%;
-            background: linear-gradient(90deg, #4CAF50, #8BC34A);
-            border-radius: 2px;
-        }
-        </style>
-        <div class="memory-grid">
-        """
+        if needle:
+            records = [r for r in records if needle in (r.get('text') or '').lower()]
         
-        for r in records:
-            doc_id = r['id']
-            text = r.get('text', '')
-            meta = r.get('metadata', {})
-            
-            category = meta.get('category', 'unknown')
-            importance = meta.get('importance', 1.0)
-            timestamp = meta.get('timestamp', 0)
-            
-            icon = CATEGORY_ICONS.get(category, '❓')
-            color = CATEGORY_COLORS.get(category, '#f0f0f0')
-            importance_pct = min(100, max(0, importance * 33))  # 0-3 映射到 0-100%
-            
-            # 截断长文本
-            display_text = text[:150] + ('...' if len(text) > 150 else '')
-            
-            html += f"""
-            <div class="memory-card" data-id="{doc_id}">
-                <div class="card-header">
-                    <input type="checkbox" class="card-checkbox" value="{doc_id}" onclick="toggleSelect('{doc_id}')">
-                    <span class="card-icon">{icon}</span>
-                    <span class="card-type" style="background:{color};">{category}</span>
-                    <span class="card-id">{doc_id[:8]}</span>
-                </div>
-                <div class="card-content">{display_text}</div>
-                <div class="card-footer">
-                    <div class="card-importance">
-                        <span>重要性</span>
-                        <div class="importance-bar">
-                            <div class="importance-fill" style="width:{importance_pct}%"></div>
-                        </div>
-                        <span>{importance:.1f}</span>
-                    </div>
-                    <span>{format_timestamp(timestamp)}</span>
-                </div>
-            </div>
-            """
+        cards = _normalize_records(records)
+        for card in cards:
+            card['time_text'] = format_timestamp(card['timestamp'])
+        html = "".join([_GRID_HEAD, *map(_CARD_TMPL.format_map, cards), _GRID_TAIL])
+        status = f"{len(records)} 条记忆"
         
-        html += "</div>"
-        
-        return html, f"{len(records)} 条记忆"
+        _render_cache.update(key=key, html=html, status=status)
+        return html, status
         
     except Exception as e:
         return f"<div style='color:red;padding:20px;'>加载失败: {e}</div>", "错误"
@@ -219,29 +287,14 @@ def search_and_render(query):
     
     c = init_client()
     try:
-        results = c.search(query, n_results=20)
+        results = c.hybrid_search(query, k=20)
         
         if not results:
             return "<div style='text-align:center;padding:40px;color:#888;'>未找到相关记忆</div>", "0 条"
         
-        # 转换格式
-        records = []
-        for r in results:
-            meta = r.get('metadata', {})
-            if isinstance(meta, str):
-                try:
-                    meta = json.loads(meta)
-                except:
-                    meta = {}
-            records.append({
-                'id': r['id'],
-                'text': r['text'],
-                'metadata': meta
-            })
-        
-        # 手动渲染（复用逻辑）
-        html = render_cards_html(records)
-        return html, f"搜索到 {len(records)} 条"
+        # metadata 可能仍是字符串，统一由 render_cards_html 解析一次
+        html = render_cards_html(results)
+        return html, f"搜索到 {len(results)} 条"
         
     except Exception as e:
         return f"<div style='color:red;'>搜索失败: {e}</div>", "错误"
@@ -249,84 +302,7 @@ def search_and_render(query):
 
 def render_cards_html(records):
     """渲染卡片 HTML（内部函数）"""
-    html = """
-    <style>
-    .memory-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fill, minmax(280px, 1fr));
-        gap: 12px;
-        padding: 10px;
-    }
-    .memory-card {
-        background: linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%);
-        border: 1px solid #e0e0e0;
-        border-radius: 12px;
-        padding: 14px;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-        transition: all 0.2s ease;
-    }
-    .memory-card:hover {
-        box-shadow: 0 4px 16px rgba(0,0,0,0.12);
-        transform: translateY(-2px);
-    }
-    .card-header {
-        display: flex;
-        align-items: center;
-        gap: 8px;
-        margin-bottom: 8px;
-    }
-    .card-checkbox { width: 18px; height: 18px; cursor: pointer; }
-    .card-type {
-        font-size: 11px;
-        padding: 2px 8px;
-        border-radius: 10px;
-        font-weight: 500;
-    }
-    .card-id { font-size: 10px; color: #999; margin-left: auto; font-family: monospace; }
-    .card-content { font-size: 13px; line-height: 1.5; color: #333; margin: 10px 0; word-break: break-word; }
-    .card-footer {
-        display: flex;
-        align-items: center;
-        justify-content: space-between;
-        font-size: 11px;
-        color: #888;
-        margin-top: 8px;
-        padding-top: 8px;
-        border-top: 1px solid #eee;
-    }
-    </style>
-    <div class="memory-grid">
-    """
-    
-    for r in records:
-        doc_id = r['id']
-        text = r.get('text', '')
-        meta = r.get('metadata', {})
-        
-        category = meta.get('category', 'unknown')
-        importance = meta.get('importance', 1.0)
-        
-        icon = CATEGORY_ICONS.get(category, '❓')
-        color = CATEGORY_COLORS.get(category, '#f0f0f0')
-        display_text = text[:150] + ('...' if len(text) > 150 else '')
-        
-        html += f"""
-        <div class="memory-card" data-id="{doc_id}">
-            <div class="card-header">
-                <input type="checkbox" class="card-checkbox" value="{doc_id}">
-                <span>{icon}</span>
-                <span class="card-type" style="background:{color};">{category}</span>
-                <span class="card-id">{doc_id[:8]}</span>
-            </div>
-            <div class="card-content">{display_text}</div>
-            <div class="card-footer">
-                <span>重要性: {importance:.1f}</span>
-            </div>
-        </div>
-        """
-    
-    html += "</div>"
-    return html
+    return "".join([_GRID_HEAD, *map(_SEARCH_CARD_TMPL.format_map, _normalize_records(records)), _GRID_TAIL])
 
 
 def add_memory(text, category):
@@ -351,6 +327,7 @@ def add_memory(text, category):
                 "verified": True
             }
         )
+        _invalidate_render_cache()
         return f"✅ 已添加: {doc_id[:8]}", *render_memory_cards()
     except Exception as e:
         return f"❌ 失败: {e}", *render_memory_cards()
@@ -368,23 +345,16 @@ def delete_by_ids(ids_text):
     if not ids:
         return "未找到有效 ID", *render_memory_cards()
     
-    deleted = 0
-    skipped = 0
-    
     try:
-        records = c.get_all()
-        core_ids = {r['id'] for r in records if r.get('metadata', {}).get('category') == 'core'}
+        # 只查这几条的分类 (同时得知哪些 id 存在)，跳过核心记忆后一次删除
+        categories = c.get_categories(ids)
+        to_delete = [doc_id for doc_id, cat in categories.items() if cat != 'core']
+        skipped = len(categories) - len(to_delete)
         
-        for doc_id in ids:
-            if doc_id in core_ids:
-                skipped += 1
-                continue
-            try:
-                c.delete(doc_id)
-                deleted += 1
-            except:
-                pass
+        deleted = len(to_delete) if to_delete and c.delete_many(to_delete) else 0
         
+        if deleted:
+            _invalidate_render_cache()
         msg = f"✅ 删除 {deleted} 条"
         if skipped:
             msg += f"，跳过 {skipped} 条核心记忆"
@@ -458,6 +428,7 @@ def create_ui():
         status_text = gr.Textbox(value="加载中...", show_label=False, interactive=False, max_lines=1)
         
         # 卡片区域
+        gr.HTML(_CARD_CSS)
         cards_html = gr.HTML()
         
         # 选中的 ID（用于批量删除）
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+后台服务启动工具
+
+main.py 与 preload.py 共用：端口探测、就绪等待、新控制台启动服务
+"""
+
+import sys
+import time
+import errno
+import select
+import socket
+import asyncio
+import subprocess
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+from loguru import logger
+
+
+# 每个服务一个独立控制台窗口 (非 Windows 上这些标志不存在，取 0)
+_NEW_CONSOLE_FLAGS = (
+    getattr(subprocess, "CREATE_NEW_CONSOLE", 0) | getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+)
+# 不经过 shell 时 Windows 需要显式的 npm.cmd
+NPM = "npm.cmd" if sys.platform == "win32" else "npm"
+
+# 非阻塞 connect 进行中的返回码 (Windows 为 WSAEWOULDBLOCK)
+_CONNECT_PENDING = {errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, "WSAEWOULDBLOCK", 10035)}
+
+
+@dataclass
+class ServiceSpec:
+    """后台服务定义"""
+    name: str
+    port: int
+    cmd: List[str]  # 参数列表，不经过 shell
+    work_dir: Optional[str] = None
+    wait_seconds: int = 5  # 等待端口就绪的上限
+
+
+@lru_cache(maxsize=None)
+def _resolve(host: str) -> str:
+    """主机名解析结果缓存 (探测目标基本都是 127.0.0.1)"""
+    return socket.gethostbyname(host)
+
+
+def is_port_in_use(port: int, host: str = "127.0.0.1", timeout: float = 1.0) -> bool:
+    """检测端口是否被占用 (非阻塞 connect + select，被拒绝时立即返回)"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.setblocking(False)
+        err = s.connect_ex((_resolve(host), port))
+        if err == 0:
+            return True
+        if err not in _CONNECT_PENDING:
+            return False
+        # Windows 上连接失败通过 exceptfds 通知，所以两个集合都要等
+        _, writable, failed = select.select([], [s], [s], timeout)
+        if not writable or failed:
+            return False
+        return s.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+
+
+async def _probe_port(port: int, host: str = "127.0.0.1", timeout: float = 1.0) -> bool:
+    """异步检测端口是否有服务在监听"""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(_resolve(host), port), timeout)
+    except (asyncio.TimeoutError, OSError):
+        return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
+
+def probe_ports(ports: Iterable[int], host: str = "127.0.0.1") -> Dict[int, bool]:
+    """并发检测多个端口，总耗时取最慢的一个而不是逐个累加"""
+    ports = list(dict.fromkeys(ports))
+
+    async def _probe_all():
+        return await asyncio.gather(*(_probe_port(p, host) for p in ports))
+
+    return dict(zip(ports, asyncio.run(_probe_all())))
+
+
+def wait_for_port(port: int, timeout: float, host: str = "127.0.0.1") -> bool:
+    """
+    轮询等待端口开始监听 (50ms 起指数退避，单次间隔最长 0.5s)
+
+    服务就绪即返回 True，超过 timeout 仍未监听返回 False
+    """
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        if is_port_in_use(port, host, timeout=0.2):
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(0.05 * 2 ** attempt, 0.5, remaining))
+        attempt += 1
+
+
+async def wait_for_port_async(port: int, timeout: float, host: str = "127.0.0.1") -> bool:
+    """wait_for_port 的异步版本，便于同时等待多个服务"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    attempt = 0
+    while True:
+        if await _probe_port(port, host, timeout=0.2):
+            return True
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(0.05 * 2 ** attempt, 0.5, remaining))
+        attempt += 1
+
+
+def launch_service(spec: ServiceSpec) -> bool:
+    """在新窗口中启动服务进程 (不等待)，返回是否成功拉起"""
+    logger.info(f"🚀 正在启动 {spec.name} (端口 {spec.port})...")
+
+    args = spec.cmd
+    if sys.platform == "win32":
+        # 套一层 cmd /k：服务崩溃退出后窗口保留，能看到报错
+        # (整条命令再包一对引号，cmd 只剥掉最外层，带空格的路径不受影响)
+        args = f'cmd /k "{subprocess.list2cmdline(spec.cmd)}"'
+
+    try:
+        subprocess.Popen(args, cwd=spec.work_dir or None, creationflags=_NEW_CONSOLE_FLAGS)
+        return True
+    except Exception as e:
+        logger.error(f"❌ 启动 {spec.name} 失败: {e}")
+        return False
+
+
+async def wait_services(specs: List[ServiceSpec]):
+    """并行等待所有新启动的服务就绪，逐个报告耗时"""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def _wait_one(spec: ServiceSpec):
+        if await wait_for_port_async(spec.port, spec.wait_seconds):
+            logger.info(f"✅ {spec.name} 已就绪 ({loop.time() - start:.1f}秒)")
+        else:
+            logger.info(f"⌛ {spec.name} {spec.wait_seconds}秒内未监听端口，继续后续步骤")
+
+    await asyncio.gather(*(_wait_one(spec) for spec in specs if spec.wait_seconds > 0))
@@ -181,9 +181,6 @@ class AudioQueue:
         BUFFER_SIZE = 3
         RTF_WARNING_THRESHOLD = 0.95
         
-        # 口型分析设置
-        LIP_SYNC_CHUNK_SIZE = 1024  # 每 1024 样本分析一次口型
-        
         audio_queue = queue.Queue()
         sample_rate = engine.sample_rate
         
@@ -263,9 +260,11 @@ class AudioQueue:
                 if task.emotion:
                     self._live2d_controller.set_expression(task.emotion)
             
-            # 流式播放 + 口型同步
-            lip_buffer = np.array([], dtype=np.float32)
+            # 新任务开始播放：清掉分析器滑动帧里上一句的尾音
+            if self._lip_sync_analyzer:
+                self._lip_sync_analyzer.reset()
             
+            # 流式播放 + 口型同步
             with sd.OutputStream(samplerate=sample_rate, channels=1, dtype='float32') as stream:
                 for chunk in buffer:
                     # 🔥 检查打断标志
@@ -274,14 +273,11 @@ class AudioQueue:
                         break
                     
                     # 口型同步
+                    # (分析器内部按 hop 切帧、50% 重叠加窗，未凑满 hop 时返回 None)
                     if self._lip_sync_analyzer and self._live2d_controller:
-                        lip_buffer = np.concatenate([lip_buffer, chunk.flatten()])
-                        while len(lip_buffer) >= LIP_SYNC_CHUNK_SIZE:
-                            lip_chunk = lip_buffer[:LIP_SYNC_CHUNK_SIZE]
-                            lip_buffer = lip_buffer[LIP_SYNC_CHUNK_SIZE:]
-                            
-                            vowel, mouth_open, mouth_form = self._lip_sync_analyzer.analyze(lip_chunk)
-                            self._live2d_controller.set_lipsync(mouth_open, mouth_form)
+                        lip = self._lip_sync_analyzer.feed(chunk)
+                        if lip is not None:
+                            self._live2d_controller.set_lipsync(lip[1], lip[2])
                     
                     if chunk.ndim == 1:
                         chunk = chunk.reshape(-1, 1)
@@ -304,13 +300,9 @@ class AudioQueue:
                     
                     # 口型同步
                     if self._lip_sync_analyzer and self._live2d_controller:
-                        lip_buffer = np.concatenate([lip_buffer, item.flatten()])
-                        while len(lip_buffer) >= LIP_SYNC_CHUNK_SIZE:
-                            lip_chunk = lip_buffer[:LIP_SYNC_CHUNK_SIZE]
-                            lip_buffer = lip_buffer[LIP_SYNC_CHUNK_SIZE:]
-                            
-                            vowel, mouth_open, mouth_form = self._lip_sync_analyzer.analyze(lip_chunk)
-                            self._live2d_controller.set_lipsync(mouth_open, mouth_form)
+                        lip = self._lip_sync_analyzer.feed(item)
+                        if lip is not None:
+                            self._live2d_controller.set_lipsync(lip[1], lip[2])
                     
                     if item.ndim == 1:
                         item = item.reshape(-1, 1)
@@ -154,6 +154,29 @@ class VoxCPMEngine:
             if self._health_monitor:
                 self._health_monitor.report_issue("tts_reload_failed", "模型重载失败")
 
+    def warmup(self) -> float:
+        """
+        用一句短文本跑一次完整推理，首次真实合成不再承担 cuDNN/cuBLAS 冷启动开销
+        
+        直接调用模型，不计入 RTF 统计（冷启动 RTF 会误触发健康监控）
+        
+        Returns:
+            预热耗时 (ms)
+        """
+        if not self.initialize():
+            return 0.0
+        start = time.time()
+        for _ in self._model.generate_streaming(
+            text="你好。",
+            prompt_wav_path=config.VOXCPM_PROMPT_WAV,
+            prompt_text=config.VOXCPM_PROMPT_TEXT,
+            cfg_value=config.VOXCPM_CFG_VALUE,
+            inference_timesteps=config.VOXCPM_INFERENCE_STEPS,
+            max_len=2048
+        ):
+            pass
+        return (time.time() - start) * 1000
+
     def set_health_monitor(self, health_monitor):
         """设置健康监控器"""
         self._health_monitor = health_monitor